@@ -5,14 +5,15 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_token
-from app.db.session import get_db
+from app.db.session import ReadSession, get_db, get_read_db
 from app.models.user import User, UserRole
+from app.services.principals import principal_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def _principal_id(token: str) -> int:
     try:
         payload = decode_token(token)
     except ValueError:
@@ -21,11 +22,39 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     sub = payload.get("sub")
     if not sub:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return int(sub)
+
 
-    user = db.query(User).filter(User.id == int(sub)).first()
+def _fetch_user(db: Session, user_id: int) -> User:
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
+    principal_cache.put(user)
+    return user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """Resolve the token's user, from the principal cache when possible.
+
+    A cached user is detached: read its attributes freely, but re-query it
+    before changing it.
+    """
+
+    user_id = _principal_id(token)
+    return principal_cache.get(user_id) or _fetch_user(db, user_id)
+
+
+async def get_read_user(token: str = Depends(oauth2_scheme), db: ReadSession = Depends(get_read_db)) -> User:
+    """get_current_user for async read routes; shares the route's ReadSession.
+
+    The user is looked up on the primary; the route's own reads then go to a
+    replica when one is configured (see ReadSession.route).
+    """
+
+    user_id = _principal_id(token)
+    user = principal_cache.get(user_id) or await db.run(_fetch_user, user_id)
+    db.route(user.bar_id)
     return user
 
 
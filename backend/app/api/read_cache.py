@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+import zlib
+from collections import OrderedDict
+
+from fastapi import Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.deps import get_read_user
+from app.core.config import get_settings
+from app.db.session import ReadSession, get_read_db
+from app.models.user import User
+from app.services.data_versions import data_versions
+
+
+CacheKey = tuple[int, int, str, str]
+
+
+class ResponseCache:
+    """LRU of rendered read responses keyed by (bar, user, path, query).
+
+    Each entry remembers the bar data version it was rendered at and is only
+    served while that is still the bar's version.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, tuple[int, bytes, dict[str, str]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    def get(self, key: CacheKey, version: int) -> tuple[bytes, dict[str, str]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: CacheKey, version: int, body: bytes, headers: dict[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = (version, body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._not_modified = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "not_modified": self._not_modified,
+            }
+
+
+response_cache = ResponseCache(max_entries=get_settings().response_cache_max_entries)
+
+
+class CachedRead:
+    """Per-request handle returned by the read_cache dependency.
+
+    `fresh` is a ready response (304 or a cached body) when the route can skip
+    its work; otherwise the route builds its result and returns render(result).
+    """
+
+    def __init__(self, key: CacheKey, version: int, etag: str, fresh: Response | None):
+        self.key = key
+        self.version = version
+        self.etag = etag
+        self.fresh = fresh
+
+    def render(self, result, headers: dict[str, str] | None = None) -> Response:
+        # Same encoding FastAPI applies to a returned model, so bytes don't depend on cache state.
+        return self.render_content(jsonable_encoder(result), headers)
+
+    def render_content(self, content, headers: dict[str, str] | None = None) -> Response:
+        """render() for content that is already JSON-ready (plain dicts/lists)."""
+
+        response = JSONResponse(content, headers=headers)
+        response_cache.put(self.key, self.version, response.body, dict(headers or {}))
+        _set_validators(response, self.etag)
+        return response
+
+
+def _set_validators(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Authenticated data: browsers may keep it, but must revalidate every time.
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+async def read_cache(
+    request: Request,
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+) -> CachedRead:
+    version = data_versions.cached(current.bar_id)
+    if version is None:
+        version = await db.run(data_versions.load, current.bar_id)
+
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    key = (current.bar_id, current.id, request.url.path, query)
+    etag = f'W/"{current.bar_id}.{version}.{current.id}.{zlib.crc32(f"{key[2]}?{query}".encode()):08x}"'
+
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        response_cache.count_not_modified()
+        fresh = Response(status_code=304)
+        _set_validators(fresh, etag)
+        return CachedRead(key, version, etag, fresh)
+
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        body, headers = cached
+        fresh = Response(content=body, media_type="application/json", headers=headers)
+        _set_validators(fresh, etag)
+        return CachedRead(key, version, etag, fresh)
+
+    return CachedRead(key, version, etag, None)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from app.api.routes import auth, bartenders, bars, dev, leaderboard, shifts, spots, users
+from app.api.routes import auth, bartenders, bars, dev, leaderboard, reports, rescoring, shifts, simulation, spots, trends, users
 
 
 api_router = APIRouter(prefix="/api")
@@ -14,4 +14,8 @@ api_router.include_router(leaderboard.router, tags=["leaderboard"])
 api_router.include_router(spots.router, tags=["spots"])
 api_router.include_router(bartenders.router, tags=["bartenders"])
 api_router.include_router(shifts.router, tags=["shifts"])
+api_router.include_router(rescoring.router, tags=["rescoring"])
+api_router.include_router(simulation.router, tags=["simulation"])
+api_router.include_router(trends.router, tags=["trends"])
+api_router.include_router(reports.router, tags=["reports"])
 api_router.include_router(users.router, tags=["users"])
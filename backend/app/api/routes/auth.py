@@ -3,14 +3,17 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_user
-from app.core.security import create_access_token, hash_password, verify_password
-from app.db.session import get_db
+from app.api.deps import get_current_user, get_read_user
+from app.core.password_pool import hash_password_async, verify_password_async
+from app.core.security import create_access_token
+from app.db.session import ReadSession, get_db, get_read_db
 from app.models.bar import Bar
 from app.models.bartender import Bartender
 from app.models.user import User, UserRole
 from app.schemas.auth import BootstrapOwnerIn, FirstLoginUpdateIn, MeOut, TokenOut
+from app.services.principals import principal_cache
 
 
 TEMP_LOGIN_PREFIX = "tmp_"
@@ -30,8 +33,7 @@ def _normalize_login(value: str) -> str:
 router = APIRouter(prefix="/auth")
 
 
-@router.post("/bootstrap", response_model=TokenOut)
-def bootstrap_owner(payload: BootstrapOwnerIn, db: Session = Depends(get_db)):
+def _bootstrap_owner(db: Session, payload: BootstrapOwnerIn, password_hash: str) -> TokenOut:
     existing_owner = db.query(User).filter(User.role == UserRole.owner).first()
     if existing_owner is not None:
         raise HTTPException(status_code=400, detail="Owner already exists; bootstrap disabled")
@@ -45,7 +47,7 @@ def bootstrap_owner(payload: BootstrapOwnerIn, db: Session = Depends(get_db)):
         email=_normalize_login(payload.owner_login),
         name=payload.owner_name,
         role=UserRole.owner,
-        password_hash=hash_password(payload.owner_password),
+        password_hash=password_hash,
         is_active=True,
     )
     db.add(user)
@@ -56,39 +58,42 @@ def bootstrap_owner(payload: BootstrapOwnerIn, db: Session = Depends(get_db)):
     return TokenOut(access_token=token, must_change_credentials=False)
 
 
-@router.post("/login", response_model=TokenOut)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    identifier = _normalize_login(form_data.username)
-    user = (
+@router.post("/bootstrap", response_model=TokenOut)
+async def bootstrap_owner(payload: BootstrapOwnerIn, db: Session = Depends(get_db)):
+    password_hash = await hash_password_async(payload.owner_password)
+    return await run_in_threadpool(_bootstrap_owner, db, payload, password_hash)
+
+
+def _find_login_user(db: Session, identifier: str) -> User | None:
+    return (
         db.query(User)
         .filter((User.email == identifier) | (User.email == f"{TEMP_LOGIN_PREFIX}{identifier}"))
         .first()
     )
+
+
+@router.post("/login", response_model=TokenOut)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: ReadSession = Depends(get_read_db)):
+    identifier = _normalize_login(form_data.username)
+    user = await db.run(_find_login_user, identifier)
     if user is None or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(form_data.password, user.password_hash):
+    if not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token(subject=str(user.id), role=user.role.value, bar_id=user.bar_id)
     return TokenOut(access_token=token, must_change_credentials=_must_change_credentials(user))
 
 
-@router.post("/first-login", response_model=TokenOut)
-def first_login_update(payload: FirstLoginUpdateIn, current: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if not _must_change_credentials(current):
-        raise HTTPException(status_code=400, detail="First-login flow is not required for this account")
-
-    new_login = _normalize_login(payload.login)
-    if new_login.startswith(TEMP_LOGIN_PREFIX):
-        raise HTTPException(status_code=400, detail="Username cannot start with reserved prefix")
-
+def _update_first_login(db: Session, user_id: int, new_login: str, password_hash: str) -> TokenOut:
     existing = db.query(User).filter(User.email == new_login).first()
-    if existing is not None and existing.id != current.id:
+    if existing is not None and existing.id != user_id:
         raise HTTPException(status_code=400, detail="Username/email is already in use")
 
+    current = db.query(User).filter(User.id == user_id).one()
     current.email = new_login
-    current.password_hash = hash_password(payload.password)
+    current.password_hash = password_hash
     db.add(current)
 
     bartender = db.query(Bartender).filter(Bartender.user_id == current.id).first()
@@ -98,13 +103,27 @@ def first_login_update(payload: FirstLoginUpdateIn, current: User = Depends(get_
         db.add(bartender)
 
     db.commit()
+    principal_cache.invalidate(current.id)
 
     token = create_access_token(subject=str(current.id), role=current.role.value, bar_id=current.bar_id)
     return TokenOut(access_token=token, must_change_credentials=False)
 
 
+@router.post("/first-login", response_model=TokenOut)
+async def first_login_update(payload: FirstLoginUpdateIn, current: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    if not _must_change_credentials(current):
+        raise HTTPException(status_code=400, detail="First-login flow is not required for this account")
+
+    new_login = _normalize_login(payload.login)
+    if new_login.startswith(TEMP_LOGIN_PREFIX):
+        raise HTTPException(status_code=400, detail="Username cannot start with reserved prefix")
+
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_update_first_login, db, current.id, new_login, password_hash)
+
+
 @router.get("/me", response_model=MeOut)
-def me(current: User = Depends(get_current_user)):
+async def me(current: User = Depends(get_read_user)):
     return MeOut(
         id=current.id,
         bar_id=current.bar_id,
@@ -5,11 +5,15 @@ import secrets
 import string
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_user, require_owner
-from app.core.security import encrypt_temp_secret, hash_password, decrypt_temp_secret
-from app.db.session import get_db
+from app.api.deps import get_read_user, require_owner
+from app.api.read_cache import CachedRead, read_cache
+from app.core.password_pool import hash_password_async
+from app.core.security import encrypt_temp_secret, decrypt_temp_secret
+from app.db.session import ReadSession, get_db, get_read_db
 from app.models.bartender import Bartender
 from app.models.score_result import ScoreResult
 from app.models.shift import Shift
@@ -22,6 +26,10 @@ from app.schemas.bartenders import (
     BartenderProvisionOut,
     BartenderUpdateIn,
 )
+from app.services import leaderboard_rollup
+from app.services.auto_caps import auto_caps
+from app.services.cohort_ranks import cohort_ranks
+from app.services.principals import principal_cache
 
 
 router = APIRouter(prefix="/bartenders")
@@ -40,20 +48,27 @@ def _random_password(length: int = 10) -> str:
     return "".join(secrets.choice(alphabet) for _ in range(length))
 
 
-@router.get("", response_model=list[BartenderOut])
-def list_bartenders(
-    bar_id: int = Query(...),
-    current: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    if bar_id != current.bar_id:
-        raise HTTPException(status_code=403, detail="Not allowed")
-    bartenders = (
+def _bartenders_for_bar(db: Session, bar_id: int) -> list[Bartender]:
+    return (
         db.query(Bartender)
         .filter(Bartender.bar_id == bar_id)
         .order_by(Bartender.is_active.desc(), Bartender.name.asc(), Bartender.id.asc())
         .all()
     )
+
+
+@router.get("", response_model=list[BartenderOut])
+async def list_bartenders(
+    bar_id: int = Query(...),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
+):
+    if bar_id != current.bar_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if cache.fresh is not None:
+        return cache.fresh
+    bartenders = await db.run(_bartenders_for_bar, bar_id)
     out: list[BartenderOut] = []
     for b in bartenders:
         temp_username = None
@@ -77,7 +92,7 @@ def list_bartenders(
                 temp_password=temp_password,
             )
         )
-    return out
+    return cache.render(out)
 
 
 @router.post("", response_model=BartenderOut)
@@ -91,41 +106,49 @@ def create_bartender(payload: BartenderCreateIn, owner: User = Depends(require_o
     return BartenderOut.model_validate(bartender)
 
 
-@router.post("/provision", response_model=BartenderProvisionOut)
-def provision_bartender(payload: BartenderProvisionIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
-    bartender = Bartender(bar_id=owner.bar_id, name=payload.name)
-    db.add(bartender)
-    db.flush()
-
+def _provision_bartender(
+    db: Session,
+    owner: User,
+    payload: BartenderProvisionIn,
+    temporary_password: str,
+    password_hash: str,
+) -> BartenderProvisionOut:
     base = _normalize_username_base(payload.name)
-    temporary_username = None
-    for _ in range(25):
-        suffix = secrets.randbelow(900) + 100  # 3 digits
-        candidate = f"{base}{suffix}"
-        exists = db.query(User).filter((User.email == candidate) | (User.email == f"{TEMP_LOGIN_PREFIX}{candidate}")).first()
-        if exists is None:
-            temporary_username = candidate
-            break
+    # Probe all candidate usernames in one query instead of one round trip each.
+    candidates = list(dict.fromkeys(f"{base}{secrets.randbelow(900) + 100}" for _ in range(25)))  # 3 digits
+    taken = {
+        email
+        for (email,) in db.query(User.email).filter(
+            User.email.in_(candidates + [f"{TEMP_LOGIN_PREFIX}{c}" for c in candidates])
+        )
+    }
+    temporary_username = next(
+        (c for c in candidates if c not in taken and f"{TEMP_LOGIN_PREFIX}{c}" not in taken),
+        None,
+    )
     if temporary_username is None:
         # extremely unlikely fallback
         temporary_username = f"{base}{secrets.token_hex(2)}"
 
-    temporary_password = _random_password(10)
-
     user = User(
         bar_id=owner.bar_id,
         email=f"{TEMP_LOGIN_PREFIX}{temporary_username}",
         name=payload.name,
         role=UserRole.employee,
-        password_hash=hash_password(temporary_password),
+        password_hash=password_hash,
         is_active=True,
     )
     db.add(user)
-
     db.flush()
-    bartender.user_id = user.id
-    bartender.temp_username = temporary_username
-    bartender.temp_password_enc = encrypt_temp_secret(temporary_password)
+
+    bartender = Bartender(
+        bar_id=owner.bar_id,
+        name=payload.name,
+        user_id=user.id,
+        temp_username=temporary_username,
+        temp_password_enc=encrypt_temp_secret(temporary_password),
+    )
+    db.add(bartender)
 
     db.commit()
     db.refresh(bartender)
@@ -137,6 +160,13 @@ def provision_bartender(payload: BartenderProvisionIn, owner: User = Depends(req
     )
 
 
+@router.post("/provision", response_model=BartenderProvisionOut)
+async def provision_bartender(payload: BartenderProvisionIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    temporary_password = _random_password(10)
+    password_hash = await hash_password_async(temporary_password)
+    return await run_in_threadpool(_provision_bartender, db, owner, payload, temporary_password, password_hash)
+
+
 @router.patch("/{bartender_id}", response_model=BartenderOut)
 def update_bartender(
     bartender_id: int,
@@ -177,28 +207,20 @@ def delete_bartender(
 
     deleted_shifts = 0
     deleted_scores = 0
+    cleared_spot_ids: set[int] = set()
 
     if clear_sales:
-        shift_ids = [
-            sid
-            for (sid,) in (
-                db.query(Shift.id)
-                .filter(Shift.bar_id == owner.bar_id)
-                .filter(Shift.bartender_name == bartender.name)
-                .all()
-            )
-        ]
-        if shift_ids:
+        bartender_shifts = (Shift.bar_id == owner.bar_id, Shift.bartender_name == bartender.name)
+        cleared_spot_ids = {spot_id for (spot_id,) in db.query(Shift.spot_id).filter(*bartender_shifts).distinct()}
+        if cleared_spot_ids:
+            # Subquery deletes: no shift ids round-trip through Python or hit the bind-parameter limit.
             deleted_scores = (
                 db.query(ScoreResult)
-                .filter(ScoreResult.shift_id.in_(shift_ids))
-                .delete(synchronize_session=False)
-            )
-            deleted_shifts = (
-                db.query(Shift)
-                .filter(Shift.id.in_(shift_ids))
+                .filter(ScoreResult.shift_id.in_(select(Shift.id).where(*bartender_shifts)))
                 .delete(synchronize_session=False)
             )
+            deleted_shifts = db.query(Shift).filter(*bartender_shifts).delete(synchronize_session=False)
+        leaderboard_rollup.clear_bartender(db, owner.bar_id, bartender.name)
 
     user_id = bartender.user_id
     db.delete(bartender)
@@ -206,12 +228,13 @@ def delete_bartender(
 
     deleted_user = False
     if user_id is not None:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user is not None:
-            db.delete(user)
-            deleted_user = True
+        deleted_user = db.query(User).filter(User.id == user_id).delete(synchronize_session=False) > 0
 
     db.commit()
+    principal_cache.invalidate(user_id)
+    # Bulk deletes bypass the per-shift hooks; let affected windows reload.
+    auto_caps.invalidate(cleared_spot_ids)
+    cohort_ranks.invalidate(cleared_spot_ids)
     return {
         "status": "deleted",
         "deleted_user": deleted_user,
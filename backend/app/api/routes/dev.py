@@ -1,25 +1,35 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_owner
 from app.db.session import get_db
-from app.models.bartender import Bartender
 from app.models.bar import Bar
-from app.models.spot import Spot
-from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
 from app.models.user import User
+from app.services.principals import principal_cache
+from app.services.synthetic import SyntheticSpec, ensure_roster, generate
 
 
 router = APIRouter(prefix="/dev")
 
 
 @router.post("/seed")
-def seed(owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+def seed(
+    shifts: int = Query(default=0, ge=0, le=5_000_000),
+    spots: int = Query(default=3, ge=1, le=50),
+    bartenders: int = Query(default=3, ge=1, le=500),
+    years: float = Query(default=2.0, gt=0, le=10),
+    seed: int = 7,
+    owner: User = Depends(require_owner),
+    db: Session = Depends(get_db),
+):
     """Create a default bar + a few spots if none exist.
 
-    This is purely for local development to get the UI moving.
+    This is purely for local development to get the UI moving. With
+    `shifts` > 0 it also generates that many realistic, scored shifts
+    (deterministic per `seed`); `python -m app.services.synthetic` does the
+    same from the command line.
     """
 
     bar = db.query(Bar).filter(Bar.id == owner.bar_id).first()
@@ -27,35 +37,13 @@ def seed(owner: User = Depends(require_owner), db: Session = Depends(get_db)):
         bar = Bar(name="Demo Bar", timezone="America/New_York")
         db.add(bar)
         db.flush()
-        owner.bar_id = bar.id
-        db.add(owner)
-
-    existing_spots = db.query(Spot).filter(Spot.bar_id == bar.id).all()
-    if not existing_spots:
-        for name in ["Main Well", "Service Bar", "Patio"]:
-            spot = Spot(bar_id=bar.id, name=name)
-            db.add(spot)
-            db.flush()
-
-            cfg = SpotScoreConfig(
-                bar_id=bar.id,
-                spot_id=spot.id,
-                cap_mode=SpotCapMode.manual,
-                sales_volume_low=200.0,
-                sales_volume_high=1200.0,
-                pct_of_bar_sales_low=0.05,
-                pct_of_bar_sales_high=0.40,
-                tip_pct_low=0.15,
-                tip_pct_high=0.30,
-                sales_per_hour_low=50.0,
-                sales_per_hour_high=250.0,
-            )
-            db.add(cfg)
-
-    existing_bartenders = db.query(Bartender).filter(Bartender.bar_id == bar.id).all()
-    if not existing_bartenders:
-        for name in ["Jay", "Alex", "Sam"]:
-            db.add(Bartender(bar_id=bar.id, name=name))
+        # `owner` may be a detached cached principal; update the stored row.
+        db.query(User).filter(User.id == owner.id).update({User.bar_id: bar.id})
 
+    ensure_roster(db, bar.id, spots, bartenders)
     db.commit()
-    return {"bar_id": bar.id}
+    principal_cache.invalidate(owner.id)
+
+    if shifts:
+        generate(db, bar.id, SyntheticSpec(shifts=shifts, spots=spots, bartenders=bartenders, years=years, seed=seed))
+    return {"bar_id": bar.id, "generated": shifts}
@@ -2,64 +2,136 @@ from __future__ import annotations
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import get_read_user
+from app.api.read_cache import CachedRead, read_cache
+from app.db.session import ReadSession, get_read_db
+from app.models.leaderboard_rollup import LeaderboardRollup
 from app.models.score_result import ScoreResult
 from app.models.shift import Shift
 from app.models.user import User
 from app.schemas.leaderboard import LeaderboardEntry, LeaderboardResponse
+from app.services.cohort_ranks import cohort_ranks
 
 
 router = APIRouter(prefix="/leaderboard")
 
+# Percentiles are read per shift (they move as cohorts grow, so the rollups
+# cannot hold them); a bounded range keeps that proportional to a quarter of
+# shifts rather than to the bar's whole history.
+PERCENTILE_MAX_DAYS = 92
 
-@router.get("", response_model=LeaderboardResponse)
-def get_leaderboard(
-    start_date: date | None = Query(None),
-    end_date: date | None = Query(None),
-    limit: int = Query(10, ge=1, le=100),
-    current: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+
+def _leaderboard_rows(db: Session, bar_id: int, start_date: date | None, end_date: date | None, limit: int) -> list:
+    # Daily rollups keep this proportional to days x bartenders, not to shift history.
+    avg_score = func.sum(LeaderboardRollup.score_sum) / func.sum(LeaderboardRollup.shifts_count)
     q = (
         db.query(
-            Shift.bartender_name.label("bartender_name"),
-            func.avg(ScoreResult.score_total).label("avg_score"),
-            func.count(Shift.id).label("shifts_count"),
-            func.max(Shift.shift_date).label("last_shift_date"),
+            LeaderboardRollup.bartender_name.label("bartender_name"),
+            avg_score.label("avg_score"),
+            func.sum(LeaderboardRollup.shifts_count).label("shifts_count"),
+            func.max(LeaderboardRollup.shift_date).label("last_shift_date"),
         )
-        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
-        .filter(Shift.bar_id == current.bar_id)
-        .filter(Shift.bartender_name != "")
-        .group_by(Shift.bartender_name)
-        .order_by(func.avg(ScoreResult.score_total).desc())
-        .limit(limit)
+        .filter(LeaderboardRollup.bar_id == bar_id)
+        .filter(LeaderboardRollup.bartender_name != "")
+        .group_by(LeaderboardRollup.bartender_name)
+        .order_by(avg_score.desc())
     )
 
+    if start_date is not None:
+        q = q.filter(LeaderboardRollup.shift_date >= start_date)
+    if end_date is not None:
+        q = q.filter(LeaderboardRollup.shift_date <= end_date)
+
+    return q.limit(limit).all()
+
+
+def _avg_percentiles(
+    db: Session, bar_id: int, names: list[str], start_date: date | None, end_date: date | None
+) -> dict[str, float]:
+    """Mean cohort percentile of each named bartender's scored shifts in the range."""
+
+    q = (
+        db.query(Shift.bartender_name, Shift.spot_id, Shift.shift_date, ScoreResult.score_total)
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.bar_id == bar_id)
+        .filter(Shift.bartender_name.in_(names))
+    )
     if start_date is not None:
         q = q.filter(Shift.shift_date >= start_date)
     if end_date is not None:
         q = q.filter(Shift.shift_date <= end_date)
-
     rows = q.all()
+    ranks = cohort_ranks.percentiles(db, [(r.spot_id, r.shift_date, r.score_total) for r in rows])
+
+    totals: dict[str, list[float]] = {}
+    for r, pct in zip(rows, ranks):
+        if pct is not None:
+            total = totals.setdefault(r.bartender_name, [0.0, 0])
+            total[0] += pct
+            total[1] += 1
+    return {name: pct_sum / count for name, (pct_sum, count) in totals.items()}
+
+
+def _leaderboard_with_percentiles(
+    db: Session, bar_id: int, start_date: date | None, end_date: date | None, limit: int
+) -> tuple[list, dict[str, float]]:
+    rows = _leaderboard_rows(db, bar_id, start_date, end_date, limit)
+    names = [r.bartender_name for r in rows]
+    return rows, _avg_percentiles(db, bar_id, names, start_date, end_date) if names else {}
+
+
+@router.get("", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    percentiles: bool = Query(
+        False,
+        description=(
+            "Include each bartender's mean spot/weekday score percentile. Reads every scored shift"
+            f" in the range, so start_date and end_date are required, at most {PERCENTILE_MAX_DAYS} days apart."
+        ),
+    ),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
+):
+    if percentiles and (
+        start_date is None or end_date is None or not 0 <= (end_date - start_date).days < PERCENTILE_MAX_DAYS
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail=f"percentiles=true needs start_date and end_date at most {PERCENTILE_MAX_DAYS} days apart",
+        )
+    if cache.fresh is not None:
+        return cache.fresh
+
+    if percentiles:
+        rows, avg_percentiles = await db.run(_leaderboard_with_percentiles, current.bar_id, start_date, end_date, limit)
+    else:
+        rows, avg_percentiles = await db.run(_leaderboard_rows, current.bar_id, start_date, end_date, limit), None
 
     entries = [
         LeaderboardEntry(
             bartender_name=r.bartender_name,
-            avg_score=float(r.avg_score or 0.0),
+            # Incremental sums can drift by an ulp; keep the average in the schema's range.
+            avg_score=min(max(float(r.avg_score or 0.0), 0.0), 100.0),
             shifts_count=int(r.shifts_count or 0),
             last_shift_date=r.last_shift_date,
+            avg_percentile=avg_percentiles.get(r.bartender_name) if avg_percentiles is not None else None,
         )
         for r in rows
     ]
 
-    return LeaderboardResponse(
-        bar_id=current.bar_id,
-        start_date=start_date,
-        end_date=end_date,
-        entries=entries,
+    return cache.render(
+        LeaderboardResponse(
+            bar_id=current.bar_id,
+            start_date=start_date,
+            end_date=end_date,
+            entries=entries,
+        )
     )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.deps import get_read_user
+from app.api.read_cache import CachedRead, read_cache
+from app.db.session import ReadSession, get_read_db
+from app.models.user import User, UserRole
+from app.schemas.reports import ReportResponse, ReportRow
+from app.services.reports import DIMENSION_COLUMNS, ReportDimension, shift_report
+
+
+router = APIRouter(prefix="/reports")
+
+
+@router.get("/shifts", response_model=ReportResponse)
+async def get_shift_report(
+    group_by: list[ReportDimension] = Query([], description="Any of spot, bartender, weekday, month; repeat to combine"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
+):
+    """Average score, sales per hour and tip % with shift counts, per cell of
+    the requested grouping (e.g. spot x weekday). Only scored shifts count."""
+
+    if current.role != UserRole.owner:
+        raise HTTPException(status_code=403, detail="Owner access required")
+    if cache.fresh is not None:
+        return cache.fresh
+
+    dimensions = list(dict.fromkeys(group_by))
+    rows = await db.run(shift_report, current.bar_id, dimensions, start_date, end_date)
+
+    out = [
+        ReportRow(
+            **{DIMENSION_COLUMNS[d].key: getattr(r, DIMENSION_COLUMNS[d].key) for d in dimensions},
+            shifts_count=r.shifts_count,
+            avg_score=float(r.avg_score),
+            avg_sales_per_hour=float(r.avg_sales_per_hour),
+            avg_tip_pct=float(r.avg_tip_pct),
+        )
+        for r in rows
+        # An empty range still yields one (all-NULL) row when nothing is grouped.
+        if r.shifts_count
+    ]
+
+    return cache.render(
+        ReportResponse(
+            bar_id=current.bar_id,
+            start_date=start_date,
+            end_date=end_date,
+            group_by=[d.value for d in dimensions],
+            rows=out,
+        )
+    )
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.deps import require_owner
+from app.db.session import get_db
+from app.models.rescore_job import RescoreJob, RescoreJobStatus
+from app.models.spot import Spot
+from app.models.user import User
+from app.schemas.rescoring import RescoreJobCreateIn, RescoreJobOut, RescoreJobResumeIn
+from app.services.rescoring import is_resumable, run_job, start_job
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/rescore-jobs")
+
+
+def _run_in_background(bind: Engine, job_id: int, workers: int) -> None:
+    db = sessionmaker(autocommit=False, autoflush=False, bind=bind)()
+    try:
+        run_job(db, job_id, workers=workers)
+    except Exception:
+        # run_job already recorded the failure on the job row; it can be resumed.
+        logger.exception("Rescore job %s failed", job_id)
+    finally:
+        db.close()
+
+
+def _get_job_or_404(db: Session, owner: User, job_id: int) -> RescoreJob:
+    job = db.query(RescoreJob).filter(RescoreJob.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Rescore job not found")
+    if job.bar_id != owner.bar_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return job
+
+
+@router.post("", response_model=RescoreJobOut)
+def create_rescore_job(
+    payload: RescoreJobCreateIn,
+    background: BackgroundTasks,
+    owner: User = Depends(require_owner),
+    db: Session = Depends(get_db),
+):
+    """Rescore the bar's stored shifts (optionally one spot) with current caps.
+
+    The job runs after the response is sent; poll GET /rescore-jobs/{id}.
+    """
+
+    if payload.spot_id is not None:
+        spot = db.query(Spot).filter(Spot.id == payload.spot_id).first()
+        if spot is None:
+            raise HTTPException(status_code=404, detail="Spot not found")
+        if spot.bar_id != owner.bar_id:
+            raise HTTPException(status_code=403, detail="Not allowed")
+
+    job = start_job(db, owner.bar_id, payload.spot_id)
+    background.add_task(_run_in_background, db.get_bind(), job.id, payload.workers)
+    return RescoreJobOut.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=RescoreJobOut)
+def get_rescore_job(job_id: int, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    return RescoreJobOut.model_validate(_get_job_or_404(db, owner, job_id))
+
+
+@router.post("/{job_id}/resume", response_model=RescoreJobOut)
+def resume_rescore_job(
+    job_id: int,
+    payload: RescoreJobResumeIn,
+    background: BackgroundTasks,
+    owner: User = Depends(require_owner),
+    db: Session = Depends(get_db),
+):
+    job = _get_job_or_404(db, owner, job_id)
+    if job.status == RescoreJobStatus.completed:
+        raise HTTPException(status_code=400, detail="Rescore job already completed")
+    if not is_resumable(job):
+        # Double-clicked resumes are also caught by run_job's atomic claim.
+        raise HTTPException(status_code=409, detail="Rescore job is already running")
+
+    background.add_task(_run_in_background, db.get_bind(), job.id, payload.workers)
+    return RescoreJobOut.model_validate(job)
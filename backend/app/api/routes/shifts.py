@@ -1,26 +1,57 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import date
 
-from app.api.deps import get_current_user, require_owner
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.deps import get_read_user, require_owner
+from app.api.read_cache import CachedRead, read_cache
+from app.db.session import ReadSession, get_db, get_db_factory, get_read_db
 from app.models.score_result import ScoreResult
 from app.models.shift import Shift
-from app.models.spot_score_config import SpotScoreConfig
 from app.models.user import User, UserRole
-from app.schemas.shifts import ShiftCreateIn, ShiftDeleteOut, ShiftOut, ShiftUpdateIn
-from app.services.scoring import compute_shift
+from app.schemas.shifts import (
+    ShiftCreateIn,
+    ShiftDeleteOut,
+    ShiftImportError,
+    ShiftImportOut,
+    ShiftOut,
+    ShiftUpdateIn,
+    shift_out_dict,
+)
+from app.services import leaderboard_rollup
+from app.services.auto_caps import auto_caps
+from app.services.cohort_ranks import cohort_ranks
+from app.services.leaderboard_rollup import RolledShift, RollupDeltas
+from app.services.shift_export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    iter_csv,
+    iter_parquet,
+    iter_row_chunks,
+    parquet_available,
+)
+from app.services.shift_import import ImportFormat, detect_format, import_shifts as run_import, iter_raw_rows
+from app.services.spot_scorers import refresh_auto_caps, spot_scorers
 
 
 router = APIRouter(prefix="/shifts")
 
 
-def _get_shift_or_404(db: Session, shift_id: int) -> Shift:
-    shift = db.query(Shift).filter(Shift.id == shift_id).first()
-    if shift is None:
+def _get_shift_with_score_or_404(db: Session, shift_id: int) -> tuple[Shift, ScoreResult | None]:
+    # One round trip for both; every caller needs the score too.
+    row = (
+        db.query(Shift, ScoreResult)
+        .outerjoin(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.id == shift_id)
+        .first()
+    )
+    if row is None:
         raise HTTPException(status_code=404, detail="Shift not found")
-    return shift
+    return row[0], row[1]
 
 
 def _ensure_can_view_shift(current: User, shift: Shift) -> None:
@@ -40,15 +71,11 @@ def create_shift(payload: ShiftCreateIn, owner: User = Depends(require_owner), d
     if payload.bar_id != owner.bar_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    cfg = (
-        db.query(SpotScoreConfig)
-        .filter(SpotScoreConfig.spot_id == payload.spot_id)
-        .first()
-    )
-    if cfg is None:
+    scorer = spot_scorers.get(db, payload.spot_id)
+    if scorer is None:
         raise HTTPException(status_code=400, detail="SpotScoreConfig missing for this spot")
 
-    shift, score = compute_shift(payload, cfg)
+    shift, score = scorer.score(payload)
     db.add(shift)
     db.flush()
 
@@ -59,58 +86,182 @@ def create_shift(payload: ShiftCreateIn, owner: User = Depends(require_owner), d
         breakdown_json=score.breakdown,
     )
     db.add(score_result)
+
+    rollup = RollupDeltas()
+    rollup.add(RolledShift.of(shift), score.score_total)
+    leaderboard_rollup.apply(db, rollup)
+
     db.commit()
     db.refresh(shift)
 
-    return ShiftOut.from_orm_with_score(shift, score_result)
+    auto_caps.observe(shift)
+    if refresh_auto_caps(db, scorer):
+        db.commit()
+
+    cohort_ranks.record(shift.spot_id, shift.id, shift.shift_date, score_result.score_total)
+    return ShiftOut.from_orm_with_score(shift, score_result, _percentile(db, shift, score_result))
+
+
+@router.post("/import", response_model=ShiftImportOut)
+def import_shifts(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Query(None),
+    owner: User = Depends(require_owner),
+    db: Session = Depends(get_db),
+):
+    """Bulk-create shifts from a CSV (with header) or NDJSON upload.
+
+    Rows may omit bar_id; it defaults to the owner's bar. Invalid rows are
+    reported by line number and the rest of the file is still imported.
+    """
+
+    fmt = format or detect_format(file.filename, file.content_type)
+    result = run_import(db, owner.bar_id, iter_raw_rows(file.file, fmt))
+    return ShiftImportOut(
+        inserted=result.inserted,
+        failed=result.failed,
+        errors=[ShiftImportError(line=e.line, detail=e.detail) for e in result.errors],
+    )
+
+
+@router.get("/export")
+def export_shifts(
+    bar_id: int = Query(...),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    format: ExportFormat = Query(ExportFormat.csv),
+    owner: User = Depends(require_owner),
+    session_maker: sessionmaker = Depends(get_db_factory),
+):
+    """Download every shift (with its score) for the bar, oldest first.
+
+    The body is streamed as it is read, so exports of any size use a constant
+    amount of memory. Parquet needs pyarrow installed on the server.
+    """
+
+    if bar_id != owner.bar_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if format == ExportFormat.parquet and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server")
+
+    chunks = iter_row_chunks(session_maker, bar_id, start_date, end_date)
+    body = iter_parquet(chunks) if format == ExportFormat.parquet else iter_csv(chunks)
+    filename = f"shifts-bar{bar_id}.{format.value}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _percentile(db: Session, shift: Shift, score: ScoreResult | None) -> float | None:
+    return _percentiles(db, [(shift, score)])[0]
+
+
+def _percentiles(db: Session, rows: list[tuple[Shift, ScoreResult | None]]) -> list[float | None]:
+    return cohort_ranks.percentiles(
+        db, [(shift.spot_id, shift.shift_date, score.score_total if score is not None else None) for shift, score in rows]
+    )
+
+
+def _shift_with_score(db: Session, shift_id: int) -> tuple[Shift, ScoreResult | None, float | None]:
+    shift, score = _get_shift_with_score_or_404(db, shift_id)
+    return shift, score, _percentile(db, shift, score)
 
 
 @router.get("/{shift_id}", response_model=ShiftOut)
-def get_shift_detail(
+async def get_shift_detail(
     shift_id: int,
-    current: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
 ):
-    shift = _get_shift_or_404(db, shift_id)
+    shift, score, percentile = await db.run(_shift_with_score, shift_id)
     _ensure_can_view_shift(current, shift)
+    return JSONResponse(shift_out_dict(shift, score, percentile))
+
+
+def _parse_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        day, _, shift_id = cursor.partition("_")
+        return date.fromisoformat(day), int(shift_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _shift_page(
+    db: Session,
+    current: User,
+    bar_id: int,
+    limit: int,
+    cursor: tuple[date, int] | None,
+    start_date: date | None,
+    end_date: date | None,
+    spot_id: int | None,
+    bartender: str | None,
+) -> list[tuple[Shift, ScoreResult | None]]:
+    q = (
+        db.query(Shift, ScoreResult)
+        .outerjoin(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.bar_id == bar_id)
+    )
+    if current.role == UserRole.employee:
+        # MVP mapping: shifts are keyed by bartender_name; later we will store bartender_user_id.
+        q = q.filter(Shift.bartender_name == current.name)
+    if bartender is not None:
+        q = q.filter(Shift.bartender_name == bartender)
+    if spot_id is not None:
+        q = q.filter(Shift.spot_id == spot_id)
+    if start_date is not None:
+        q = q.filter(Shift.shift_date >= start_date)
+    if end_date is not None:
+        q = q.filter(Shift.shift_date <= end_date)
+    if cursor is not None:
+        q = q.filter(tuple_(Shift.shift_date, Shift.id) < cursor)
 
-    score = db.query(ScoreResult).filter(ScoreResult.shift_id == shift.id).first()
-    return ShiftOut.from_orm_with_score(shift, score)
+    return q.order_by(Shift.shift_date.desc(), Shift.id.desc()).limit(limit).all()
+
+
+def _ranked_shift_page(db: Session, *args) -> tuple[list[tuple[Shift, ScoreResult | None]], list[float | None]]:
+    rows = _shift_page(db, *args)
+    return rows, _percentiles(db, rows)
 
 
 @router.get("", response_model=list[ShiftOut])
-def list_shifts(
+async def list_shifts(
     bar_id: int = Query(...),
     limit: int = Query(25, ge=1, le=200),
-    current: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    spot_id: int | None = Query(None),
+    bartender: str | None = Query(None, min_length=1, max_length=80),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
 ):
-    if bar_id != current.bar_id:
-        raise HTTPException(status_code=403, detail="Not allowed")
+    """Page of shifts, newest shift_date first (ties broken by id).
 
-    shifts = (
-        db.query(Shift)
-        .filter(Shift.bar_id == bar_id)
-        .order_by(Shift.id.desc())
-        .limit(limit)
-        .all()
-    )
+    Pages are keyed on (shift_date, id), so each one costs the same however deep
+    the caller has paged. When more rows may follow, the X-Next-Cursor response
+    header holds the value to pass as `cursor` for the next page.
+    """
 
-    if current.role == UserRole.employee:
-        # MVP mapping: shifts are keyed by bartender_name; later we will store bartender_user_id.
-        shifts = [s for s in shifts if s.bartender_name == current.name]
-
-    shift_ids = [s.id for s in shifts]
-    scores = (
-        db.query(ScoreResult)
-        .filter(ScoreResult.shift_id.in_(shift_ids))
-        .all()
-        if shift_ids
-        else []
+    if bar_id != current.bar_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if cache.fresh is not None:
+        return cache.fresh
+
+    after = _parse_cursor(cursor) if cursor is not None else None
+    rows, percentiles = await db.run(_ranked_shift_page, current, bar_id, limit, after, start_date, end_date, spot_id, bartender)
+    headers = {}
+    if len(rows) == limit:
+        last = rows[-1][0]
+        headers["X-Next-Cursor"] = f"{last.shift_date.isoformat()}_{last.id}"
+
+    return cache.render_content(
+        [shift_out_dict(shift, score, pct) for (shift, score), pct in zip(rows, percentiles)],
+        headers=headers,
     )
-    score_by_shift_id = {s.shift_id: s for s in scores}
-
-    return [ShiftOut.from_orm_with_score(s, score_by_shift_id.get(s.id)) for s in shifts]
 
 
 @router.patch("/{shift_id}", response_model=ShiftOut)
@@ -120,10 +271,12 @@ def update_shift(
     owner: User = Depends(require_owner),
     db: Session = Depends(get_db),
 ):
-    shift = _get_shift_or_404(db, shift_id)
+    shift, score_result = _get_shift_with_score_or_404(db, shift_id)
     if shift.bar_id != owner.bar_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
+    old_spot_id = shift.spot_id
+    old_rolled = RolledShift.of(shift)
     new_bar_id = shift.bar_id
     new_spot_id = payload.spot_id if payload.spot_id is not None else shift.spot_id
     new_bartender_name = payload.bartender_name if payload.bartender_name is not None else shift.bartender_name
@@ -138,11 +291,11 @@ def update_shift(
         payload.transactions_count if payload.transactions_count is not None else shift.transactions_count
     )
 
-    cfg = db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == new_spot_id).first()
-    if cfg is None:
+    scorer = spot_scorers.get(db, new_spot_id)
+    if scorer is None:
         raise HTTPException(status_code=400, detail="SpotScoreConfig missing for this spot")
 
-    computed_shift, score = compute_shift(
+    computed_shift, score = scorer.score(
         ShiftCreateIn(
             bar_id=new_bar_id,
             spot_id=new_spot_id,
@@ -153,8 +306,7 @@ def update_shift(
             personal_tips=new_personal_tips,
             hours_worked=new_hours_worked,
             transactions_count=new_transactions_count,
-        ),
-        cfg,
+        )
     )
 
     shift.spot_id = computed_shift.spot_id
@@ -170,18 +322,31 @@ def update_shift(
     shift.sales_per_hour = computed_shift.sales_per_hour
     db.add(shift)
 
-    score_result = db.query(ScoreResult).filter(ScoreResult.shift_id == shift.id).first()
+    rollup = RollupDeltas()
     if score_result is None:
         score_result = ScoreResult(shift_id=shift.id, score_total=score.score_total, score_version=score.score_version, breakdown_json=score.breakdown)
     else:
+        rollup.remove(old_rolled, score_result.score_total)
         score_result.score_total = score.score_total
         score_result.score_version = score.score_version
         score_result.breakdown_json = score.breakdown
     db.add(score_result)
 
+    rollup.add(RolledShift.of(shift), score.score_total)
+    leaderboard_rollup.apply(db, rollup)
+
     db.commit()
     db.refresh(shift)
-    return ShiftOut.from_orm_with_score(shift, score_result)
+
+    if shift.spot_id != old_spot_id:
+        auto_caps.forget(old_spot_id, shift.id)
+        cohort_ranks.forget(old_spot_id, shift.id)
+    auto_caps.observe(shift)
+    if refresh_auto_caps(db, scorer):
+        db.commit()
+
+    cohort_ranks.record(shift.spot_id, shift.id, shift.shift_date, score_result.score_total)
+    return ShiftOut.from_orm_with_score(shift, score_result, _percentile(db, shift, score_result))
 
 
 @router.delete("/{shift_id}", response_model=ShiftDeleteOut)
@@ -190,15 +355,20 @@ def delete_shift(
     owner: User = Depends(require_owner),
     db: Session = Depends(get_db),
 ):
-    shift = _get_shift_or_404(db, shift_id)
+    shift, score_result = _get_shift_with_score_or_404(db, shift_id)
     if shift.bar_id != owner.bar_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    score_result = db.query(ScoreResult).filter(ScoreResult.shift_id == shift.id).first()
     if score_result is not None:
+        rollup = RollupDeltas()
+        rollup.remove(RolledShift.of(shift), score_result.score_total)
+        leaderboard_rollup.apply(db, rollup)
         db.delete(score_result)
 
+    spot_id = shift.spot_id
     db.delete(shift)
     db.commit()
 
+    auto_caps.forget(spot_id, shift_id)
+    cohort_ranks.forget(spot_id, shift_id)
     return ShiftDeleteOut(deleted=True)
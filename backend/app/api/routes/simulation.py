@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_read_user
+from app.db.session import ReadSession, get_read_db
+from app.models.user import User, UserRole
+from app.schemas.simulation import ScoreDistribution, ScoreSimulationIn, ScoreSimulationOut, SimulatedBartender
+from app.services.simulation import SimulationResult, candidate_scorers, distribution, load_history, simulate
+
+
+router = APIRouter(prefix="/score-simulations")
+
+
+def _load(db: Session, bar_id: int, payload: ScoreSimulationIn):
+    scenarios = {s.spot_id: s.model_dump(exclude={"spot_id"}, exclude_none=True) for s in payload.spots}
+    return candidate_scorers(db, bar_id, scenarios), load_history(db, bar_id, payload.start_date, payload.end_date)
+
+
+def _bartenders(result: SimulationResult) -> list[SimulatedBartender]:
+    b = result.bartenders
+    out = [
+        SimulatedBartender(
+            bartender_name=name,
+            shifts_count=count,
+            current_avg=current,
+            simulated_avg=simulated,
+            avg_change=simulated - current,
+            current_rank=current_rank,
+            simulated_rank=simulated_rank,
+            rank_change=current_rank - simulated_rank,
+        )
+        for name, count, current, simulated, current_rank, simulated_rank in zip(
+            b.name,
+            b.shifts_count.tolist(),
+            b.current_avg.tolist(),
+            b.simulated_avg.tolist(),
+            b.current_rank.tolist(),
+            b.simulated_rank.tolist(),
+        )
+    ]
+    return sorted(out, key=lambda e: e.simulated_rank)
+
+
+@router.post("", response_model=ScoreSimulationOut)
+async def simulate_scores(
+    payload: ScoreSimulationIn,
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+):
+    """Rescore the bar's shifts in range with candidate caps/weights for some
+    spots and compare with the stored scores. Nothing is written."""
+
+    if current.role != UserRole.owner:
+        raise HTTPException(status_code=403, detail="Owner access required")
+    if len({s.spot_id for s in payload.spots}) != len(payload.spots):
+        raise HTTPException(status_code=422, detail="Each spot may appear once")
+
+    try:
+        scorers, history = await db.run(_load, current.bar_id, payload)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    # The number crunching stays off the event loop.
+    result = await run_in_threadpool(simulate, history, scorers)
+    return ScoreSimulationOut(
+        bar_id=current.bar_id,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        shifts=result.shifts,
+        rescored_shifts=result.rescored,
+        current=ScoreDistribution(**distribution(result.current)),
+        simulated=ScoreDistribution(**distribution(result.simulated)),
+        bartenders=_bartenders(result),
+    )
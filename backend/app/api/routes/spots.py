@@ -3,24 +3,45 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, require_owner
-from app.db.session import get_db
+from app.api.deps import get_read_user, require_owner
+from app.api.read_cache import CachedRead, read_cache
+from app.db.session import ReadSession, get_db, get_read_db
 from app.models.shift import Shift
 from app.models.spot import Spot
 from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
 from app.models.user import User
-from app.schemas.spots import SpotCreateIn, SpotOut
+from app.schemas.spots import SpotCreateIn, SpotOut, SpotScoreConfigOut, SpotScoreConfigUpdateIn
+from app.services.auto_caps import auto_caps
+from app.services.scoring import METRICS, build_scorer
+from app.services.spot_scorers import spot_scorers
 
 
 router = APIRouter(prefix="/spots")
 
+# Fields a PATCH may change but not clear; null resets the others (weights,
+# percentiles) to their defaults.
+_REQUIRED_CONFIG_FIELDS = frozenset(
+    {"cap_mode", "score_version", "window_days", *(f"{metric}_{end}" for metric in METRICS for end in ("low", "high"))}
+)
+
+
+def _spots_for_bar(db: Session, bar_id: int) -> list[Spot]:
+    return db.query(Spot).filter(Spot.bar_id == bar_id).order_by(Spot.id.asc()).all()
+
 
 @router.get("", response_model=list[SpotOut])
-def list_spots(bar_id: int = Query(...), current: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def list_spots(
+    bar_id: int = Query(...),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
+):
     if bar_id != current.bar_id:
         raise HTTPException(status_code=403, detail="Not allowed")
-    spots = db.query(Spot).filter(Spot.bar_id == bar_id).order_by(Spot.id.asc()).all()
-    return [SpotOut.model_validate(s) for s in spots]
+    if cache.fresh is not None:
+        return cache.fresh
+    spots = await db.run(_spots_for_bar, bar_id)
+    return cache.render([SpotOut.model_validate(s) for s in spots])
 
 
 @router.post("", response_model=SpotOut)
@@ -68,5 +89,77 @@ def delete_spot(spot_id: int, owner: User = Depends(require_owner), db: Session
     db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == spot_id).delete()
     db.delete(spot)
     db.commit()
+    # The bulk delete bypasses the session hooks that drop changed scorers.
+    spot_scorers.invalidate([spot_id])
 
     return {"status": "ok"}
+
+
+def _get_config_or_404(db: Session, owner: User, spot_id: int) -> SpotScoreConfig:
+    cfg = db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == spot_id).first()
+    if cfg is None:
+        raise HTTPException(status_code=404, detail="SpotScoreConfig not found")
+    if cfg.bar_id != owner.bar_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return cfg
+
+
+@router.get("/{spot_id}/score-config", response_model=SpotScoreConfigOut)
+def get_score_config(spot_id: int, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    return SpotScoreConfigOut.model_validate(_get_config_or_404(db, owner, spot_id))
+
+
+@router.patch("/{spot_id}/score-config", response_model=SpotScoreConfigOut)
+def update_score_config(
+    spot_id: int,
+    payload: SpotScoreConfigUpdateIn,
+    owner: User = Depends(require_owner),
+    db: Session = Depends(get_db),
+):
+    cfg = _get_config_or_404(db, owner, spot_id)
+    previous_window_days = cfg.window_days
+
+    changes = payload.model_dump(exclude_unset=True)
+    cleared = sorted(field for field, value in changes.items() if value is None and field in _REQUIRED_CONFIG_FIELDS)
+    if cleared:
+        raise HTTPException(status_code=422, detail=f"{', '.join(cleared)} cannot be null")
+    for field, value in changes.items():
+        setattr(cfg, field, value)
+
+    for metric in METRICS:
+        if getattr(cfg, f"{metric}_low") >= getattr(cfg, f"{metric}_high"):
+            raise HTTPException(status_code=422, detail=f"{metric}_low must be below {metric}_high")
+    if (
+        cfg.low_percentile is not None
+        and cfg.high_percentile is not None
+        and cfg.low_percentile >= cfg.high_percentile
+    ):
+        raise HTTPException(status_code=422, detail="low_percentile must be below high_percentile")
+    # Unknown formula versions and all-zero weights.
+    try:
+        build_scorer(cfg)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    if cfg.window_days != previous_window_days:
+        auto_caps.invalidate([spot_id])
+    # Switching to auto (or changing its settings) takes effect right away.
+    auto_caps.refresh_caps(db, cfg, force=True)
+
+    db.commit()
+    db.refresh(cfg)
+    return SpotScoreConfigOut.model_validate(cfg)
+
+
+@router.post("/{spot_id}/score-config/recompute", response_model=SpotScoreConfigOut)
+def recompute_score_config(spot_id: int, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    cfg = _get_config_or_404(db, owner, spot_id)
+    if cfg.cap_mode != SpotCapMode.auto:
+        raise HTTPException(status_code=400, detail="Spot is not in auto cap mode")
+
+    if not auto_caps.refresh_caps(db, cfg, force=True):
+        raise HTTPException(status_code=400, detail="Not enough recent shifts to compute caps")
+
+    db.commit()
+    db.refresh(cfg)
+    return SpotScoreConfigOut.model_validate(cfg)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.deps import get_read_user
+from app.api.read_cache import CachedRead, read_cache
+from app.db.session import ReadSession, get_read_db
+from app.models.user import User, UserRole
+from app.schemas.trends import TrendPoint, TrendResponse
+from app.services.scoring import METRICS
+from app.services.trends import TrendBucket, bartender_trend
+
+
+router = APIRouter(prefix="/trends")
+
+
+@router.get("", response_model=TrendResponse)
+async def get_bartender_trend(
+    bartender: str | None = Query(None, min_length=1, max_length=80, description="Owners only; employees see their own trend"),
+    bucket: TrendBucket = Query(TrendBucket.week),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    current: User = Depends(get_read_user),
+    db: ReadSession = Depends(get_read_db),
+    cache: CachedRead = Depends(read_cache),
+):
+    """Score trend for one bartender, one point per day, week or month."""
+
+    if current.role == UserRole.owner:
+        if bartender is None:
+            raise HTTPException(status_code=400, detail="bartender is required")
+        name = bartender
+    else:
+        # MVP mapping: shifts are keyed by bartender_name; later we will store bartender_user_id.
+        if bartender is not None and bartender != current.name:
+            raise HTTPException(status_code=403, detail="Not allowed")
+        name = current.name
+
+    if cache.fresh is not None:
+        return cache.fresh
+
+    rows = await db.run(bartender_trend, current.bar_id, name, bucket, start_date, end_date)
+    points = [
+        TrendPoint(
+            period_start=r.period_start,
+            shifts_count=r.shifts_count,
+            avg_score=float(r.avg_score),
+            avg_points={metric: float(getattr(r, f"avg_points_{metric}") or 0.0) for metric in METRICS},
+            rolling_7=float(r.rolling_7),
+            rolling_30=float(r.rolling_30),
+        )
+        for r in rows
+    ]
+
+    return cache.render(
+        TrendResponse(
+            bar_id=current.bar_id,
+            bartender_name=name,
+            bucket=bucket.value,
+            start_date=start_date,
+            end_date=end_date,
+            points=points,
+        )
+    )
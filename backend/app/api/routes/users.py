@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import require_owner
-from app.core.security import hash_password
+from app.core.password_pool import hash_password_async
 from app.db.session import get_db
 from app.models.user import User, UserRole
 from app.schemas.users import EmployeeCreateIn, OwnerCreateIn, UserOut
@@ -13,8 +14,13 @@ from app.schemas.users import EmployeeCreateIn, OwnerCreateIn, UserOut
 router = APIRouter(prefix="/users")
 
 
-@router.post("/employees", response_model=UserOut)
-def create_employee(payload: EmployeeCreateIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+def _create_user(
+    db: Session,
+    owner: User,
+    payload: EmployeeCreateIn | OwnerCreateIn,
+    role: UserRole,
+    password_hash: str,
+) -> UserOut:
     existing = db.query(User).filter(User.email == str(payload.email).strip().lower()).first()
     if existing is not None:
         raise HTTPException(status_code=400, detail="Username/email already in use")
@@ -23,8 +29,8 @@ def create_employee(payload: EmployeeCreateIn, owner: User = Depends(require_own
         bar_id=owner.bar_id,
         email=str(payload.email).strip().lower(),
         name=payload.name,
-        role=UserRole.employee,
-        password_hash=hash_password(payload.password),
+        role=role,
+        password_hash=password_hash,
         is_active=True,
     )
     db.add(user)
@@ -33,24 +39,16 @@ def create_employee(payload: EmployeeCreateIn, owner: User = Depends(require_own
     return UserOut.model_validate(user)
 
 
-@router.post("/owners", response_model=UserOut)
-def create_owner(payload: OwnerCreateIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == str(payload.email).strip().lower()).first()
-    if existing is not None:
-        raise HTTPException(status_code=400, detail="Username/email already in use")
+@router.post("/employees", response_model=UserOut)
+async def create_employee(payload: EmployeeCreateIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_user, db, owner, payload, UserRole.employee, password_hash)
 
-    user = User(
-        bar_id=owner.bar_id,
-        email=str(payload.email).strip().lower(),
-        name=payload.name,
-        role=UserRole.owner,
-        password_hash=hash_password(payload.password),
-        is_active=True,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return UserOut.model_validate(user)
+
+@router.post("/owners", response_model=UserOut)
+async def create_owner(payload: OwnerCreateIn, owner: User = Depends(require_owner), db: Session = Depends(get_db)):
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_user, db, owner, payload, UserRole.owner, password_hash)
 
 
 @router.get("", response_model=list[UserOut])
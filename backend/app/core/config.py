@@ -16,11 +16,109 @@ class Settings(BaseSettings):
         validation_alias="DATABASE_URL",
     )
 
+    # Apply pending schema migrations (app/db/migrations.py) at startup.
     auto_create_tables: bool = Field(
         default=True,
         validation_alias="AUTO_CREATE_TABLES",
     )
 
+    # File-backed SQLite databases get the deployment profile from app/db/sqlite.py:
+    # WAL journaling, synchronous=NORMAL, mmap, a larger page cache and a busy
+    # timeout on every connection, plus a periodic PRAGMA optimize.
+    sqlite_tuning: bool = Field(
+        default=True,
+        validation_alias="SQLITE_TUNING",
+    )
+    sqlite_mmap_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        validation_alias="SQLITE_MMAP_BYTES",
+    )
+    sqlite_cache_kib: int = Field(
+        default=64 * 1024,
+        validation_alias="SQLITE_CACHE_KIB",
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        validation_alias="SQLITE_BUSY_TIMEOUT_MS",
+    )
+    sqlite_optimize_interval_seconds: float = Field(
+        default=3600.0,
+        validation_alias="SQLITE_OPTIMIZE_INTERVAL_SECONDS",
+    )
+
+    # Read-heavy routes use an async engine (aiosqlite/aiomysql) when enabled;
+    # set ASYNC_DB=false to serve them from the sync engine on the threadpool.
+    async_db: bool = Field(
+        default=True,
+        validation_alias="ASYNC_DB",
+    )
+
+    # Optional read replicas (comma-separated URLs). Read routes serve a bar from
+    # them once its user is known, except for REPLICA_STICKY_SECONDS after this
+    # process wrote to the bar, so a client reads its own writes; writes, logins
+    # and token lookups always use DATABASE_URL.
+    replica_database_urls: str = Field(
+        default="",
+        validation_alias="REPLICA_DATABASE_URLS",
+    )
+    replica_sticky_seconds: float = Field(
+        default=10.0,
+        validation_alias="REPLICA_STICKY_SECONDS",
+    )
+
+    # bcrypt runs on its own pool: 0 workers means min(4, CPU count). Requests
+    # beyond workers + queue get a 503 instead of waiting.
+    password_hash_workers: int = Field(
+        default=0,
+        validation_alias="PASSWORD_HASH_WORKERS",
+    )
+    password_hash_queue: int = Field(
+        default=64,
+        validation_alias="PASSWORD_HASH_QUEUE",
+    )
+
+    # Authenticated users are cached per process for this long (0 disables).
+    principal_cache_ttl_seconds: float = Field(
+        default=60.0,
+        validation_alias="PRINCIPAL_CACHE_TTL_SECONDS",
+    )
+    principal_cache_max_entries: int = Field(
+        default=10_000,
+        validation_alias="PRINCIPAL_CACHE_MAX_ENTRIES",
+    )
+
+    # How long a process trusts its cached per-bar data versions before re-reading
+    # them (bounds how late it notices writes made by other processes).
+    data_version_refresh_seconds: float = Field(
+        default=2.0,
+        validation_alias="DATA_VERSION_REFRESH_SECONDS",
+    )
+    response_cache_max_entries: int = Field(
+        default=2048,
+        validation_alias="RESPONSE_CACHE_MAX_ENTRIES",
+    )
+
+    # Auto caps are learned from per-process spot windows; a loaded window is
+    # re-read after this long so shifts written by other processes count.
+    auto_caps_ttl_seconds: float = Field(
+        default=300.0,
+        validation_alias="AUTO_CAPS_TTL_SECONDS",
+    )
+
+    # Score percentiles come from per-process spot/weekday indexes; a loaded spot
+    # is re-read after this long so writes from other processes show up.
+    cohort_rank_ttl_seconds: float = Field(
+        default=300.0,
+        validation_alias="COHORT_RANK_TTL_SECONDS",
+    )
+
+    # Compiled per-spot scorers are rebuilt after this long so config changes
+    # from other processes show up (changes made in-process apply at commit).
+    scorer_cache_ttl_seconds: float = Field(
+        default=60.0,
+        validation_alias="SCORER_CACHE_TTL_SECONDS",
+    )
+
     jwt_secret_key: str = Field(
         default="change-me",
         validation_alias="JWT_SECRET_KEY",
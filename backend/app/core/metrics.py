@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Bucketed observations for one label set; rendered cumulatively."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class QueryTally:
+    """Statements run (and time spent in the driver) on behalf of one request.
+
+    Closed once the response is sent; background tasks run later in the same
+    context and must not count toward the request.
+    """
+
+    __slots__ = ("count", "seconds", "closed")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.closed = False
+
+
+# Set by MetricsMiddleware for the duration of a request. Starlette copies the
+# context into threadpool calls, so sync routes and dependencies see it too.
+_current_tally: ContextVar[QueryTally | None] = ContextVar("query_tally", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tally = _current_tally.get()
+    if context is not None and tally is not None and not tally.closed:
+        context._metrics_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tally = _current_tally.get()
+    started = getattr(context, "_metrics_started", None)
+    if tally is not None and started is not None and not tally.closed:
+        tally.count += 1
+        tally.seconds += perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements run on `engine` (or an AsyncEngine's sync_engine) per request."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _labels(**labels: object) -> str:
+    def escape(value: object) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """Per-route request latency, status counts, in-flight requests and DB
+    queries, plus gauges pulled from registered collectors at render time.
+
+    Routes are labelled by their path template ("/api/shifts/{shift_id}"), so
+    label sets stay bounded; requests that match no route share "unmatched".
+    """
+
+    def __init__(self, prefix: str = "shiftscore"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._collectors: dict[str, Callable[[], Mapping[str, float]]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self._latency: dict[tuple[str, str], Histogram] = {}
+            self._queries: dict[tuple[str, str], Histogram] = {}
+            self._query_seconds: dict[tuple[str, str], float] = {}
+            self._statuses: dict[tuple[str, str, int], int] = {}
+
+    def add_collector(self, name: str, collect: Callable[[], Mapping[str, float]]) -> None:
+        """Export collect()'s numeric values as gauges named <prefix>_<name>_<key>."""
+
+        self._collectors[name] = collect
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, queries: QueryTally) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = Histogram(LATENCY_BUCKETS)
+                self._queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self._query_seconds[key] = 0.0
+            latency.observe(seconds)
+            self._queries[key].observe(queries.count)
+            self._query_seconds[key] += queries.seconds
+            status_key = (method, route, status)
+            self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+
+    def _histogram_lines(self, name: str, histograms: dict[tuple[str, str], Histogram]) -> list[str]:
+        lines = []
+        for (method, route), hist in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*map(str, hist.bounds), "+Inf"), hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(method=method, route=route)} {hist.sum!r}")
+            lines.append(f"{name}_count{_labels(method=method, route=route)} {cumulative}")
+        return lines
+
+    def render(self) -> str:
+        p = self.prefix
+        with self._lock:
+            lines = [
+                f"# HELP {p}_http_requests_in_flight Requests currently being served.",
+                f"# TYPE {p}_http_requests_in_flight gauge",
+                f"{p}_http_requests_in_flight {self.in_flight}",
+                f"# HELP {p}_http_requests_total Requests served, by route and status.",
+                f"# TYPE {p}_http_requests_total counter",
+                *(
+                    f"{p}_http_requests_total{_labels(method=method, route=route, status=status)} {count}"
+                    for (method, route, status), count in sorted(self._statuses.items())
+                ),
+                f"# HELP {p}_http_request_duration_seconds Request latency, by route.",
+                f"# TYPE {p}_http_request_duration_seconds histogram",
+                *self._histogram_lines(f"{p}_http_request_duration_seconds", self._latency),
+                f"# HELP {p}_db_queries_per_request Database statements run per request, by route.",
+                f"# TYPE {p}_db_queries_per_request histogram",
+                *self._histogram_lines(f"{p}_db_queries_per_request", self._queries),
+                f"# HELP {p}_db_query_seconds_total Time spent in database statements, by route.",
+                f"# TYPE {p}_db_query_seconds_total counter",
+                *(
+                    f"{p}_db_query_seconds_total{_labels(method=method, route=route)} {seconds!r}"
+                    for (method, route), seconds in sorted(self._query_seconds.items())
+                ),
+            ]
+
+        for name, collect in self._collectors.items():
+            for key, value in collect().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                lines.append(f"# TYPE {p}_{name}_{key} gauge")
+                lines.append(f"{p}_{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding request_metrics.
+
+    Plain ASGI rather than BaseHTTPMiddleware: it adds no task or body
+    buffering, and streamed responses are timed until their last chunk. The
+    request is recorded when that last chunk is sent, so BackgroundTasks (which
+    Starlette runs afterwards, inside the same call) are not counted.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        tally = QueryTally()
+        started = perf_counter()
+
+        def finish() -> None:
+            if tally.closed:
+                return
+            tally.closed = True
+            elapsed = perf_counter() - started
+            # The router records the matched route in the scope.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.metrics.finished(scope["method"], route, status, elapsed, tally)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        token = _current_tally.set(tally)
+        self.metrics.started()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_tally.reset(token)
+            # Responses that never completed (errors, disconnects) end here.
+            finish()
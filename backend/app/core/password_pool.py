@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+from app.core.config import get_settings
+from app.core.security import hash_password, verify_password
+
+
+T = TypeVar("T")
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised instead of queueing more bcrypt work than the pool allows."""
+
+
+class PasswordPool:
+    """Size-limited executor for bcrypt hashing and verification.
+
+    bcrypt releases the GIL, so a few dedicated threads run it in parallel while
+    the request threadpool and event loop stay free for cheap endpoints. At most
+    `workers + max_queue` operations may be pending; beyond that run() fails
+    fast with PasswordPoolSaturated rather than letting a login storm build an
+    unbounded backlog.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _done(self, _: Future) -> None:
+        # Counted when the work finishes, even if the awaiting request went away.
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordPoolSaturated
+            self._pending += 1
+
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(self._pending, self.workers),
+                "queued": max(self._pending - self.workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+@lru_cache
+def get_password_pool() -> PasswordPool:
+    settings = get_settings()
+    workers = settings.password_hash_workers or min(4, os.cpu_count() or 1)
+    return PasswordPool(workers=workers, max_queue=settings.password_hash_queue)
+
+
+async def hash_password_async(password: str) -> str:
+    return await get_password_pool().run(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await get_password_pool().run(verify_password, password, password_hash)
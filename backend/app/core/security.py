@@ -3,26 +3,34 @@ from __future__ import annotations
 import base64
 import hashlib
 from datetime import datetime, timedelta
-
-from cryptography.fernet import Fernet
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 
 from app.core.config import get_settings
 
 
-_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt, jose and cryptography are imported on first use rather than at
+# module import: together they are a large share of the app's import time, and
+# a worker should be able to answer /health before anyone signs in.
+
+
+@lru_cache
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return _pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return _pwd_context.verify(password, password_hash)
+    return _pwd_context().verify(password, password_hash)
 
 
 def create_access_token(*, subject: str, role: str, bar_id: int) -> str:
+    from jose import jwt
+
     settings = get_settings()
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_exp_minutes)
     payload = {
@@ -35,6 +43,8 @@ def create_access_token(*, subject: str, role: str, bar_id: int) -> str:
 
 
 def decode_token(token: str) -> dict:
+    from jose import JWTError, jwt
+
     settings = get_settings()
     try:
         return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
@@ -42,7 +52,9 @@ def decode_token(token: str) -> dict:
         raise ValueError("Invalid token") from exc
 
 
-def _fernet() -> Fernet:
+def _fernet():
+    from cryptography.fernet import Fernet
+
     settings = get_settings()
     # Derive a stable, urlsafe-Base64 32-byte key from the configured JWT secret.
     raw = hashlib.sha256(settings.jwt_secret_key.encode("utf-8")).digest()
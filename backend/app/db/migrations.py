@@ -0,0 +1,199 @@
+"""Versioned schema migrations.
+
+The schema_version table holds a single row with the version of the last
+applied migration. A boot against an up-to-date database reads that row and
+nothing else; only when migrations are pending does it take a lock (GET_LOCK
+on MySQL, BEGIN IMMEDIATE on SQLite), re-read the version and apply the rest
+in order. Add new migrations at the end of MIGRATIONS with the next version;
+never edit one that has shipped.
+
+The baseline is not frozen DDL: it runs create_all (and the rollup rebuild)
+against the models as they are when it runs. A new database is therefore
+created with every later column and index already in place, and then still
+runs every later migration. Each migration after the baseline must be
+idempotent against that: probe for what it adds (inspect().get_columns,
+checkfirst=True) rather than assuming the previous version's schema, as
+_add_score_formula_columns does.
+
+    python -m app.db.migrations            # apply pending migrations
+    python -m app.db.migrations --status   # print current/latest version
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.models.base import Base
+from app.models.leaderboard_rollup import LeaderboardRollup
+from app.models.report_rollup import ReportRollup
+from app.models.score_result import ScoreResult
+from app.services import leaderboard_rollup
+
+
+# Kept off Base.metadata: create_all and the models never manage it.
+schema_version = Table("schema_version", MetaData(), Column("version", Integer, nullable=False))
+
+MYSQL_LOCK_NAME = "shiftscore_migrations"
+MYSQL_LOCK_TIMEOUT_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _add_bartender_temp_columns(conn: Connection) -> None:
+    # Databases created before bartender provisioning lack these columns.
+    existing = {c["name"] for c in inspect(conn).get_columns("bartenders")}
+    user_id_type = "INTEGER" if conn.dialect.name == "sqlite" else "INT"
+    for name, ddl in (
+        ("user_id", f"{user_id_type} NULL"),
+        ("temp_username", "VARCHAR(100) NULL"),
+        ("temp_password_enc", "VARCHAR(512) NULL"),
+    ):
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE bartenders ADD COLUMN {name} {ddl}"))
+
+
+def _baseline(conn: Connection) -> None:
+    """The schema as of the switch to migrations, on a new or pre-migration database."""
+
+    Base.metadata.create_all(bind=conn)
+    _add_bartender_temp_columns(conn)
+    # create_all only creates indexes together with new tables.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+    # Rollup tables added to a database that already had scores start out empty.
+    with Session(bind=conn) as db:
+        rollups_empty = db.query(LeaderboardRollup.id).first() is None or db.query(ReportRollup.id).first() is None
+        if rollups_empty and db.query(ScoreResult.id).first() is not None:
+            leaderboard_rollup.rebuild(db)
+            db.flush()
+
+
+def _add_score_formula_columns(conn: Connection) -> None:
+    # A database baselined by this code already has them (create_all).
+    existing = {c["name"] for c in inspect(conn).get_columns("spot_score_configs")}
+    for name, ddl in (
+        ("score_version", "VARCHAR(32) NOT NULL DEFAULT 'v1'"),
+        ("sales_volume_weight", "FLOAT NULL"),
+        ("pct_of_bar_sales_weight", "FLOAT NULL"),
+        ("tip_pct_weight", "FLOAT NULL"),
+        ("sales_per_hour_weight", "FLOAT NULL"),
+    ):
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE spot_score_configs ADD COLUMN {name} {ddl}"))
+
+
+# Everything after the baseline must be a no-op on a schema that already has
+# its change (see the module docstring).
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline schema", _baseline),
+    Migration(2, "per-spot score formula and weights", _add_score_formula_columns),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: Connection) -> int:
+    """The recorded schema version; 0 for a new or pre-migration database."""
+
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(schema_version.c.version)).scalar() or 0
+
+
+def _recorded_version(engine: Engine) -> int:
+    # The boot fast path: one SELECT, no reflection.
+    with engine.connect() as conn:
+        try:
+            return conn.execute(select(schema_version.c.version)).scalar() or 0
+        except (OperationalError, ProgrammingError):
+            return 0
+
+
+def _set_version(conn: Connection, version: int) -> None:
+    schema_version.create(conn, checkfirst=True)
+    conn.execute(delete(schema_version))
+    conn.execute(insert(schema_version).values(version=version))
+
+
+@contextmanager
+def _migration_lock(engine: Engine) -> Iterator[Connection]:
+    """A connection holding the cross-process migration lock."""
+
+    with engine.connect() as conn:
+        if conn.dialect.name == "mysql":
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": MYSQL_LOCK_NAME, "timeout": MYSQL_LOCK_TIMEOUT_SECONDS}
+            ).scalar()
+            # 0 on timeout, NULL on error: never migrate without the lock.
+            if acquired != 1:
+                raise RuntimeError(
+                    f"Could not take the {MYSQL_LOCK_NAME!r} migration lock within {MYSQL_LOCK_TIMEOUT_SECONDS}s"
+                    " (another process may be migrating); retry once it finishes"
+                )
+            try:
+                yield conn
+            finally:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MYSQL_LOCK_NAME})
+        else:
+            if conn.dialect.name == "sqlite":
+                # Takes the database write lock up front; other booting workers wait here.
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+            yield conn
+
+
+def migrate(engine: Engine) -> int:
+    """Apply pending migrations; returns the schema version afterwards."""
+
+    recorded = _recorded_version(engine)
+    if recorded >= LATEST_VERSION:
+        return recorded
+
+    with _migration_lock(engine) as conn:
+        # Another worker may have migrated while we waited for the lock.
+        version = current_version(conn)
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            migration.apply(conn)
+            _set_version(conn, migration.version)
+            version = migration.version
+            if conn.dialect.name != "sqlite":
+                # MySQL commits DDL implicitly; record each step as it lands.
+                conn.commit()
+        conn.commit()
+    return version
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.session import get_engine
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--status", action="store_true", help="only print the current and latest version")
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    if args.status:
+        with engine.connect() as conn:
+            print(f"schema version {current_version(conn)} (latest {LATEST_VERSION})")
+        return
+    print(f"schema version {migrate(engine)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+from app.core.config import get_settings
+
+
+class PrimaryPins:
+    """Bars this process wrote to recently, whose reads must stay on the primary.
+
+    Replicas lag the primary; a bar is pinned for `sticky_seconds` after each
+    commit that touched it, which covers the usual write-then-read of one
+    client. Writes from other processes are not seen here: their clients may
+    read stale data from a replica until it catches up.
+    """
+
+    def __init__(self, sticky_seconds: float):
+        self.sticky_seconds = sticky_seconds
+        self._lock = threading.Lock()
+        self._until: dict[int, float] = {}
+
+    def pin(self, bar_ids: Iterable[int]) -> None:
+        until = time.monotonic() + self.sticky_seconds
+        with self._lock:
+            for bar_id in bar_ids:
+                self._until[bar_id] = until
+
+    def pinned(self, bar_id: int) -> bool:
+        with self._lock:
+            until = self._until.get(bar_id)
+            if until is None:
+                return False
+            if until > time.monotonic():
+                return True
+            del self._until[bar_id]
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+primary_pins = PrimaryPins(sticky_seconds=get_settings().replica_sticky_seconds)
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from itertools import count
+from typing import Any, Callable, Sequence, TypeVar
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
+from app.core.metrics import instrument_engine
+from app.db.routing import primary_pins
+from app.db.sqlite import configure_sqlite
+
+
+T = TypeVar("T")
+
+# Async drivers used for the read path, by database backend.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "aiomysql"}
 
 
 @lru_cache
 def get_engine():
     settings = get_settings()
-    return create_engine(settings.database_url, pool_pre_ping=True)
+    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    configure_sqlite(engine, settings)
+    instrument_engine(engine)
+    return engine
 
 
 @lru_cache
@@ -25,3 +42,193 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_db_factory() -> sessionmaker:
+    """Session factory for work that outlives the request, like a streamed body.
+
+    FastAPI closes get_db's session before a StreamingResponse is iterated, so
+    such routes open (and close) their own session from this factory instead.
+    """
+
+    return get_session_maker()
+
+
+def async_database_url(database_url: str):
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+@lru_cache
+def get_async_engine():
+    settings = get_settings()
+    engine = create_async_engine(async_database_url(settings.database_url), pool_pre_ping=True)
+    configure_sqlite(engine.sync_engine, settings)
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def pool_stats(engine) -> dict:
+    """Connection pool gauges; pools without a fixed size report what they have."""
+
+    pool = engine.pool
+    stats = {}
+    for key, name in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[key] = method()
+    if "overflow" in stats:
+        # QueuePool counts up from -pool_size; only connections beyond the pool are overflow.
+        stats["overflow"] = max(stats["overflow"], 0)
+    return stats
+
+
+def engine_pool_stats() -> dict:
+    return pool_stats(get_engine()) if get_engine.cache_info().currsize else {}
+
+
+def async_engine_pool_stats() -> dict:
+    # Only once the read path has created the engine; metrics never create one.
+    return pool_stats(get_async_engine()) if get_async_engine.cache_info().currsize else {}
+
+
+@lru_cache
+def get_async_session_maker():
+    return async_sessionmaker(autoflush=False, bind=get_async_engine())
+
+
+def replica_urls() -> list[str]:
+    return [url.strip() for url in get_settings().replica_database_urls.split(",") if url.strip()]
+
+
+@lru_cache
+def get_replica_session_makers() -> tuple[sessionmaker, ...]:
+    settings = get_settings()
+    makers = []
+    for url in replica_urls():
+        engine = create_engine(url, pool_pre_ping=True)
+        configure_sqlite(engine, settings)
+        instrument_engine(engine)
+        makers.append(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    return tuple(makers)
+
+
+@lru_cache
+def get_async_replica_session_makers() -> tuple[async_sessionmaker, ...]:
+    settings = get_settings()
+    makers = []
+    for url in replica_urls():
+        engine = create_async_engine(async_database_url(url), pool_pre_ping=True)
+        configure_sqlite(engine.sync_engine, settings)
+        instrument_engine(engine.sync_engine)
+        makers.append(async_sessionmaker(autoflush=False, bind=engine))
+    return tuple(makers)
+
+
+def replica_pool_stats() -> dict:
+    """Pool gauges summed over the replicas the process has opened."""
+
+    stats: dict = {}
+    engines = []
+    if get_replica_session_makers.cache_info().currsize:
+        engines += [maker.kw["bind"] for maker in get_replica_session_makers()]
+    if get_async_replica_session_makers.cache_info().currsize:
+        engines += [maker.kw["bind"] for maker in get_async_replica_session_makers()]
+    for engine in engines:
+        for key, value in pool_stats(engine).items():
+            stats[key] = stats.get(key, 0) + value
+    return stats
+
+
+# Spreads replica sessions across the configured replicas.
+_replica_turn = count()
+
+
+class ReadSession:
+    """Database handle for the async read routes.
+
+    Query code stays ordinary ORM code taking a sync Session. With ASYNC_DB on,
+    run() executes it through AsyncSession.run_sync, so the event loop awaits the
+    driver instead of parking a worker thread; with it off, it runs on the
+    threadpool against a regular Session. Each run() ends its read transaction,
+    so a request waiting on the event loop or the threadpool never holds a
+    pooled connection.
+
+    Reads start on the primary. Once the request's bar is known, route() moves
+    the rest of them to a replica, if any are configured and the bar is not
+    pinned to the primary by a recent write.
+    """
+
+    def __init__(self, session: AsyncSession | Session, replicas: Sequence[sessionmaker | async_sessionmaker] = ()):
+        self.primary = session
+        self.session = session
+        self.replicas = replicas
+
+    @property
+    def on_replica(self) -> bool:
+        return self.session is not self.primary
+
+    def route(self, bar_id: int) -> None:
+        if not self.replicas or self.on_replica or primary_pins.pinned(bar_id):
+            return
+        maker = self.replicas[next(_replica_turn) % len(self.replicas)]
+        self.session = maker(expire_on_commit=False)
+
+    async def close_replica(self) -> None:
+        if not self.on_replica:
+            return
+        replica, self.session = self.session, self.primary
+        if isinstance(replica, AsyncSession):
+            await replica.close()
+        else:
+            await run_in_threadpool(replica.close)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if isinstance(self.session, AsyncSession):
+            result = await self.session.run_sync(fn, *args)
+            await self.session.commit()
+            return result
+
+        def _run() -> T:
+            result = fn(self.session, *args)
+            self.session.commit()
+            return result
+
+        return await run_in_threadpool(_run)
+
+
+async def open_read_session(
+    async_maker: async_sessionmaker,
+    sync_maker: sessionmaker,
+    async_replicas: Sequence[async_sessionmaker] = (),
+    sync_replicas: Sequence[sessionmaker] = (),
+):
+    # Loaded objects stay usable after run() ends its transaction.
+    if get_settings().async_db:
+        async with async_maker(expire_on_commit=False) as session:
+            read = ReadSession(session, async_replicas)
+            try:
+                yield read
+            finally:
+                await read.close_replica()
+        return
+
+    db = sync_maker(expire_on_commit=False)
+    read = ReadSession(db, sync_replicas)
+    try:
+        yield read
+    finally:
+        await read.close_replica()
+        db.close()
+
+
+async def get_read_db():
+    if replica_urls():
+        replicas = {"async_replicas": get_async_replica_session_makers(), "sync_replicas": get_replica_session_makers()}
+    else:
+        replicas = {}
+    async for session in open_read_session(get_async_session_maker(), get_session_maker(), **replicas):
+        yield session
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def is_sqlite_file(engine: Engine) -> bool:
+    database = engine.url.database
+    return engine.dialect.name == "sqlite" and bool(database) and database != ":memory:" and not database.startswith("file::memory:")
+
+
+def sqlite_pragmas(settings: Settings) -> dict[str, object]:
+    """Per-connection pragmas of the SQLite deployment profile.
+
+    WAL lets readers keep reading while a write is in progress; with it,
+    synchronous=NORMAL is still crash-safe and fsyncs at checkpoints rather
+    than on every commit. A negative cache_size is in KiB.
+    """
+
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": settings.sqlite_mmap_bytes,
+        "cache_size": -settings.sqlite_cache_kib,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+    }
+
+
+def configure_sqlite(engine: Engine, settings: Settings | None = None) -> None:
+    """Apply the profile to every new connection of a file-backed SQLite engine.
+
+    Pass an AsyncEngine's sync_engine for aiosqlite. Other databases, in-memory
+    SQLite and SQLITE_TUNING=false are left alone.
+    """
+
+    settings = settings or get_settings()
+    if not settings.sqlite_tuning or not is_sqlite_file(engine):
+        return
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def optimize(engine: Engine) -> None:
+    """ANALYZE a database that has never been analyzed; otherwise PRAGMA optimize,
+    which re-analyzes only tables whose statistics have drifted."""
+
+    with engine.connect() as conn:
+        analyzed = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")).first() is not None
+        conn.exec_driver_sql("PRAGMA optimize" if analyzed else "ANALYZE")
+        conn.commit()
+
+
+class SqliteOptimizer:
+    """Runs optimize() on a daemon thread: once at start, then every interval."""
+
+    def __init__(self, engine: Engine, interval_seconds: float):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.last_run: float | None = None
+        self.runs = 0
+        self.failures = 0
+        self.last_failure: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sqlite-optimize", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_failure": self.last_failure,
+        }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                optimize(self.engine)
+                self.last_run = time.time()
+                self.runs += 1
+            except Exception:
+                # Statistics are an optimization; a busy or read-only database just skips a round.
+                self.failures += 1
+                self.last_failure = time.time()
+                logger.warning("SQLite optimize failed; retrying in %ss", self.interval_seconds, exc_info=True)
+            if self._stop.wait(self.interval_seconds):
+                return
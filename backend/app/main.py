@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-import time
-
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import inspect, text
-from sqlalchemy.exc import OperationalError
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.api.read_cache import response_cache
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.db.session import get_engine
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, request_metrics
+from app.core.password_pool import PasswordPoolSaturated, get_password_pool
+from app.db.migrations import migrate
+from app.db.session import async_engine_pool_stats, engine_pool_stats, get_engine, replica_pool_stats
+from app.db.sqlite import SqliteOptimizer, is_sqlite_file
 import app.models  # noqa: F401
-from app.models.base import Base
+from app.services.cohort_ranks import cohort_ranks
+from app.services.principals import principal_cache
+from app.services.spot_scorers import spot_scorers
 
 
 app = FastAPI(title="ShiftScore API", version="0.1.0")
@@ -27,7 +31,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+# Outermost, so CORS preflights and error responses are counted too.
+app.add_middleware(MetricsMiddleware)
+
+
+def _sqlite_optimizer_stats() -> dict:
+    # Only started for a tuned SQLite file database.
+    optimizer = getattr(app.state, "sqlite_optimizer", None)
+    return {"enabled": False} if optimizer is None else {"enabled": True, **optimizer.stats()}
+
+
+request_metrics.add_collector("db_pool", engine_pool_stats)
+request_metrics.add_collector("db_async_pool", async_engine_pool_stats)
+request_metrics.add_collector("db_replica_pool", replica_pool_stats)
+request_metrics.add_collector("password_pool", lambda: get_password_pool().stats())
+request_metrics.add_collector("principal_cache", principal_cache.stats)
+request_metrics.add_collector("response_cache", response_cache.stats)
+request_metrics.add_collector("cohort_ranks", cohort_ranks.stats)
+request_metrics.add_collector("spot_scorers", spot_scorers.stats)
+request_metrics.add_collector("sqlite_optimizer", _sqlite_optimizer_stats)
 
 
 @app.get("/")
@@ -40,62 +64,72 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(request_metrics.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/api/health")
 def api_health():
     return {"status": "ok"}
 
 
+@app.get("/api/health/password-pool")
+def password_pool_health():
+    return get_password_pool().stats()
+
+
+@app.get("/api/health/principal-cache")
+def principal_cache_health():
+    return principal_cache.stats()
+
+
+@app.get("/api/health/response-cache")
+def response_cache_health():
+    return response_cache.stats()
+
+
+@app.get("/api/health/cohort-ranks")
+def cohort_ranks_health():
+    return cohort_ranks.stats()
+
+
+@app.get("/api/health/sqlite-optimizer")
+def sqlite_optimizer_health():
+    return _sqlite_optimizer_stats()
+
+
+@app.exception_handler(PasswordPoolSaturated)
+async def _password_pool_saturated(request: Request, exc: PasswordPoolSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-ins in progress; please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+def _startup_migrate():
+    # Once the schema is current this is a single SELECT of the schema_version row.
+    # Production can set AUTO_CREATE_TABLES=false and run `python -m app.db.migrations`.
+    if get_settings().auto_create_tables:
+        migrate(get_engine())
+
+
 @app.on_event("startup")
-def _startup_create_tables():
-    # Dev-friendly: auto-create tables. For production, we’ll switch to migrations.
-    if not get_settings().auto_create_tables:
-        return
-
-    def _ensure_bartender_temp_columns() -> None:
-        engine = get_engine()
-        inspector = inspect(engine)
-        if "bartenders" not in inspector.get_table_names():
-            return
-        existing = {c["name"] for c in inspector.get_columns("bartenders")}
-        dialect = engine.dialect.name
-
-        col_user_id = "INTEGER" if dialect == "sqlite" else "INT"
-        col_temp_username = "VARCHAR(100)"
-        col_temp_password = "VARCHAR(512)"
-
-        statements: list[str] = []
-        if "user_id" not in existing:
-            statements.append(f"ALTER TABLE bartenders ADD COLUMN user_id {col_user_id} NULL")
-        if "temp_username" not in existing:
-            statements.append(f"ALTER TABLE bartenders ADD COLUMN temp_username {col_temp_username} NULL")
-        if "temp_password_enc" not in existing:
-            statements.append(f"ALTER TABLE bartenders ADD COLUMN temp_password_enc {col_temp_password} NULL")
-
-        if not statements:
-            return
-
-        with engine.begin() as conn:
-            for stmt in statements:
-                conn.execute(text(stmt))
-
-    # Uvicorn's reload can trigger overlapping startups. MySQL DDL isn't atomic with
-    # SQLAlchemy's check-then-create, so we retry a few times on transient errors.
-    for attempt in range(5):
-        try:
-            Base.metadata.create_all(bind=get_engine())
-            _ensure_bartender_temp_columns()
-            return
-        except OperationalError as exc:
-            message = str(getattr(exc, "orig", exc))
-            is_transient = (
-                "already exists" in message
-                or "Table" in message and "already exists" in message
-                or "definition is being modified by concurrent DDL" in message
-            )
-            if is_transient and attempt < 4:
-                time.sleep(0.3 * (attempt + 1))
-                continue
-            raise
+def _startup_sqlite_optimizer():
+    settings = get_settings()
+    engine = get_engine()
+    if settings.sqlite_tuning and settings.sqlite_optimize_interval_seconds > 0 and is_sqlite_file(engine):
+        app.state.sqlite_optimizer = SqliteOptimizer(engine, settings.sqlite_optimize_interval_seconds)
+        app.state.sqlite_optimizer.start()
+
+
+@app.on_event("shutdown")
+def _shutdown_sqlite_optimizer():
+    optimizer = getattr(app.state, "sqlite_optimizer", None)
+    if optimizer is not None:
+        optimizer.stop()
 
 
 app.include_router(api_router)
@@ -1,5 +1,9 @@
 from app.models.bartender import Bartender  # noqa: F401
 from app.models.bar import Bar  # noqa: F401
+from app.models.bar_data_version import BarDataVersion  # noqa: F401
+from app.models.leaderboard_rollup import LeaderboardRollup  # noqa: F401
+from app.models.report_rollup import ReportRollup  # noqa: F401
+from app.models.rescore_job import RescoreJob  # noqa: F401
 from app.models.score_result import ScoreResult  # noqa: F401
 from app.models.shift import Shift  # noqa: F401
 from app.models.spot import Spot  # noqa: F401
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class BarDataVersion(Base):
+    """Counter bumped in every transaction that changes a bar's data."""
+
+    __tablename__ = "bar_data_versions"
+
+    bar_id: Mapped[int] = mapped_column(ForeignKey("bars.id"), primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LeaderboardRollup(Base):
+    """Per-day score totals for one bartender, maintained on every shift write."""
+
+    __tablename__ = "leaderboard_rollups"
+    __table_args__ = (
+        UniqueConstraint("bar_id", "bartender_name", "shift_date", name="uq_leaderboard_rollups_bar_bartender_date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    bar_id: Mapped[int] = mapped_column(ForeignKey("bars.id"))
+    bartender_name: Mapped[str] = mapped_column(String(100))
+    shift_date: Mapped[date] = mapped_column(Date)
+
+    # Only shifts that have a ScoreResult are counted, matching the leaderboard join.
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    shifts_count: Mapped[int] = mapped_column(Integer, default=0)
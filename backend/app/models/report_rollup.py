@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, SmallInteger, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ReportRollup(Base):
+    """Per-day totals for one bartender at one spot, maintained on every shift write."""
+
+    __tablename__ = "report_rollups"
+    __table_args__ = (
+        # Leading with shift_date lets date-ranged reports read a contiguous slice.
+        UniqueConstraint("bar_id", "shift_date", "spot_id", "bartender_name", name="uq_report_rollups_bar_date_spot_bartender"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    bar_id: Mapped[int] = mapped_column(ForeignKey("bars.id"))
+    spot_id: Mapped[int] = mapped_column(ForeignKey("spots.id"))
+    bartender_name: Mapped[str] = mapped_column(String(100))
+    shift_date: Mapped[date] = mapped_column(Date)
+
+    # Derived from shift_date and stored, so reports group without date functions.
+    weekday: Mapped[int] = mapped_column(SmallInteger)  # 0 = Monday
+    month: Mapped[date] = mapped_column(Date)  # first day of the month
+
+    # Only shifts that have a ScoreResult are counted, like LeaderboardRollup.
+    shifts_count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    sales_per_hour_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    tip_pct_sum: Mapped[float] = mapped_column(Float, default=0.0)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
-from sqlalchemy import Date, Float, ForeignKey, Integer, String
+from sqlalchemy import Date, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -10,6 +10,15 @@ from app.models.base import Base
 
 class Shift(Base):
     __tablename__ = "shifts"
+    __table_args__ = (
+        # Shift pages are ordered by (shift_date, id); the primary key rides along
+        # at the end of each index, so every filter combination below walks an
+        # index in page order instead of sorting.
+        Index("ix_shifts_bar_id_shift_date", "bar_id", "shift_date"),
+        # Per-bartender lookups within a bar (employee views, bartender deletes).
+        Index("ix_shifts_bar_id_bartender_name_shift_date", "bar_id", "bartender_name", "shift_date"),
+        Index("ix_shifts_bar_id_spot_id_shift_date", "bar_id", "spot_id", "shift_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     bar_id: Mapped[int] = mapped_column(ForeignKey("bars.id"), index=True)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 import enum
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -32,6 +32,15 @@ class SpotScoreConfig(Base):
     sales_per_hour_low: Mapped[float] = mapped_column(Float)
     sales_per_hour_high: Mapped[float] = mapped_column(Float)
 
+    # Scoring formula (see SCORE_VERSIONS in app/services/scoring.py). Weights
+    # are relative and only used by formulas that read them (v2); unset ones
+    # default to the v1 points.
+    score_version: Mapped[str] = mapped_column(String(32), default="v1", server_default="v1")
+    sales_volume_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    pct_of_bar_sales_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    tip_pct_weight: Mapped[float | None] = mapped_column(Float, default=None)
+    sales_per_hour_weight: Mapped[float | None] = mapped_column(Float, default=None)
+
     # Auto-caps metadata (optional)
     computed_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
     sample_size: Mapped[int | None] = mapped_column(default=None)
@@ -10,6 +10,8 @@ class LeaderboardEntry(BaseModel):
     avg_score: float = Field(..., ge=0, le=100)
     shifts_count: int = Field(..., ge=0)
     last_shift_date: date | None = None
+    # Mean spot/weekday percentile of the bartender's scores; only with ?percentiles=true.
+    avg_percentile: float | None = None
 
 
 class LeaderboardResponse(BaseModel):
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class ReportRow(BaseModel):
+    # Only the columns for the requested group_by dimensions are set.
+    spot_id: int | None = None
+    bartender_name: str | None = None
+    weekday: int | None = None  # 0 = Monday
+    month: date | None = None  # first day of the month
+
+    shifts_count: int
+    avg_score: float
+    avg_sales_per_hour: float
+    avg_tip_pct: float
+
+
+class ReportResponse(BaseModel):
+    bar_id: int
+    start_date: date | None = None
+    end_date: date | None = None
+    group_by: list[str]
+    rows: list[ReportRow]
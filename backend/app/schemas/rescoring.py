@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RescoreJobCreateIn(BaseModel):
+    spot_id: int | None = None
+    workers: int = Field(default=0, ge=0, le=16)
+
+
+class RescoreJobResumeIn(BaseModel):
+    workers: int = Field(default=0, ge=0, le=16)
+
+
+class RescoreJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    bar_id: int
+    spot_id: int | None
+    status: str
+    last_shift_id: int
+    processed: int
+    total: int
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
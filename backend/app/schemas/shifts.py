@@ -56,12 +56,56 @@ class ShiftOut(BaseModel):
     score_total: float | None = None
     score_version: str | None = None
     breakdown: dict | None = None
+    # Percentile (0-100) of score_total among shifts at the same spot on the same weekday.
+    score_percentile: float | None = None
 
     @classmethod
-    def from_orm_with_score(cls, shift, score_result):
+    def from_orm_with_score(cls, shift, score_result, score_percentile: float | None = None):
         data = cls.model_validate(shift).model_dump()
         if score_result is not None:
             data["score_total"] = float(score_result.score_total)
             data["score_version"] = score_result.score_version
             data["breakdown"] = score_result.breakdown_json
+            data["score_percentile"] = score_percentile
         return cls(**data)
+
+
+def shift_out_dict(shift, score_result, score_percentile: float | None = None) -> dict:
+    """JSON-ready ShiftOut for list/detail responses, built in one pass.
+
+    Skips pydantic entirely: the dict has ShiftOut's field order and value types,
+    so rendering it gives the same bytes as rendering from_orm_with_score().
+    Keep it in step with ShiftOut when fields change.
+    """
+
+    transactions_count = shift.transactions_count
+    return {
+        "id": shift.id,
+        "bar_id": shift.bar_id,
+        "spot_id": shift.spot_id,
+        "bartender_name": shift.bartender_name,
+        "shift_date": shift.shift_date.isoformat(),
+        "personal_sales_volume": float(shift.personal_sales_volume),
+        "total_bar_sales": float(shift.total_bar_sales),
+        "personal_tips": float(shift.personal_tips),
+        "hours_worked": float(shift.hours_worked),
+        "transactions_count": int(transactions_count) if transactions_count is not None else None,
+        "pct_of_bar_sales": float(shift.pct_of_bar_sales),
+        "tip_pct": float(shift.tip_pct),
+        "sales_per_hour": float(shift.sales_per_hour),
+        "score_total": float(score_result.score_total) if score_result is not None else None,
+        "score_version": score_result.score_version if score_result is not None else None,
+        "breakdown": score_result.breakdown_json if score_result is not None else None,
+        "score_percentile": score_percentile if score_result is not None else None,
+    }
+
+
+class ShiftImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class ShiftImportOut(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[ShiftImportError]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class SpotScenarioIn(BaseModel):
+    """Candidate config for one spot; unset fields keep the stored value."""
+
+    spot_id: int
+
+    sales_volume_low: float | None = Field(default=None, ge=0)
+    sales_volume_high: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_low: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_high: float | None = Field(default=None, ge=0)
+    tip_pct_low: float | None = Field(default=None, ge=0)
+    tip_pct_high: float | None = Field(default=None, ge=0)
+    sales_per_hour_low: float | None = Field(default=None, ge=0)
+    sales_per_hour_high: float | None = Field(default=None, ge=0)
+
+    score_version: str | None = Field(default=None, max_length=32)
+    sales_volume_weight: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_weight: float | None = Field(default=None, ge=0)
+    tip_pct_weight: float | None = Field(default=None, ge=0)
+    sales_per_hour_weight: float | None = Field(default=None, ge=0)
+
+
+class ScoreSimulationIn(BaseModel):
+    spots: list[SpotScenarioIn] = Field(min_length=1, max_length=100)
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class ScoreDistribution(BaseModel):
+    mean: float | None = None
+    # p10, p25, p50, p75, p90
+    percentiles: dict[str, float]
+    # Shift counts per 10-point score bucket, from [0, 10) to [90, 100].
+    histogram: list[int]
+
+
+class SimulatedBartender(BaseModel):
+    bartender_name: str
+    shifts_count: int
+    current_avg: float
+    simulated_avg: float
+    avg_change: float
+    current_rank: int
+    simulated_rank: int
+    # Positive when the bartender moves up the leaderboard.
+    rank_change: int
+
+
+class ScoreSimulationOut(BaseModel):
+    bar_id: int
+    start_date: date | None = None
+    end_date: date | None = None
+    shifts: int
+    rescored_shifts: int
+    current: ScoreDistribution
+    simulated: ScoreDistribution
+    # Ordered by simulated rank.
+    bartenders: list[SimulatedBartender]
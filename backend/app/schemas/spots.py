@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.models.spot_score_config import SpotCapMode
+
 
 class SpotOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -14,3 +18,59 @@ class SpotOut(BaseModel):
 class SpotCreateIn(BaseModel):
     bar_id: int
     name: str = Field(min_length=1, max_length=100)
+
+
+class SpotScoreConfigOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    spot_id: int
+    bar_id: int
+    cap_mode: SpotCapMode
+
+    sales_volume_low: float
+    sales_volume_high: float
+    pct_of_bar_sales_low: float
+    pct_of_bar_sales_high: float
+    tip_pct_low: float
+    tip_pct_high: float
+    sales_per_hour_low: float
+    sales_per_hour_high: float
+
+    score_version: str
+    sales_volume_weight: float | None = None
+    pct_of_bar_sales_weight: float | None = None
+    tip_pct_weight: float | None = None
+    sales_per_hour_weight: float | None = None
+
+    computed_at: datetime | None = None
+    sample_size: int | None = None
+    window_days: int | None = None
+    low_percentile: float | None = None
+    high_percentile: float | None = None
+
+
+class SpotScoreConfigUpdateIn(BaseModel):
+    cap_mode: SpotCapMode | None = None
+
+    # Manual caps; with cap_mode=auto these are overwritten on the next recompute.
+    sales_volume_low: float | None = Field(default=None, ge=0)
+    sales_volume_high: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_low: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_high: float | None = Field(default=None, ge=0)
+    tip_pct_low: float | None = Field(default=None, ge=0)
+    tip_pct_high: float | None = Field(default=None, ge=0)
+    sales_per_hour_low: float | None = Field(default=None, ge=0)
+    sales_per_hour_high: float | None = Field(default=None, ge=0)
+
+    # Scoring formula; weights are relative (v2 scales them to 100 points).
+    # An explicit null clears a weight or percentile back to its default.
+    score_version: str | None = Field(default=None, max_length=32)
+    sales_volume_weight: float | None = Field(default=None, ge=0)
+    pct_of_bar_sales_weight: float | None = Field(default=None, ge=0)
+    tip_pct_weight: float | None = Field(default=None, ge=0)
+    sales_per_hour_weight: float | None = Field(default=None, ge=0)
+
+    # Auto-caps settings
+    window_days: int | None = Field(default=None, ge=7, le=730)
+    low_percentile: float | None = Field(default=None, ge=0, le=100)
+    high_percentile: float | None = Field(default=None, ge=0, le=100)
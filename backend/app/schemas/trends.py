@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class TrendPoint(BaseModel):
+    period_start: date
+    shifts_count: int
+    avg_score: float
+    # Average points earned per metric (see scoring.METRICS).
+    avg_points: dict[str, float]
+    # Rolling means over the last N scored shifts, as of the period's last shift.
+    rolling_7: float
+    rolling_30: float
+
+
+class TrendResponse(BaseModel):
+    bar_id: int
+    bartender_name: str
+    bucket: str
+    start_date: date | None = None
+    end_date: date | None = None
+    points: list[TrendPoint]
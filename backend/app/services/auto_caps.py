@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+from app.services.scoring import METRICS
+
+
+# Planning-doc defaults for cap_mode=auto.
+DEFAULT_WINDOW_DAYS = 90
+DEFAULT_LOW_PERCENTILE = 10.0
+DEFAULT_HIGH_PERCENTILE = 90.0
+MIN_SAMPLE_SIZE = 20
+
+# Auto caps are refreshed on shift writes at most this often (or on demand).
+REFRESH_INTERVAL = timedelta(hours=24)
+
+# Sane absolute bounds so learned caps can't drift wildly.
+CAP_BOUNDS = {
+    "sales_volume": (0.0, 100_000.0),
+    "pct_of_bar_sales": (0.0, 1.0),
+    "tip_pct": (0.0, 1.0),
+    "sales_per_hour": (0.0, 10_000.0),
+}
+
+
+def _shift_values(shift: Shift) -> tuple[float, float, float, float]:
+    # Same order as METRICS.
+    return (shift.personal_sales_volume, shift.pct_of_bar_sales, shift.tip_pct, shift.sales_per_hour)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Linear interpolation between closest ranks (numpy's default method).
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    frac = rank - lo
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac
+
+
+class SpotWindow:
+    """Rolling window of one spot's shift metrics, kept sorted per metric.
+
+    Adds and removes are O(log n) searches plus a list shift; percentile reads
+    are O(1), so caps can be refreshed without going back to the database.
+    """
+
+    def __init__(self, window_days: int, today: date, loaded_at: float = 0.0):
+        self.window_days = window_days
+        self.loaded_at = loaded_at
+        self.cutoff = today - timedelta(days=window_days)
+        self._entries: dict[int, tuple[date, tuple[float, ...]]] = {}
+        self._sorted: dict[str, list[float]] = {metric: [] for metric in METRICS}
+        self._by_date: list[tuple[date, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, shift_id: int, shift_date: date, values: tuple[float, ...]) -> None:
+        self.remove(shift_id)
+        if shift_date < self.cutoff:
+            return
+        self._entries[shift_id] = (shift_date, values)
+        for metric, value in zip(METRICS, values):
+            insort(self._sorted[metric], value)
+        heapq.heappush(self._by_date, (shift_date, shift_id))
+
+    def remove(self, shift_id: int) -> None:
+        entry = self._entries.pop(shift_id, None)
+        if entry is None:
+            return
+        for metric, value in zip(METRICS, entry[1]):
+            values = self._sorted[metric]
+            del values[bisect_left(values, value)]
+        # The heap entry is dropped lazily in advance().
+
+    def advance(self, today: date) -> None:
+        """Move the window forward and evict shifts that fell out of it."""
+
+        self.cutoff = max(self.cutoff, today - timedelta(days=self.window_days))
+        while self._by_date and self._by_date[0][0] < self.cutoff:
+            shift_date, shift_id = heapq.heappop(self._by_date)
+            entry = self._entries.get(shift_id)
+            if entry is not None and entry[0] == shift_date:
+                self.remove(shift_id)
+
+    def percentile(self, metric: str, pct: float) -> float:
+        return _percentile(self._sorted[metric], pct)
+
+
+class AutoCapsEngine:
+    """Per-process cache of spot windows backing cap_mode=auto.
+
+    A spot's window is loaded from the database the first time its caps are
+    refreshed; after that the shift routes keep it current via record()/forget().
+    Spots that were never loaded ignore writes and load fresh when needed.
+    Loaded windows are reloaded after ttl_seconds, which bounds how long shifts
+    written by other processes (or by bulk paths) go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._windows: dict[int, SpotWindow] = {}
+
+    def record(self, spot_id: int, shift_id: int, shift_date: date, values: tuple[float, ...]) -> None:
+        with self._lock:
+            window = self._windows.get(spot_id)
+            if window is not None:
+                window.add(shift_id, shift_date, values)
+
+    def observe(self, shift: Shift) -> None:
+        self.record(shift.spot_id, shift.id, shift.shift_date, _shift_values(shift))
+
+    def forget(self, spot_id: int, shift_id: int) -> None:
+        with self._lock:
+            window = self._windows.get(spot_id)
+            if window is not None:
+                window.remove(shift_id)
+
+    def invalidate(self, spot_ids: Iterable[int] | None = None) -> None:
+        """Drop cached windows (all of them when spot_ids is None)."""
+
+        with self._lock:
+            if spot_ids is None:
+                self._windows.clear()
+                return
+            for spot_id in spot_ids:
+                self._windows.pop(spot_id, None)
+
+    def _window(self, db: Session, spot_id: int, window_days: int, today: date) -> SpotWindow:
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(spot_id)
+            if window is not None and window.window_days == window_days and now - window.loaded_at < self.ttl_seconds:
+                window.advance(today)
+                return window
+
+        window = SpotWindow(window_days, today, loaded_at=now)
+        rows = (
+            db.query(
+                Shift.id,
+                Shift.shift_date,
+                Shift.personal_sales_volume,
+                Shift.pct_of_bar_sales,
+                Shift.tip_pct,
+                Shift.sales_per_hour,
+            )
+            .filter(Shift.spot_id == spot_id)
+            .filter(Shift.shift_date >= window.cutoff)
+            .all()
+        )
+        for shift_id, shift_date, *values in rows:
+            window.add(shift_id, shift_date, tuple(values))
+
+        with self._lock:
+            self._windows[spot_id] = window
+        return window
+
+    def refresh_caps(self, db: Session, cfg: SpotScoreConfig, *, force: bool = False, now: datetime | None = None) -> bool:
+        """Recompute P-low/P-high caps for an auto-mode spot.
+
+        Returns True when cfg was modified (the caller commits). Caps are left
+        untouched until the window holds MIN_SAMPLE_SIZE shifts, and each learned
+        cap is clamped to CAP_BOUNDS; a metric whose clamped caps collapse keeps
+        its previous caps.
+        """
+
+        if cfg.cap_mode != SpotCapMode.auto:
+            return False
+
+        now = now or datetime.utcnow()
+        if not force and cfg.computed_at is not None and now - cfg.computed_at < REFRESH_INTERVAL:
+            return False
+
+        window_days = cfg.window_days or DEFAULT_WINDOW_DAYS
+        low_pct = cfg.low_percentile if cfg.low_percentile is not None else DEFAULT_LOW_PERCENTILE
+        high_pct = cfg.high_percentile if cfg.high_percentile is not None else DEFAULT_HIGH_PERCENTILE
+
+        window = self._window(db, cfg.spot_id, window_days, now.date())
+        with self._lock:
+            sample_size = len(window)
+            if sample_size < MIN_SAMPLE_SIZE:
+                return False
+            caps = {metric: (window.percentile(metric, low_pct), window.percentile(metric, high_pct)) for metric in METRICS}
+
+        for metric, (low, high) in caps.items():
+            floor, ceiling = CAP_BOUNDS[metric]
+            low = min(max(low, floor), ceiling)
+            high = min(max(high, floor), ceiling)
+            if high <= low:
+                continue
+            setattr(cfg, f"{metric}_low", low)
+            setattr(cfg, f"{metric}_high", high)
+
+        cfg.computed_at = now
+        cfg.sample_size = sample_size
+        cfg.window_days = window_days
+        cfg.low_percentile = low_pct
+        cfg.high_percentile = high_pct
+        return True
+
+
+auto_caps = AutoCapsEngine(ttl_seconds=get_settings().auto_caps_ttl_seconds)
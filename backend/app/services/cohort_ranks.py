@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+
+
+class CohortIndex:
+    """Sorted scores of one (spot, weekday) cohort.
+
+    Adds and removes are O(log n) searches plus a list shift; a percentile is
+    two binary searches.
+    """
+
+    def __init__(self, scores: dict[int, float] | None = None):
+        self._scores: dict[int, float] = scores or {}
+        self._sorted: list[float] = sorted(self._scores.values())
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, shift_id: int, score: float) -> None:
+        self.remove(shift_id)
+        self._scores[shift_id] = score
+        insort(self._sorted, score)
+
+    def remove(self, shift_id: int) -> None:
+        score = self._scores.pop(shift_id, None)
+        if score is not None:
+            del self._sorted[bisect_left(self._sorted, score)]
+
+    def percentile(self, score: float) -> float | None:
+        """Share of the cohort scoring below `score`, counting ties as half, in 0-100."""
+
+        if not self._sorted:
+            return None
+        below = bisect_left(self._sorted, score)
+        ties = bisect_right(self._sorted, score) - below
+        return 100.0 * (below + 0.5 * ties) / len(self._sorted)
+
+
+class SpotCohorts:
+    """The seven weekday cohorts of one spot, and where each shift is filed."""
+
+    def __init__(self, loaded_at: float, rows: Iterable[tuple[int, date, float]] = ()):
+        self.loaded_at = loaded_at
+        self._weekday_of: dict[int, int] = {}
+        scores: list[dict[int, float]] = [{} for _ in range(7)]
+        for shift_id, shift_date, score in rows:
+            weekday = shift_date.weekday()
+            scores[weekday][shift_id] = score
+            self._weekday_of[shift_id] = weekday
+        # Built in one sort per cohort rather than n insorts.
+        self.by_weekday = [CohortIndex(cohort) for cohort in scores]
+
+    def add(self, shift_id: int, shift_date: date, score: float) -> None:
+        self.remove(shift_id)
+        weekday = shift_date.weekday()
+        self.by_weekday[weekday].add(shift_id, score)
+        self._weekday_of[shift_id] = weekday
+
+    def remove(self, shift_id: int) -> None:
+        weekday = self._weekday_of.pop(shift_id, None)
+        if weekday is not None:
+            self.by_weekday[weekday].remove(shift_id)
+
+
+class CohortRanks:
+    """Per-process percentile ranks of scores within their spot/weekday cohort.
+
+    A spot's cohorts are loaded from the database the first time one of its
+    shifts is ranked; after that the shift writers keep them current via
+    record()/forget(). Spots that were never loaded ignore writes. Loaded
+    spots are reloaded after ttl_seconds, which bounds how long writes made by
+    other processes go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._spots: dict[int, SpotCohorts] = {}
+
+    def record(self, spot_id: int, shift_id: int, shift_date: date, score: float) -> None:
+        with self._lock:
+            cohorts = self._spots.get(spot_id)
+            if cohorts is not None:
+                cohorts.add(shift_id, shift_date, score)
+
+    def forget(self, spot_id: int, shift_id: int) -> None:
+        with self._lock:
+            cohorts = self._spots.get(spot_id)
+            if cohorts is not None:
+                cohorts.remove(shift_id)
+
+    def invalidate(self, spot_ids: Iterable[int] | None = None) -> None:
+        """Drop cached cohorts (all of them when spot_ids is None)."""
+
+        with self._lock:
+            if spot_ids is None:
+                self._spots.clear()
+                return
+            for spot_id in spot_ids:
+                self._spots.pop(spot_id, None)
+
+    def _load(self, db: Session, spot_ids: set[int]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            missing = {
+                spot_id
+                for spot_id in spot_ids
+                if spot_id not in self._spots or now - self._spots[spot_id].loaded_at >= self.ttl_seconds
+            }
+        for spot_id in sorted(missing):
+            rows = (
+                db.query(Shift.id, Shift.shift_date, ScoreResult.score_total)
+                .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+                .filter(Shift.spot_id == spot_id)
+                .all()
+            )
+            cohorts = SpotCohorts(now, rows)
+            with self._lock:
+                self._spots[spot_id] = cohorts
+
+    def percentiles(self, db: Session, shifts: Sequence[tuple[int, date, float | None]]) -> list[float | None]:
+        """Cohort percentile for each (spot_id, shift_date, score); None when unscored."""
+
+        self._load(db, {spot_id for spot_id, _, score in shifts if score is not None})
+        out: list[float | None] = []
+        with self._lock:
+            for spot_id, shift_date, score in shifts:
+                cohorts = self._spots.get(spot_id)
+                if score is None or cohorts is None:
+                    out.append(None)
+                else:
+                    out.append(cohorts.by_weekday[shift_date.weekday()].percentile(score))
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "spots": len(self._spots),
+                "shifts": sum(len(c) for cohorts in self._spots.values() for c in cohorts.by_weekday),
+            }
+
+
+cohort_ranks = CohortRanks(ttl_seconds=get_settings().cohort_rank_ttl_seconds)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.routing import primary_pins
+from app.models.bar_data_version import BarDataVersion
+
+
+_TOUCHED_KEY = "touched_bar_ids"
+
+
+def touch(db: Session, bar_ids: int | Iterable[int]) -> None:
+    """Mark bars as changed by the session's current transaction.
+
+    Flushed ORM objects with a bar_id are picked up automatically; call this for
+    writes that bypass the unit of work (Core inserts, bulk updates/deletes).
+    """
+
+    touched = db.info.setdefault(_TOUCHED_KEY, set())
+    if isinstance(bar_ids, int):
+        touched.add(bar_ids)
+    else:
+        touched.update(bar_ids)
+
+
+def _bump(db: Session, bar_ids: set[int]) -> None:
+    table = BarDataVersion.__table__
+    rows = [{"bar_id": bar_id, "version": 1} for bar_id in sorted(bar_ids)]
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table)
+        db.execute(stmt.on_conflict_do_update(index_elements=["bar_id"], set_={"version": table.c.version + 1}), rows)
+    elif dialect == "mysql":
+        stmt = mysql_insert(table)
+        db.execute(stmt.on_duplicate_key_update(version=table.c.version + 1), rows)
+    else:
+        for row in rows:
+            result = db.execute(update(table).where(table.c.bar_id == row["bar_id"]).values(version=table.c.version + 1))
+            if result.rowcount == 0:
+                db.execute(table.insert(), row)
+
+
+class DataVersions:
+    """Per-process view of each bar's data version.
+
+    Commits in this process drop the bar's entry, so the next read sees the new
+    version straight away. Writes from other processes (other workers, the
+    rescoring CLI) are picked up once the entry is older than `refresh_seconds`.
+    Between refreshes, current() answers from memory without a query.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._versions: dict[int, tuple[int, float]] = {}
+
+    def cached(self, bar_id: int) -> int | None:
+        with self._lock:
+            entry = self._versions.get(bar_id)
+        if entry is None or time.monotonic() - entry[1] > self.refresh_seconds:
+            return None
+        return entry[0]
+
+    def load(self, db: Session, bar_id: int) -> int:
+        version = db.execute(select(BarDataVersion.version).where(BarDataVersion.bar_id == bar_id)).scalar()
+        version = int(version or 0)
+        with self._lock:
+            self._versions[bar_id] = (version, time.monotonic())
+        return version
+
+    def forget(self, bar_ids: Iterable[int] | None = None) -> None:
+        with self._lock:
+            if bar_ids is None:
+                self._versions.clear()
+                return
+            for bar_id in bar_ids:
+                self._versions.pop(bar_id, None)
+
+
+data_versions = DataVersions(refresh_seconds=get_settings().data_version_refresh_seconds)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_touched_bars(session: Session, flush_context, instances) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        bar_id = getattr(obj, "bar_id", None)
+        if isinstance(bar_id, int) and not isinstance(obj, BarDataVersion):
+            touch(session, bar_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_touched_bars(session: Session) -> None:
+    # Flush first so pending objects are collected, then bump in the same transaction.
+    session.flush()
+    touched = session.info.get(_TOUCHED_KEY)
+    if touched:
+        _bump(session, touched)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_bars(session: Session) -> None:
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        data_versions.forget(touched)
+        primary_pins.pin(touched)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_touched_bars(session: Session, previous_transaction) -> None:
+    session.info.pop(_TOUCHED_KEY, None)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Mapping, NamedTuple
+
+from sqlalchemy import Table, and_, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.leaderboard_rollup import LeaderboardRollup
+from app.models.report_rollup import ReportRollup
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.services import data_versions
+from app.services.trends import TrendBucket, day_of_week, period_start
+
+
+RollupKey = tuple[int, str, date]
+ReportKey = tuple[int, int, str, date]
+
+
+class RolledShift(NamedTuple):
+    """The shift fields the rollups are keyed and summed on."""
+
+    bar_id: int
+    spot_id: int
+    bartender_name: str
+    shift_date: date
+    sales_per_hour: float
+    tip_pct: float
+
+    @classmethod
+    def of(cls, shift) -> RolledShift:
+        """From a Shift, a result row with the same column names, or a dict of them."""
+
+        if isinstance(shift, Mapping):
+            return cls(*(shift[name] for name in cls._fields))
+        return cls(*(getattr(shift, name) for name in cls._fields))
+
+
+class RollupDeltas:
+    """Accumulates rollup changes for one transaction: score/count per
+    (bar, bartender, day) for the leaderboard, and count/sums per
+    (bar, spot, bartender, day) for reports.
+    """
+
+    def __init__(self):
+        self._deltas: dict[RollupKey, list] = defaultdict(lambda: [0.0, 0])
+        self._report: dict[ReportKey, list] = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+
+    def __bool__(self) -> bool:
+        return bool(self._deltas or self._report)
+
+    def _count(self, shift: RolledShift, score: float, sign: int) -> None:
+        delta = self._deltas[(shift.bar_id, shift.bartender_name, shift.shift_date)]
+        delta[0] += sign * score
+        delta[1] += sign
+        cell = self._report[(shift.bar_id, shift.spot_id, shift.bartender_name, shift.shift_date)]
+        cell[0] += sign
+        cell[1] += sign * score
+        cell[2] += sign * shift.sales_per_hour
+        cell[3] += sign * shift.tip_pct
+
+    def add(self, shift: RolledShift, score: float) -> None:
+        self._count(shift, score, 1)
+
+    def remove(self, shift: RolledShift, score: float) -> None:
+        self._count(shift, score, -1)
+
+    def rescore(self, shift: RolledShift, old_score: float, new_score: float) -> None:
+        self._deltas[(shift.bar_id, shift.bartender_name, shift.shift_date)][0] += new_score - old_score
+        self._report[(shift.bar_id, shift.spot_id, shift.bartender_name, shift.shift_date)][1] += new_score - old_score
+
+    def items(self) -> Iterable[tuple[RollupKey, tuple[float, int]]]:
+        for key, (score, count) in self._deltas.items():
+            if score or count:
+                yield key, (score, count)
+
+    def report_items(self) -> Iterable[tuple[ReportKey, tuple[int, float, float, float]]]:
+        for key, sums in self._report.items():
+            if any(sums):
+                yield key, tuple(sums)
+
+
+def _upsert(db: Session, table: Table, keys: list[str], summed: list[str], rows: list[dict]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={col: table.c[col] + stmt.excluded[col] for col in summed},
+        )
+        db.execute(stmt, rows)
+    elif dialect == "mysql":
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update(**{col: table.c[col] + stmt.inserted[col] for col in summed})
+        db.execute(stmt, rows)
+    else:
+        for row in rows:
+            match = and_(*(table.c[col] == row[col] for col in keys))
+            existing = db.execute(select(table.c.id).where(match).with_for_update()).scalar()
+            if existing is None:
+                db.execute(insert(table), row)
+            else:
+                db.execute(
+                    update(table)
+                    .where(table.c.id == existing)
+                    .values({col: table.c[col] + row[col] for col in summed})
+                )
+
+
+def _delete_emptied(db: Session, table: Table, keys: list[str], rows: list[dict]) -> None:
+    emptied = [row for row in rows if row["shifts_count"] < 0]
+    if not emptied:
+        return
+    # OR of equality tuples rather than a row-value IN, which SQLite can only full-scan.
+    db.execute(
+        delete(table)
+        .where(or_(*(and_(*(table.c[col] == row[col] for col in keys)) for row in emptied)))
+        .where(table.c.shifts_count <= 0)
+    )
+
+
+LEADERBOARD_KEYS = ["bar_id", "bartender_name", "shift_date"]
+REPORT_KEYS = ["bar_id", "shift_date", "spot_id", "bartender_name"]
+
+
+def apply(db: Session, deltas: RollupDeltas) -> None:
+    """Upsert the accumulated deltas inside the caller's transaction."""
+
+    rows = [
+        {"bar_id": bar_id, "bartender_name": name, "shift_date": day, "score_sum": score, "shifts_count": count}
+        for (bar_id, name, day), (score, count) in deltas.items()
+    ]
+    report_rows = [
+        {
+            "bar_id": bar_id,
+            "spot_id": spot_id,
+            "bartender_name": name,
+            "shift_date": day,
+            "weekday": day.weekday(),
+            "month": day.replace(day=1),
+            "shifts_count": count,
+            "score_sum": score,
+            "sales_per_hour_sum": sales_per_hour,
+            "tip_pct_sum": tip_pct,
+        }
+        for (bar_id, spot_id, name, day), (count, score, sales_per_hour, tip_pct) in deltas.report_items()
+    ]
+    if not rows and not report_rows:
+        return
+    data_versions.touch(db, {row["bar_id"] for row in rows + report_rows})
+
+    if rows:
+        _upsert(db, LeaderboardRollup.__table__, LEADERBOARD_KEYS, ["score_sum", "shifts_count"], rows)
+        _delete_emptied(db, LeaderboardRollup.__table__, LEADERBOARD_KEYS, rows)
+    if report_rows:
+        summed = ["shifts_count", "score_sum", "sales_per_hour_sum", "tip_pct_sum"]
+        _upsert(db, ReportRollup.__table__, REPORT_KEYS, summed, report_rows)
+        _delete_emptied(db, ReportRollup.__table__, REPORT_KEYS, report_rows)
+
+
+def clear_bartender(db: Session, bar_id: int, bartender_name: str) -> None:
+    data_versions.touch(db, bar_id)
+    for model in (LeaderboardRollup, ReportRollup):
+        db.execute(delete(model).where(model.bar_id == bar_id).where(model.bartender_name == bartender_name))
+
+
+def rebuild(db: Session, bar_id: int | None = None) -> None:
+    """Recompute rollups from shifts + score_results (backfill or repair)."""
+
+    dialect = db.get_bind().dialect.name
+    clear = delete(LeaderboardRollup)
+    clear_report = delete(ReportRollup)
+    source = (
+        select(
+            Shift.bar_id,
+            Shift.bartender_name,
+            Shift.shift_date,
+            func.sum(ScoreResult.score_total),
+            func.count(Shift.id),
+        )
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .group_by(Shift.bar_id, Shift.bartender_name, Shift.shift_date)
+    )
+    report_source = (
+        select(
+            Shift.bar_id,
+            Shift.spot_id,
+            Shift.bartender_name,
+            Shift.shift_date,
+            day_of_week(dialect, Shift.shift_date),
+            period_start(dialect, TrendBucket.month, Shift.shift_date),
+            func.count(Shift.id),
+            func.sum(ScoreResult.score_total),
+            func.sum(Shift.sales_per_hour),
+            func.sum(Shift.tip_pct),
+        )
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .group_by(Shift.bar_id, Shift.spot_id, Shift.bartender_name, Shift.shift_date)
+    )
+    if bar_id is not None:
+        clear = clear.where(LeaderboardRollup.bar_id == bar_id)
+        clear_report = clear_report.where(ReportRollup.bar_id == bar_id)
+        source = source.where(Shift.bar_id == bar_id)
+        report_source = report_source.where(Shift.bar_id == bar_id)
+        data_versions.touch(db, bar_id)
+    else:
+        data_versions.touch(db, db.scalars(select(LeaderboardRollup.bar_id).distinct()).all())
+        data_versions.touch(db, db.scalars(select(ReportRollup.bar_id).distinct()).all())
+        data_versions.touch(db, db.scalars(select(Shift.bar_id).distinct()).all())
+
+    db.execute(clear)
+    db.execute(clear_report)
+    db.execute(
+        insert(LeaderboardRollup).from_select(
+            ["bar_id", "bartender_name", "shift_date", "score_sum", "shifts_count"],
+            source,
+        )
+    )
+    db.execute(
+        insert(ReportRollup).from_select(
+            [
+                "bar_id",
+                "spot_id",
+                "bartender_name",
+                "shift_date",
+                "weekday",
+                "month",
+                "shifts_count",
+                "score_sum",
+                "sales_per_hour_sum",
+                "tip_pct_sum",
+            ],
+            report_source,
+        )
+    )
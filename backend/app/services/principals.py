@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import get_settings
+from app.models.user import User
+
+
+# Columns a request needs to act as a user; the password hash stays in the database.
+PRINCIPAL_FIELDS = ("id", "bar_id", "email", "name", "role", "is_active", "created_at")
+
+
+class PrincipalCache:
+    """Per-process TTL/LRU cache of active users, keyed by user id.
+
+    get() hands out a fresh detached User per call, so requests can't see each
+    other's changes and nothing cached is ever attached to a session. Routes
+    that change a user call invalidate() after committing; the TTL bounds how
+    long other processes may keep serving the old row.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, user_id: int) -> User | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            values = entry[1]
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        values = {name: getattr(user, name) for name in PRINCIPAL_FIELDS}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int | None) -> None:
+        if user_id is None:
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=get_settings().principal_cache_ttl_seconds,
+    max_entries=get_settings().principal_cache_max_entries,
+)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import enum
+from datetime import date
+from typing import Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.report_rollup import ReportRollup
+
+
+class ReportDimension(str, enum.Enum):
+    spot = "spot"
+    bartender = "bartender"
+    weekday = "weekday"
+    month = "month"
+
+
+# Rollup column each dimension groups on; results report it under the same name.
+DIMENSION_COLUMNS = {
+    ReportDimension.spot: ReportRollup.spot_id,
+    ReportDimension.bartender: ReportRollup.bartender_name,
+    ReportDimension.weekday: ReportRollup.weekday,
+    ReportDimension.month: ReportRollup.month,
+}
+
+
+def shift_report(
+    db: Session,
+    bar_id: int,
+    dimensions: Sequence[ReportDimension],
+    start_date: date | None,
+    end_date: date | None,
+) -> list:
+    """Shift counts and averages for every combination of `dimensions` that
+    has scored shifts, from a single GROUP BY over the bar's daily report rollups.
+
+    The rollups hold one row per spot, bartender and day, so this reads one
+    narrow row per worked shift-day instead of joining shifts to their scores.
+    With no dimensions the result is one row of bar-wide totals.
+    """
+
+    keys = [DIMENSION_COLUMNS[d] for d in dimensions]
+    shifts = func.sum(ReportRollup.shifts_count)
+
+    q = select(
+        *keys,
+        shifts.label("shifts_count"),
+        (func.sum(ReportRollup.score_sum) / shifts).label("avg_score"),
+        (func.sum(ReportRollup.sales_per_hour_sum) / shifts).label("avg_sales_per_hour"),
+        (func.sum(ReportRollup.tip_pct_sum) / shifts).label("avg_tip_pct"),
+    ).where(ReportRollup.bar_id == bar_id)
+    if start_date is not None:
+        q = q.where(ReportRollup.shift_date >= start_date)
+    if end_date is not None:
+        q = q.where(ReportRollup.shift_date <= end_date)
+    if keys:
+        q = q.group_by(*keys).order_by(*keys)
+
+    return db.execute(q).all()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import and_, func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.rescore_job import RescoreJob, RescoreJobStatus
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotScoreConfig
+from app.services import leaderboard_rollup
+from app.services.cohort_ranks import cohort_ranks
+from app.services.leaderboard_rollup import RolledShift, RollupDeltas
+from app.services.scoring import cap_columns, compute_batch
+
+
+RESCORE_CHUNK_SIZE = 2000
+
+# Every checkpoint bumps updated_at. A running job whose checkpoint has not
+# moved for this long is presumed dead (its process crashed or restarted) and
+# may be resumed.
+RESCORE_STALE_AFTER = timedelta(minutes=10)
+
+
+def start_job(db: Session, bar_id: int, spot_id: int | None = None) -> RescoreJob:
+    q = db.query(func.count(Shift.id)).filter(Shift.bar_id == bar_id)
+    if spot_id is not None:
+        q = q.filter(Shift.spot_id == spot_id)
+
+    job = RescoreJob(bar_id=bar_id, spot_id=spot_id, status=RescoreJobStatus.pending, total=int(q.scalar() or 0))
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _resumable(now: datetime):
+    return or_(
+        RescoreJob.status.in_([RescoreJobStatus.pending, RescoreJobStatus.failed]),
+        and_(RescoreJob.status == RescoreJobStatus.running, RescoreJob.updated_at < now - RESCORE_STALE_AFTER),
+    )
+
+
+def is_resumable(job: RescoreJob, now: datetime | None = None) -> bool:
+    now = now or datetime.utcnow()
+    if job.status in (RescoreJobStatus.pending, RescoreJobStatus.failed):
+        return True
+    return job.status == RescoreJobStatus.running and job.updated_at < now - RESCORE_STALE_AFTER
+
+
+def claim_job(db: Session, job_id: int) -> bool:
+    """Atomically mark a job running; False when it is completed or another runner holds it.
+
+    Two runners on one job would both apply their rollup deltas and could move
+    the checkpoint backwards, so the check and the update are one statement.
+    """
+
+    now = datetime.utcnow()
+    result = db.execute(
+        update(RescoreJob)
+        .where(RescoreJob.id == job_id, _resumable(now))
+        .values(status=RescoreJobStatus.running, error=None, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _fetch_chunk(db: Session, bar_id: int, spot_id: int | None, after_id: int, limit: int) -> list:
+    q = (
+        db.query(
+            Shift.id,
+            Shift.bar_id,
+            Shift.spot_id,
+            Shift.bartender_name,
+            Shift.shift_date,
+            Shift.personal_sales_volume,
+            Shift.total_bar_sales,
+            Shift.personal_tips,
+            Shift.hours_worked,
+            Shift.sales_per_hour,
+            Shift.tip_pct,
+            ScoreResult.id.label("score_id"),
+            ScoreResult.score_total,
+        )
+        .outerjoin(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.bar_id == bar_id)
+        .filter(Shift.id > after_id)
+    )
+    if spot_id is not None:
+        q = q.filter(Shift.spot_id == spot_id)
+    return q.order_by(Shift.id.asc()).limit(limit).all()
+
+
+def _score_columns(columns: dict[str, np.ndarray], caps: dict[str, np.ndarray]) -> tuple[list[float], list[str], list[dict]]:
+    # Module-level so it can run in a worker process.
+    batch = compute_batch(
+        columns["personal_sales_volume"],
+        columns["total_bar_sales"],
+        columns["personal_tips"],
+        columns["hours_worked"],
+        caps,
+    )
+    return batch.score_total.tolist(), batch.score_versions, batch.breakdowns()
+
+
+class _Inline(Executor):
+    def submit(self, fn, /, *args, **kwargs):
+        fut: Future = Future()
+        fut.set_result(fn(*args, **kwargs))
+        return fut
+
+
+def _write_chunk(db: Session, job: RescoreJob, rows: list, totals: list[float], versions: list[str], breakdowns: list[dict]) -> None:
+    updates = []
+    inserts = []
+    rollup = RollupDeltas()
+    for row, total, version, breakdown in zip(rows, totals, versions, breakdowns):
+        rolled = RolledShift.of(row)
+        values = {"score_total": total, "score_version": version, "breakdown_json": breakdown}
+        if row.score_id is None:
+            inserts.append({"shift_id": row.id, **values})
+            rollup.add(rolled, total)
+        else:
+            updates.append({"id": row.score_id, **values})
+            rollup.rescore(rolled, row.score_total, total)
+
+    if updates:
+        db.execute(update(ScoreResult), updates)
+    if inserts:
+        db.execute(insert(ScoreResult), inserts)
+    leaderboard_rollup.apply(db, rollup)
+
+    # The checkpoint commits atomically with the scores it covers.
+    job.last_shift_id = rows[-1].id
+    job.processed += len(rows)
+    job.updated_at = datetime.utcnow()
+    db.commit()
+
+    for row, total in zip(rows, totals):
+        cohort_ranks.record(row.spot_id, row.id, row.shift_date, total)
+
+
+def run_job(db: Session, job_id: int, *, chunk_size: int = RESCORE_CHUNK_SIZE, workers: int = 0) -> RescoreJob:
+    """Rescore a job's shifts in id order, resuming after its checkpoint.
+
+    Chunks are read with keyset pagination and scored with compute_batch. With
+    workers > 0, scoring is spread over a process pool while the main process
+    keeps reading and writing; results are still written in id order so the
+    checkpoint stays monotonic. Only one runner works on a job at a time; a
+    call for a job that is completed or already running returns it untouched.
+    """
+
+    job = db.get(RescoreJob, job_id)
+    if job is None:
+        raise ValueError(f"Rescore job {job_id} not found")
+    if not claim_job(db, job_id):
+        # Completed, or another runner has it; leave the job to that runner.
+        db.refresh(job)
+        return job
+    db.refresh(job)
+
+    bar_id, spot_id = job.bar_id, job.spot_id
+
+    configs = {cfg.spot_id: cfg for cfg in db.query(SpotScoreConfig).filter(SpotScoreConfig.bar_id == bar_id).all()}
+    # Caps are read for every chunk; keep them loaded across the per-chunk commits.
+    for cfg in configs.values():
+        db.expunge(cfg)
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) if workers > 0 else _Inline()
+    )
+
+    try:
+        with executor:
+            in_flight: deque = deque()
+            next_after_id = job.last_shift_id
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < max(workers, 1) * 2:
+                    rows = _fetch_chunk(db, bar_id, spot_id, next_after_id, chunk_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    next_after_id = rows[-1].id
+
+                    missing = {r.spot_id for r in rows} - configs.keys()
+                    if missing:
+                        raise ValueError(f"SpotScoreConfig missing for spot(s) {sorted(missing)}")
+
+                    columns = {
+                        name: np.fromiter((getattr(r, name) for r in rows), dtype=np.float64, count=len(rows))
+                        for name in ("personal_sales_volume", "total_bar_sales", "personal_tips", "hours_worked")
+                    }
+                    caps = cap_columns(configs, [r.spot_id for r in rows])
+                    in_flight.append((rows, executor.submit(_score_columns, columns, caps)))
+
+                if not in_flight:
+                    break
+                rows, fut = in_flight.popleft()
+                totals, versions, breakdowns = fut.result()
+                _write_chunk(db, job, rows, totals, versions, breakdowns)
+    except Exception as exc:
+        db.rollback()
+        job.status = RescoreJobStatus.failed
+        job.error = str(exc)[:500]
+        job.updated_at = datetime.utcnow()
+        db.commit()
+        raise
+
+    job.status = RescoreJobStatus.completed
+    job.finished_at = datetime.utcnow()
+    job.updated_at = job.finished_at
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def main(argv: list[str] | None = None) -> None:
+    from app.db.session import get_session_maker
+
+    parser = argparse.ArgumentParser(description="Rescore stored shifts after a config or formula change.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--bar-id", type=int, help="start a new job for this bar")
+    target.add_argument("--resume", type=int, metavar="JOB_ID", help="resume an interrupted job")
+    parser.add_argument("--spot-id", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0, help="scoring processes (0 = score inline)")
+    args = parser.parse_args(argv)
+
+    db = get_session_maker()()
+    try:
+        job_id = args.resume if args.resume is not None else start_job(db, args.bar_id, args.spot_id).id
+        job = run_job(db, job_id, chunk_size=args.chunk_size, workers=args.workers)
+        print(f"job {job.id}: {job.status.value}, {job.processed}/{job.total} shifts rescored")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,62 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
 
 from app.models.shift import Shift
 from app.models.spot_score_config import SpotScoreConfig
 from app.schemas.shifts import ShiftCreateIn
 
 
+METRICS = ("sales_volume", "pct_of_bar_sales", "tip_pct", "sales_per_hour")
+
+# v1 points per metric; these sum to 100.
+METRIC_POINTS = {
+    "sales_volume": 20.0,
+    "pct_of_bar_sales": 50.0,
+    "tip_pct": 10.0,
+    "sales_per_hour": 20.0,
+}
+
+# SpotScoreConfig attribute names, e.g. "tip_pct_low", "tip_pct_high".
+CAP_FIELDS = tuple(f"{metric}_{bound}" for metric in METRICS for bound in ("low", "high"))
+# SpotScoreConfig weight attributes, e.g. "tip_pct_weight" (used by v2).
+WEIGHT_FIELDS = tuple(f"{metric}_weight" for metric in METRICS)
+# Extra cap_columns() keys: points per metric, e.g. "tip_pct_points".
+POINT_FIELDS = tuple(f"{metric}_points" for metric in METRICS)
+
+DEFAULT_SCORE_VERSION = "v1"
+
+
+def _fixed_points(cfg: SpotScoreConfig) -> tuple[float, ...]:
+    return tuple(METRIC_POINTS[metric] for metric in METRICS)
+
+
+def _weighted_points(cfg: SpotScoreConfig) -> tuple[float, ...]:
+    # Relative weights, scaled so the points still sum to 100; unset weights
+    # fall back to the v1 points.
+    weights = [
+        METRIC_POINTS[metric] if getattr(cfg, field) is None else getattr(cfg, field)
+        for metric, field in zip(METRICS, WEIGHT_FIELDS)
+    ]
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError("At least one weight must be positive")
+    return tuple(weight * 100.0 / total for weight in weights)
+
+
+# score_version -> points per metric (in METRICS order) for a spot's config.
+# Add formulas here; never change one whose scores have been stored.
+SCORE_VERSIONS: dict[str, Callable[[SpotScoreConfig], tuple[float, ...]]] = {
+    "v1": _fixed_points,
+    "v2": _weighted_points,
+}
+
+
 def _clamp01(value: float) -> float:
     if value < 0:
         return 0.0
@@ -28,39 +78,183 @@ class ScoreOutput:
     breakdown: dict
 
 
-def compute_shift(payload: ShiftCreateIn, cfg: SpotScoreConfig) -> tuple[Shift, ScoreOutput]:
-    pct_of_bar_sales = payload.personal_sales_volume / payload.total_bar_sales
-    tip_pct = payload.personal_tips / payload.personal_sales_volume if payload.personal_sales_volume > 0 else 0.0
-    sales_per_hour = payload.personal_sales_volume / payload.hours_worked
+@dataclass(frozen=True)
+class SpotScorer:
+    """A spot's scoring formula with its caps and points resolved up front.
 
-    # 4 metrics, equal weights: 25 each
-    m_sales = _linear_score(payload.personal_sales_volume, cfg.sales_volume_low, cfg.sales_volume_high)
-    m_pct = _linear_score(pct_of_bar_sales, cfg.pct_of_bar_sales_low, cfg.pct_of_bar_sales_high)
-    m_tip = _linear_score(tip_pct, cfg.tip_pct_low, cfg.tip_pct_high)
-    m_sph = _linear_score(sales_per_hour, cfg.sales_per_hour_low, cfg.sales_per_hour_high)
+    Built once per config by build_scorer(); score() then needs no config or
+    attribute lookups. Also carries what the shift routes need to decide on an
+    auto-caps refresh without loading the config.
+    """
 
-    breakdown = {
-        "sales_volume": {"value": payload.personal_sales_volume, "normalized": m_sales, "points": m_sales * 20.0},
-        "pct_of_bar_sales": {"value": pct_of_bar_sales, "normalized": m_pct, "points": m_pct * 50.0},
-        "tip_pct": {"value": tip_pct, "normalized": m_tip, "points": m_tip * 10.0},
-        "sales_per_hour": {"value": sales_per_hour, "normalized": m_sph, "points": m_sph * 20.0}
-    }
+    config_id: int
+    bar_id: int
+    spot_id: int
+    score_version: str
+    lows: tuple[float, ...]
+    highs: tuple[float, ...]
+    points: tuple[float, ...]
+    cap_mode: str
+    computed_at: datetime | None
+
+    def score(self, payload: ShiftCreateIn) -> tuple[Shift, ScoreOutput]:
+        pct_of_bar_sales = payload.personal_sales_volume / payload.total_bar_sales
+        tip_pct = payload.personal_tips / payload.personal_sales_volume if payload.personal_sales_volume > 0 else 0.0
+        sales_per_hour = payload.personal_sales_volume / payload.hours_worked
+
+        breakdown = {}
+        score_total = 0.0
+        for metric, value, low, high, points in zip(
+            METRICS,
+            (payload.personal_sales_volume, pct_of_bar_sales, tip_pct, sales_per_hour),
+            self.lows,
+            self.highs,
+            self.points,
+        ):
+            normalized = _linear_score(value, low, high)
+            breakdown[metric] = {"value": value, "normalized": normalized, "points": normalized * points}
+            score_total += breakdown[metric]["points"]
+
+        shift = Shift(
+            bar_id=payload.bar_id,
+            spot_id=payload.spot_id,
+            bartender_name=payload.bartender_name,
+            shift_date=payload.shift_date,
+            personal_sales_volume=payload.personal_sales_volume,
+            total_bar_sales=payload.total_bar_sales,
+            personal_tips=payload.personal_tips,
+            hours_worked=payload.hours_worked,
+            transactions_count=payload.transactions_count,
+            pct_of_bar_sales=pct_of_bar_sales,
+            tip_pct=tip_pct,
+            sales_per_hour=sales_per_hour,
+        )
+
+        return shift, ScoreOutput(score_total=float(score_total), score_version=self.score_version, breakdown=breakdown)
 
-    score_total = float(breakdown["sales_volume"]["points"] + breakdown["pct_of_bar_sales"]["points"] + breakdown["tip_pct"]["points"] + breakdown["sales_per_hour"]["points"])
-
-    shift = Shift(
-        bar_id=payload.bar_id,
-        spot_id=payload.spot_id,
-        bartender_name=payload.bartender_name,
-        shift_date=payload.shift_date,
-        personal_sales_volume=payload.personal_sales_volume,
-        total_bar_sales=payload.total_bar_sales,
-        personal_tips=payload.personal_tips,
-        hours_worked=payload.hours_worked,
-        transactions_count=payload.transactions_count,
-        pct_of_bar_sales=pct_of_bar_sales,
-        tip_pct=tip_pct,
-        sales_per_hour=sales_per_hour,
+
+def build_scorer(cfg: SpotScoreConfig) -> SpotScorer:
+    """Compile a spot's config; raises ValueError for an unknown score_version."""
+
+    version = cfg.score_version or DEFAULT_SCORE_VERSION
+    points_for = SCORE_VERSIONS.get(version)
+    if points_for is None:
+        raise ValueError(f"Unknown score_version {version!r}")
+    return SpotScorer(
+        config_id=cfg.id,
+        bar_id=cfg.bar_id,
+        spot_id=cfg.spot_id,
+        score_version=version,
+        lows=tuple(float(getattr(cfg, f"{metric}_low")) for metric in METRICS),
+        highs=tuple(float(getattr(cfg, f"{metric}_high")) for metric in METRICS),
+        points=points_for(cfg),
+        cap_mode=getattr(cfg.cap_mode, "value", cfg.cap_mode),
+        computed_at=cfg.computed_at,
     )
 
-    return shift, ScoreOutput(score_total=score_total, score_version="v1", breakdown=breakdown)
+
+def compute_shift(payload: ShiftCreateIn, cfg: SpotScoreConfig | SpotScorer) -> tuple[Shift, ScoreOutput]:
+    scorer = cfg if isinstance(cfg, SpotScorer) else build_scorer(cfg)
+    return scorer.score(payload)
+
+
+def _linear_score_array(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    # Same arithmetic as _linear_score, so results are bit-for-bit identical.
+    span = high - low
+    out = np.zeros(values.shape, dtype=np.float64)
+    np.divide(values - low, span, out=out, where=span > 0)
+    return np.clip(out, 0.0, 1.0, out=out)
+
+
+@dataclass
+class BatchScoreOutput:
+    """Column-wise scores for many shifts; row i matches compute_shift for shift i."""
+
+    values: dict[str, np.ndarray]
+    normalized: dict[str, np.ndarray]
+    points: dict[str, np.ndarray]
+    score_total: np.ndarray
+    score_versions: list[str]
+
+    def __len__(self) -> int:
+        return len(self.score_total)
+
+    def breakdowns(self) -> list[dict]:
+        """Per-row breakdown dicts in the same shape ScoreOutput.breakdown uses."""
+
+        cols = [
+            (metric, self.values[metric].tolist(), self.normalized[metric].tolist(), self.points[metric].tolist())
+            for metric in METRICS
+        ]
+        return [
+            {metric: {"value": v[i], "normalized": n[i], "points": p[i]} for metric, v, n, p in cols}
+            for i in range(len(self))
+        ]
+
+
+def cap_columns(configs: Mapping[int, SpotScoreConfig | SpotScorer], spot_ids: Sequence[int]) -> dict[str, np.ndarray]:
+    """Expand per-spot scorers into per-row columns aligned with spot_ids.
+
+    Returns one float array per name in CAP_FIELDS and POINT_FIELDS, plus a
+    "score_version" array of strings. Configs are compiled with build_scorer.
+    """
+
+    unique_ids, inverse = np.unique(np.asarray(spot_ids, dtype=np.int64), return_inverse=True)
+    scorers = [configs[int(spot_id)] for spot_id in unique_ids]
+    scorers = [s if isinstance(s, SpotScorer) else build_scorer(s) for s in scorers]
+    columns = {}
+    for i, metric in enumerate(METRICS):
+        columns[f"{metric}_low"] = np.array([s.lows[i] for s in scorers], dtype=np.float64)[inverse]
+        columns[f"{metric}_high"] = np.array([s.highs[i] for s in scorers], dtype=np.float64)[inverse]
+        columns[f"{metric}_points"] = np.array([s.points[i] for s in scorers], dtype=np.float64)[inverse]
+    columns["score_version"] = np.array([s.score_version for s in scorers], dtype=object)[inverse]
+    return columns
+
+
+def compute_batch(
+    personal_sales_volume: ArrayLike,
+    total_bar_sales: ArrayLike,
+    personal_tips: ArrayLike,
+    hours_worked: ArrayLike,
+    caps: Mapping[str, ArrayLike],
+) -> BatchScoreOutput:
+    """Vectorized compute_shift over columns of raw inputs.
+
+    `caps` maps every name in CAP_FIELDS to a per-row array (see cap_columns)
+    or a scalar shared by all rows. POINT_FIELDS and "score_version" may be
+    given the same way; without them rows are scored as v1. Inputs are assumed
+    to be valid ShiftCreateIn values (total_bar_sales > 0, hours_worked > 0).
+    """
+
+    sales = np.asarray(personal_sales_volume, dtype=np.float64)
+    total = np.asarray(total_bar_sales, dtype=np.float64)
+    tips = np.asarray(personal_tips, dtype=np.float64)
+    hours = np.asarray(hours_worked, dtype=np.float64)
+
+    # If personal sales are 0, tip % is defined as 0 (avoid divide-by-zero).
+    tip_pct = np.zeros(sales.shape, dtype=np.float64)
+    np.divide(tips, sales, out=tip_pct, where=sales > 0)
+
+    values = {
+        "sales_volume": sales,
+        "pct_of_bar_sales": sales / total,
+        "tip_pct": tip_pct,
+        "sales_per_hour": sales / hours,
+    }
+
+    normalized = {}
+    points = {}
+    for metric in METRICS:
+        low = np.asarray(caps[f"{metric}_low"], dtype=np.float64)
+        high = np.asarray(caps[f"{metric}_high"], dtype=np.float64)
+        normalized[metric] = _linear_score_array(values[metric], low, high)
+        metric_points = np.asarray(caps.get(f"{metric}_points", METRIC_POINTS[metric]), dtype=np.float64)
+        points[metric] = normalized[metric] * metric_points
+
+    # Summed in the same order as SpotScorer.score so totals match exactly.
+    score_total = points["sales_volume"] + points["pct_of_bar_sales"] + points["tip_pct"] + points["sales_per_hour"]
+    versions = np.broadcast_to(np.asarray(caps.get("score_version", DEFAULT_SCORE_VERSION), dtype=object), sales.shape)
+
+    return BatchScoreOutput(
+        values=values, normalized=normalized, points=points, score_total=score_total, score_versions=versions.tolist()
+    )
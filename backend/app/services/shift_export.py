@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import csv
+import enum
+import io
+from datetime import date
+from typing import Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+
+
+# Rows fetched per round trip, and the size of each CSV chunk / Parquet row group.
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    Shift.id,
+    Shift.spot_id,
+    Shift.bartender_name,
+    Shift.shift_date,
+    Shift.personal_sales_volume,
+    Shift.total_bar_sales,
+    Shift.personal_tips,
+    Shift.hours_worked,
+    Shift.transactions_count,
+    Shift.pct_of_bar_sales,
+    Shift.tip_pct,
+    Shift.sales_per_hour,
+    ScoreResult.score_total,
+    ScoreResult.score_version,
+)
+EXPORT_HEADER = [col.key for col in EXPORT_COLUMNS]
+
+
+class ExportFormat(str, enum.Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iter_row_chunks(
+    session_maker: sessionmaker,
+    bar_id: int,
+    start_date: date | None,
+    end_date: date | None,
+) -> Iterator[Sequence[tuple]]:
+    """Yield the bar's shifts (oldest first) in chunks of EXPORT_CHUNK_SIZE rows.
+
+    Opens its own session: a StreamingResponse body is still being iterated after
+    the request's dependencies have been torn down. Rows are plain tuples read
+    through a server-side cursor (yield_per), so neither the driver nor the ORM
+    identity map holds more than one chunk at a time.
+    """
+
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .where(Shift.bar_id == bar_id)
+    )
+    if start_date is not None:
+        stmt = stmt.where(Shift.shift_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Shift.shift_date <= end_date)
+    stmt = stmt.order_by(Shift.shift_date, Shift.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+    db: Session = session_maker()
+    try:
+        for chunk in db.execute(stmt).partitions():
+            yield chunk
+    finally:
+        db.close()
+
+
+def iter_csv(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(EXPORT_HEADER)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file that hands back whatever has been written since the last drain."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def iter_parquet(chunks: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    """Stream a Parquet file, one row group per chunk.
+
+    Needs pyarrow, which is optional; check parquet_available() before calling.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("spot_id", pa.int64()),
+            ("bartender_name", pa.string()),
+            ("shift_date", pa.date32()),
+            ("personal_sales_volume", pa.float64()),
+            ("total_bar_sales", pa.float64()),
+            ("personal_tips", pa.float64()),
+            ("hours_worked", pa.float64()),
+            ("transactions_count", pa.int64()),
+            ("pct_of_bar_sales", pa.float64()),
+            ("tip_pct", pa.float64()),
+            ("sales_per_hour", pa.float64()),
+            ("score_total", pa.float64()),
+            ("score_version", pa.string()),
+        ]
+    )
+
+    sink = _DrainableSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            arrays = [pa.array(col, type=f.type) for col, f in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
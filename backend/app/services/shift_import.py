@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import enum
+import json
+from dataclasses import dataclass, field
+from typing import IO, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+from app.schemas.shifts import ShiftCreateIn
+from app.services import leaderboard_rollup
+from app.services.auto_caps import auto_caps
+from app.services.cohort_ranks import cohort_ranks
+from app.services.leaderboard_rollup import RolledShift, RollupDeltas
+from app.services.scoring import cap_columns, compute_batch
+
+
+IMPORT_CHUNK_SIZE = 1000
+
+# A file where every row fails should not produce a response as large as the file.
+MAX_REPORTED_ERRORS = 1000
+
+UNDECODABLE_LINE = "Line is not valid UTF-8, import stopped; save the file as UTF-8"
+
+
+class ImportFormat(str, enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    detail: str
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def add_error(self, line: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, detail=detail))
+
+
+def detect_format(filename: str | None, content_type: str | None) -> ImportFormat:
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonl" in ctype:
+        return ImportFormat.ndjson
+    return ImportFormat.csv
+
+
+def _decoded_lines(stream: IO[bytes]) -> Iterator[str]:
+    # Decode line by line (UTF-8 never has a newline byte inside a character),
+    # so an invalid byte raises while its own line is being read.
+    for i, raw in enumerate(stream):
+        yield (raw.removeprefix(codecs.BOM_UTF8) if i == 0 else raw).decode("utf-8")
+
+
+def iter_raw_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[tuple[int, dict | str]]:
+    """Yield (line, row) pairs without reading the whole upload into memory.
+
+    A row that cannot be parsed is yielded as an error message instead of a dict.
+    A line that is not UTF-8, or CSV the parser cannot recover from, is yielded
+    as a final error and ends the file; rows before it are still imported.
+    """
+
+    lines = _decoded_lines(stream)
+    if fmt == ImportFormat.csv:
+        reader = csv.DictReader(lines)
+        try:
+            for raw in reader:
+                if None in raw:
+                    yield reader.line_num, "Row has more columns than the header"
+                    continue
+                # Empty CSV cells mean "not provided" (e.g. transactions_count).
+                yield reader.line_num, {k.strip(): (v.strip() or None) if v is not None else None for k, v in raw.items()}
+        except UnicodeDecodeError:
+            # DictReader.line_num only advances on a parsed row; the inner
+            # reader counts every line read (the undecodable one was not).
+            yield reader.reader.line_num + 1, UNDECODABLE_LINE
+        except csv.Error as exc:
+            yield reader.reader.line_num, f"Malformed CSV, import stopped: {exc}"
+        return
+
+    line_no = 0
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                yield line_no, "Invalid JSON"
+                continue
+            if not isinstance(obj, dict):
+                yield line_no, "Each line must be a JSON object"
+                continue
+            yield line_no, obj
+    except UnicodeDecodeError:
+        yield line_no + 1, UNDECODABLE_LINE
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    parts = []
+    for err in exc.errors():
+        loc = ".".join(str(p) for p in err["loc"])
+        parts.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return "; ".join(parts)
+
+
+def _insert_shifts(db: Session, rows: list[dict]) -> list[int]:
+    """Insert shifts as multi-row INSERTs and return their ids in input order."""
+
+    if db.get_bind().dialect.name != "sqlite":
+        # e.g. MySQL: no RETURNING, so let the ORM collect ids row by row.
+        shifts = [Shift(**row) for row in rows]
+        db.add_all(shifts)
+        db.flush()
+        return [s.id for s in shifts]
+
+    # SQLite holds the write lock for the whole transaction and assigns rowids in
+    # VALUES order, so the sorted ids line up with the input rows. (Asking SQLAlchemy
+    # for sort_by_parameter_order here degrades to one INSERT per row.)
+    return sorted(db.scalars(insert(Shift.__table__).returning(Shift.__table__.c.id), rows))
+
+
+def _score_chunk(chunk: list[tuple[int, ShiftCreateIn]], configs: dict[int, SpotScoreConfig]) -> tuple[list[dict], list[dict]]:
+    payloads = [payload for _, payload in chunk]
+    batch = compute_batch(
+        [p.personal_sales_volume for p in payloads],
+        [p.total_bar_sales for p in payloads],
+        [p.personal_tips for p in payloads],
+        [p.hours_worked for p in payloads],
+        cap_columns(configs, [p.spot_id for p in payloads]),
+    )
+
+    pct_of_bar_sales = batch.values["pct_of_bar_sales"].tolist()
+    tip_pct = batch.values["tip_pct"].tolist()
+    sales_per_hour = batch.values["sales_per_hour"].tolist()
+    rows = [
+        {
+            "bar_id": p.bar_id,
+            "spot_id": p.spot_id,
+            "bartender_name": p.bartender_name,
+            "shift_date": p.shift_date,
+            "personal_sales_volume": p.personal_sales_volume,
+            "total_bar_sales": p.total_bar_sales,
+            "personal_tips": p.personal_tips,
+            "hours_worked": p.hours_worked,
+            "transactions_count": p.transactions_count,
+            "pct_of_bar_sales": pct_of_bar_sales[i],
+            "tip_pct": tip_pct[i],
+            "sales_per_hour": sales_per_hour[i],
+        }
+        for i, p in enumerate(payloads)
+    ]
+    scores = [
+        {"score_total": total, "score_version": version, "breakdown_json": breakdown}
+        for total, version, breakdown in zip(batch.score_total.tolist(), batch.score_versions, batch.breakdowns())
+    ]
+    return rows, scores
+
+
+def _write_chunk(db: Session, chunk: list[tuple[int, ShiftCreateIn]], configs: dict[int, SpotScoreConfig], result: ImportResult) -> None:
+    scorable = []
+    for line, payload in chunk:
+        if payload.spot_id not in configs:
+            result.add_error(line, "SpotScoreConfig missing for this spot")
+            continue
+        scorable.append((line, payload))
+
+    if not scorable:
+        return
+
+    rows, scores = _score_chunk(scorable, configs)
+    try:
+        shift_ids = _insert_shifts(db, rows)
+        db.execute(
+            insert(ScoreResult.__table__),
+            [{"shift_id": shift_id, **score} for shift_id, score in zip(shift_ids, scores)],
+        )
+
+        rollup = RollupDeltas()
+        for row, score in zip(rows, scores):
+            rollup.add(RolledShift.of(row), score["score_total"])
+        leaderboard_rollup.apply(db, rollup)
+
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        detail = f"Database error: {type(exc).__name__}"
+        for line, _ in scorable:
+            result.add_error(line, detail)
+        return
+
+    result.inserted += len(rows)
+    for shift_id, row, score in zip(shift_ids, rows, scores):
+        auto_caps.record(
+            row["spot_id"],
+            shift_id,
+            row["shift_date"],
+            (row["personal_sales_volume"], row["pct_of_bar_sales"], row["tip_pct"], row["sales_per_hour"]),
+        )
+        cohort_ranks.record(row["spot_id"], shift_id, row["shift_date"], score["score_total"])
+    _refresh_auto_caps(db, {row["spot_id"] for row in rows}, configs)
+    # Committed rows are not needed again; keep the identity map from growing with the file.
+    db.expunge_all()
+
+
+def _refresh_auto_caps(db: Session, spot_ids: set[int], configs: dict[int, SpotScoreConfig]) -> None:
+    # As after a single create: auto-mode spots whose caps are due are
+    # recomputed with the chunk in their window, and later chunks score with them.
+    refreshed = []
+    for spot_id in spot_ids:
+        if configs[spot_id].cap_mode != SpotCapMode.auto:
+            continue
+        cfg = db.get(SpotScoreConfig, configs[spot_id].id)
+        if cfg is not None and auto_caps.refresh_caps(db, cfg):
+            refreshed.append(cfg)
+    if not refreshed:
+        return
+    try:
+        db.commit()
+    except SQLAlchemyError:
+        # The shifts are already committed; the caps refresh again on a later write.
+        db.rollback()
+        return
+    for cfg in refreshed:
+        db.refresh(cfg)
+        db.expunge(cfg)
+        configs[cfg.spot_id] = cfg
+
+
+def import_shifts(
+    db: Session,
+    bar_id: int,
+    rows: Iterator[tuple[int, dict | str]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """Validate, score and insert parsed rows in chunked transactions.
+
+    Bad rows are reported per line; they never abort the rest of the file.
+    """
+
+    configs = {
+        cfg.spot_id: cfg
+        for cfg in db.query(SpotScoreConfig).filter(SpotScoreConfig.bar_id == bar_id).all()
+    }
+    # Scoring only reads caps; keep the configs usable after each chunk's commit.
+    for cfg in configs.values():
+        db.expunge(cfg)
+
+    result = ImportResult()
+    chunk: list[tuple[int, ShiftCreateIn]] = []
+    for line, raw in rows:
+        if isinstance(raw, str):
+            result.add_error(line, raw)
+            continue
+
+        if raw.get("bar_id") is None:
+            raw["bar_id"] = bar_id
+        try:
+            payload = ShiftCreateIn.model_validate(raw)
+        except ValidationError as exc:
+            result.add_error(line, _validation_detail(exc))
+            continue
+        if payload.bar_id != bar_id:
+            result.add_error(line, "Not allowed")
+            continue
+
+        chunk.append((line, payload))
+        if len(chunk) >= chunk_size:
+            _write_chunk(db, chunk, configs, result)
+            chunk = []
+
+    if chunk:
+        _write_chunk(db, chunk, configs, result)
+
+    return result
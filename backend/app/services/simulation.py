@@ -0,0 +1,184 @@
+"""What-if scoring: rescore a bar's stored shifts with candidate configs, in memory.
+
+Shifts at the spots being changed are rescored with compute_batch; all other
+shifts keep their stored scores, so the comparison isolates the candidate
+change. Nothing is written.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from types import SimpleNamespace
+from typing import Mapping
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotScoreConfig
+from app.services.scoring import METRICS, SpotScorer, build_scorer, cap_columns, compute_batch
+
+
+# Score histogram buckets: [0, 10), [10, 20), ... [90, 100].
+HISTOGRAM_EDGES = np.linspace(0.0, 100.0, 11)
+DISTRIBUTION_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+@dataclass
+class ShiftHistory:
+    """A bar's scored shifts as columns."""
+
+    spot_id: np.ndarray
+    bartender_name: np.ndarray
+    personal_sales_volume: np.ndarray
+    total_bar_sales: np.ndarray
+    personal_tips: np.ndarray
+    hours_worked: np.ndarray
+    score_total: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.score_total)
+
+
+@dataclass
+class BartenderMoves:
+    name: list[str]
+    shifts_count: np.ndarray
+    current_avg: np.ndarray
+    simulated_avg: np.ndarray
+    current_rank: np.ndarray
+    simulated_rank: np.ndarray
+
+
+@dataclass
+class SimulationResult:
+    shifts: int
+    rescored: int
+    current: np.ndarray
+    simulated: np.ndarray
+    bartenders: BartenderMoves
+
+
+def load_history(db: Session, bar_id: int, start_date: date | None, end_date: date | None) -> ShiftHistory:
+    """One query for the scored shifts in range; unscored shifts are left out, as on the leaderboard."""
+
+    q = (
+        select(
+            Shift.spot_id,
+            Shift.bartender_name,
+            Shift.personal_sales_volume,
+            Shift.total_bar_sales,
+            Shift.personal_tips,
+            Shift.hours_worked,
+            ScoreResult.score_total,
+        )
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .where(Shift.bar_id == bar_id, Shift.bartender_name != "")
+    )
+    if start_date is not None:
+        q = q.where(Shift.shift_date >= start_date)
+    if end_date is not None:
+        q = q.where(Shift.shift_date <= end_date)
+    rows = db.execute(q).all()
+
+    columns = list(zip(*rows)) if rows else [()] * 7
+    return ShiftHistory(
+        spot_id=np.array(columns[0], dtype=np.int64),
+        bartender_name=np.array(columns[1], dtype=object),
+        personal_sales_volume=np.array(columns[2], dtype=np.float64),
+        total_bar_sales=np.array(columns[3], dtype=np.float64),
+        personal_tips=np.array(columns[4], dtype=np.float64),
+        hours_worked=np.array(columns[5], dtype=np.float64),
+        score_total=np.array(columns[6], dtype=np.float64),
+    )
+
+
+def candidate_scorers(db: Session, bar_id: int, scenarios: Mapping[int, Mapping[str, object]]) -> dict[int, SpotScorer]:
+    """Scorers for each scenario spot: its stored config with the scenario's
+    fields applied. Raises LookupError for a spot without a config in the bar
+    and ValueError for an invalid candidate."""
+
+    configs = {
+        cfg.spot_id: cfg
+        for cfg in db.query(SpotScoreConfig)
+        .filter(SpotScoreConfig.bar_id == bar_id, SpotScoreConfig.spot_id.in_(list(scenarios)))
+        .all()
+    }
+    missing = set(scenarios) - configs.keys()
+    if missing:
+        raise LookupError(f"SpotScoreConfig not found for spot(s) {sorted(missing)}")
+
+    scorers = {}
+    for spot_id, changes in scenarios.items():
+        cfg = configs[spot_id]
+        candidate = SimpleNamespace(**{c.key: getattr(cfg, c.key) for c in SpotScoreConfig.__table__.columns})
+        for field, value in changes.items():
+            setattr(candidate, field, value)
+        for metric in METRICS:
+            if getattr(candidate, f"{metric}_low") >= getattr(candidate, f"{metric}_high"):
+                raise ValueError(f"spot {spot_id}: {metric}_low must be below {metric}_high")
+        try:
+            scorers[spot_id] = build_scorer(candidate)
+        except ValueError as exc:
+            raise ValueError(f"spot {spot_id}: {exc}") from None
+    return scorers
+
+
+def _ranks(avg: np.ndarray, names: np.ndarray) -> np.ndarray:
+    # 1 = highest average; ties go to the alphabetically first name.
+    order = np.lexsort((names, -avg))
+    ranks = np.empty(len(avg), dtype=np.int64)
+    ranks[order] = np.arange(1, len(avg) + 1)
+    return ranks
+
+
+def simulate(history: ShiftHistory, scorers: Mapping[int, SpotScorer]) -> SimulationResult:
+    """Rescore the history's shifts at the scorers' spots and compare per bartender."""
+
+    simulated = history.score_total.copy()
+    mask = np.isin(history.spot_id, np.fromiter(scorers, dtype=np.int64, count=len(scorers)))
+    rescored = int(mask.sum())
+    if rescored:
+        batch = compute_batch(
+            history.personal_sales_volume[mask],
+            history.total_bar_sales[mask],
+            history.personal_tips[mask],
+            history.hours_worked[mask],
+            cap_columns(scorers, history.spot_id[mask]),
+        )
+        simulated[mask] = batch.score_total
+
+    names, who = np.unique(history.bartender_name, return_inverse=True)
+    counts = np.bincount(who, minlength=len(names))
+    current_avg = np.bincount(who, weights=history.score_total, minlength=len(names)) / np.maximum(counts, 1)
+    simulated_avg = np.bincount(who, weights=simulated, minlength=len(names)) / np.maximum(counts, 1)
+
+    return SimulationResult(
+        shifts=len(history),
+        rescored=rescored,
+        current=history.score_total,
+        simulated=simulated,
+        bartenders=BartenderMoves(
+            name=names.tolist(),
+            shifts_count=counts,
+            current_avg=current_avg,
+            simulated_avg=simulated_avg,
+            current_rank=_ranks(current_avg, names),
+            simulated_rank=_ranks(simulated_avg, names),
+        ),
+    )
+
+
+def distribution(scores: np.ndarray) -> dict:
+    """Mean, percentiles and a 10-point histogram of scores."""
+
+    if not len(scores):
+        return {"mean": None, "percentiles": {}, "histogram": [0] * (len(HISTOGRAM_EDGES) - 1)}
+    return {
+        "mean": float(scores.mean()),
+        "percentiles": {f"p{p}": float(v) for p, v in zip(DISTRIBUTION_PERCENTILES, np.percentile(scores, DISTRIBUTION_PERCENTILES))},
+        "histogram": np.histogram(np.clip(scores, 0.0, 100.0), bins=HISTOGRAM_EDGES)[0].tolist(),
+    }
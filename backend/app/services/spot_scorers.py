@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+from app.services.auto_caps import REFRESH_INTERVAL, auto_caps
+from app.services.scoring import SpotScorer, build_scorer
+
+
+_CHANGED_KEY = "changed_score_config_spot_ids"
+
+
+class SpotScorers:
+    """Per-process compiled scorers, by spot.
+
+    A spot's scorer is built from its SpotScoreConfig the first time one of its
+    shifts is scored. Committed config changes made through the ORM in this
+    process drop it (see the session hooks below); scorers older than
+    ttl_seconds are rebuilt, which bounds how long config changes made by other
+    processes go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._scorers: dict[int, tuple[SpotScorer, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, spot_id: int) -> SpotScorer | None:
+        """The spot's scorer; None when the spot has no config."""
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._scorers.get(spot_id)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        cfg = db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == spot_id).first()
+        if cfg is None:
+            return None
+        scorer = build_scorer(cfg)
+        with self._lock:
+            self._scorers[spot_id] = (scorer, now)
+        return scorer
+
+    def invalidate(self, spot_ids: Iterable[int] | None = None) -> None:
+        """Drop cached scorers (all of them when spot_ids is None)."""
+
+        with self._lock:
+            if spot_ids is None:
+                self._scorers.clear()
+                return
+            for spot_id in spot_ids:
+                self._scorers.pop(spot_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"spots": len(self._scorers), "hits": self.hits, "misses": self.misses}
+
+
+spot_scorers = SpotScorers(ttl_seconds=get_settings().scorer_cache_ttl_seconds)
+
+
+def refresh_auto_caps(db: Session, scorer: SpotScorer, now: datetime | None = None) -> bool:
+    """auto_caps.refresh_caps for the scorer's spot, loading its config only when
+    a refresh is due. Returns True when the config was modified (the caller commits)."""
+
+    if scorer.cap_mode != SpotCapMode.auto.value:
+        return False
+    now = now or datetime.utcnow()
+    if scorer.computed_at is not None and now - scorer.computed_at < REFRESH_INTERVAL:
+        return False
+    cfg = db.get(SpotScoreConfig, scorer.config_id)
+    return cfg is not None and auto_caps.refresh_caps(db, cfg, now=now)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_configs(session: Session, flush_context, instances) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, SpotScoreConfig) and obj.spot_id is not None:
+            session.info.setdefault(_CHANGED_KEY, set()).add(obj.spot_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_changed_scorers(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        spot_scorers.invalidate(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_configs(session: Session, previous_transaction) -> None:
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import repeat
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.bar import Bar
+from app.models.bartender import Bartender
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot import Spot
+from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+from app.services import leaderboard_rollup
+from app.services.auto_caps import auto_caps
+from app.services.cohort_ranks import cohort_ranks
+from app.services.scoring import METRICS, BatchScoreOutput, cap_columns, compute_batch
+
+
+SYNTHETIC_CHUNK_SIZE = 5000
+
+SPOT_NAMES = ["Main Well", "Service Bar", "Patio"]
+BARTENDER_NAMES = ["Jay", "Alex", "Sam", "Riley", "Jordan", "Casey", "Morgan", "Taylor", "Quinn", "Avery", "Drew", "Reese"]
+
+# Manual caps every generated spot starts with (the same ones /dev/seed always used).
+DEFAULT_CAPS = {
+    "sales_volume_low": 200.0,
+    "sales_volume_high": 1200.0,
+    "pct_of_bar_sales_low": 0.05,
+    "pct_of_bar_sales_high": 0.40,
+    "tip_pct_low": 0.15,
+    "tip_pct_high": 0.30,
+    "sales_per_hour_low": 50.0,
+    "sales_per_hour_high": 250.0,
+}
+
+# Sales multipliers by month (Jan..Dec) and by weekday (Mon..Sun). Busier
+# nights also get proportionally more shifts.
+SEASONALITY = np.array([0.80, 0.82, 0.90, 0.95, 1.05, 1.15, 1.20, 1.18, 1.00, 0.95, 0.98, 1.12])
+WEEKDAY_SALES = np.array([0.55, 0.60, 0.70, 0.90, 1.35, 1.50, 0.95])
+
+
+@dataclass
+class SyntheticSpec:
+    shifts: int = 100_000
+    spots: int = 3
+    bartenders: int = 12
+    years: float = 2.0
+    seed: int = 7
+    end_date: date | None = None  # last generated day; today when None
+
+    @property
+    def days(self) -> int:
+        return max(1, int(self.years * 365))
+
+
+def _name(names: list[str], i: int) -> str:
+    return names[i] if i < len(names) else f"{names[i % len(names)]} {i // len(names) + 1}"
+
+
+def ensure_roster(db: Session, bar_id: int, spots: int, bartenders: int) -> tuple[list[int], list[str]]:
+    """Top the bar up to `spots` spots (with manual caps) and `bartenders` bartenders.
+
+    Returns the first `spots` spot ids and `bartenders` active bartender names.
+    """
+
+    spot_ids = [s.id for s in db.query(Spot).filter(Spot.bar_id == bar_id).order_by(Spot.id).all()]
+    for i in range(len(spot_ids), spots):
+        spot = Spot(bar_id=bar_id, name=_name(SPOT_NAMES, i))
+        db.add(spot)
+        db.flush()
+        db.add(SpotScoreConfig(bar_id=bar_id, spot_id=spot.id, cap_mode=SpotCapMode.manual, **DEFAULT_CAPS))
+        spot_ids.append(spot.id)
+
+    names = [
+        b.name
+        for b in db.query(Bartender)
+        .filter(Bartender.bar_id == bar_id, Bartender.is_active.is_(True))
+        .order_by(Bartender.id)
+        .all()
+    ]
+    taken = set(names)
+    i = 0
+    while len(names) < bartenders:
+        name = _name(BARTENDER_NAMES, i)
+        i += 1
+        if name in taken:
+            continue
+        db.add(Bartender(bar_id=bar_id, name=name))
+        names.append(name)
+        taken.add(name)
+
+    db.flush()
+    return spot_ids[:spots], names[:bartenders]
+
+
+def generate_columns(spec: SyntheticSpec, spot_ids: list[int], names: list[str]) -> dict[str, np.ndarray]:
+    """Raw shift inputs as columns, sorted by date. Same spec, same rows.
+
+    Each day has a bar-wide sales figure shaped by season and weekday. Each
+    bartender has a skill (share of the bar's sales they capture), a tipping
+    rate and a home spot they work most shifts at; spots differ in how much
+    of the bar's sales go through them.
+    """
+
+    rng = np.random.default_rng(spec.seed)
+    end = spec.end_date or date.today()
+    start = end - timedelta(days=spec.days - 1)
+    day_dates = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    weekdays = (day_dates.astype("int64") + 3) % 7  # 1970-01-01 was a Thursday
+    months = day_dates.astype("datetime64[M]").astype("int64") % 12
+
+    day_sales = (
+        rng.normal(9000.0, 1500.0)
+        * SEASONALITY[months]
+        * WEEKDAY_SALES[weekdays]
+        * rng.lognormal(0.0, 0.12, size=len(day_dates))
+    )
+
+    spot_share = rng.dirichlet(np.full(len(spot_ids), 4.0)) * len(spot_ids)
+    skill = np.clip(rng.normal(1.0, 0.18, size=len(names)), 0.5, 1.6)
+    tip_rate = np.clip(rng.normal(0.20, 0.035, size=len(names)), 0.08, 0.35)
+    home_spot = rng.permutation(len(names)) % len(spot_ids)
+
+    n = spec.shifts
+    day_weights = WEEKDAY_SALES[weekdays]
+    day = np.sort(rng.choice(len(day_dates), size=n, p=day_weights / day_weights.sum()))
+    who = rng.integers(0, len(names), size=n)
+    spot = np.where(rng.random(n) < 0.7, home_spot[who], rng.integers(0, len(spot_ids), size=n))
+
+    total_bar_sales = np.round(day_sales[day], 2)
+    share = 0.12 * spot_share[spot] * skill[who] * rng.lognormal(0.0, 0.25, size=n)
+    personal_sales = np.round(total_bar_sales * np.minimum(share, 0.6), 2)
+    personal_tips = np.round(personal_sales * tip_rate[who] * rng.lognormal(0.0, 0.12, size=n), 2)
+    hours = np.round(np.clip(rng.normal(5.5, 1.0, size=n) + 0.8 * (WEEKDAY_SALES[weekdays[day]] > 1.0), 3.0, 10.0), 2)
+
+    return {
+        "spot_id": np.asarray(spot_ids, dtype=np.int64)[spot],
+        "bartender": who,
+        "shift_date": day_dates[day],
+        "personal_sales_volume": personal_sales,
+        "total_bar_sales": total_bar_sales,
+        "personal_tips": personal_tips,
+        "hours_worked": hours,
+        "transactions_count": np.maximum(1, np.rint(personal_sales / rng.normal(14.0, 2.0, size=n).clip(6.0))).astype(np.int64),
+    }
+
+
+SHIFT_COLUMNS = [
+    "id",
+    "bar_id",
+    "spot_id",
+    "bartender_name",
+    "shift_date",
+    "personal_sales_volume",
+    "total_bar_sales",
+    "personal_tips",
+    "hours_worked",
+    "transactions_count",
+    "pct_of_bar_sales",
+    "tip_pct",
+    "sales_per_hour",
+]
+SCORE_COLUMNS = ["shift_id", "score_total", "score_version", "breakdown_json"]
+
+# ScoreOutput.breakdown as json.dumps would encode it (floats use repr either way).
+_BREAKDOWN_JSON = "{" + ", ".join(f'"{m}": {{"value": %r, "normalized": %r, "points": %r}}' for m in METRICS) + "}"
+
+
+def _breakdown_json(batch: BatchScoreOutput) -> list[str]:
+    cols = [col[m].tolist() for m in METRICS for col in (batch.values, batch.normalized, batch.points)]
+    return [_BREAKDOWN_JSON % row for row in zip(*cols)]
+
+
+def _insert_sql(db: Session, table: str, columns: list[str]) -> str:
+    mark = "?" if db.get_bind().dialect.paramstyle == "qmark" else "%s"
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([mark] * len(columns))})"
+
+
+def generate(db: Session, bar_id: int, spec: SyntheticSpec, chunk_size: int = SYNTHETIC_CHUNK_SIZE) -> int:
+    """Generate, score and insert spec.shifts shifts for a bar; returns the count.
+
+    Rows are scored column-wise and handed to the driver's executemany as
+    plain tuples (PyMySQL turns that into multi-row INSERTs), one commit per
+    chunk. Shift ids are assigned here, so nothing else should be writing
+    shifts to the database meanwhile. The bar's rollups are rebuilt once at
+    the end instead of being upserted chunk by chunk, and the spots'
+    in-process caches are dropped.
+    """
+
+    spot_ids, names = ensure_roster(db, bar_id, spec.spots, spec.bartenders)
+    db.commit()
+    configs = {
+        cfg.spot_id: cfg
+        for cfg in db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id.in_(spot_ids)).all()
+    }
+    # Scoring only reads caps; keep the configs usable after each chunk's commit.
+    for cfg in configs.values():
+        db.expunge(cfg)
+    # Spots created outside ensure_roster may not have caps yet; leave them out.
+    spot_ids = [spot_id for spot_id in spot_ids if spot_id in configs]
+    if not spot_ids:
+        raise ValueError("No spot with a SpotScoreConfig to generate shifts for")
+
+    insert_shift = _insert_sql(db, Shift.__tablename__, SHIFT_COLUMNS)
+    insert_score = _insert_sql(db, ScoreResult.__tablename__, SCORE_COLUMNS)
+    cols = generate_columns(spec, spot_ids, names)
+    for lo in range(0, spec.shifts, chunk_size):
+        part = {key: col[lo : lo + chunk_size] for key, col in cols.items()}
+        batch = compute_batch(
+            part["personal_sales_volume"],
+            part["total_bar_sales"],
+            part["personal_tips"],
+            part["hours_worked"],
+            cap_columns(configs, part["spot_id"]),
+        )
+
+        first_id = (db.scalar(select(func.max(Shift.id))) or 0) + 1
+        shift_ids = range(first_id, first_id + len(batch))
+        conn = db.connection()
+        conn.exec_driver_sql(
+            insert_shift,
+            list(
+                zip(
+                    shift_ids,
+                    repeat(bar_id),
+                    part["spot_id"].tolist(),
+                    [names[who] for who in part["bartender"].tolist()],
+                    [d.isoformat() for d in part["shift_date"].tolist()],
+                    part["personal_sales_volume"].tolist(),
+                    part["total_bar_sales"].tolist(),
+                    part["personal_tips"].tolist(),
+                    part["hours_worked"].tolist(),
+                    part["transactions_count"].tolist(),
+                    batch.values["pct_of_bar_sales"].tolist(),
+                    batch.values["tip_pct"].tolist(),
+                    batch.values["sales_per_hour"].tolist(),
+                )
+            ),
+        )
+        conn.exec_driver_sql(
+            insert_score,
+            list(zip(shift_ids, batch.score_total.tolist(), batch.score_versions, _breakdown_json(batch))),
+        )
+        db.commit()
+
+    leaderboard_rollup.rebuild(db, bar_id)
+    db.commit()
+    auto_caps.invalidate(spot_ids)
+    cohort_ranks.invalidate(spot_ids)
+    return spec.shifts
+
+
+def main(argv: list[str] | None = None) -> None:
+    import time
+
+    from app.db.session import get_session_maker
+
+    defaults = SyntheticSpec()
+    parser = argparse.ArgumentParser(description="Generate realistic scored shifts for a bar.")
+    parser.add_argument("--bar-id", type=int, default=None, help="existing bar (default: create a new one)")
+    parser.add_argument("--shifts", type=int, default=defaults.shifts)
+    parser.add_argument("--spots", type=int, default=defaults.spots)
+    parser.add_argument("--bartenders", type=int, default=defaults.bartenders)
+    parser.add_argument("--years", type=float, default=defaults.years)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--chunk-size", type=int, default=SYNTHETIC_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(args.shifts, args.spots, args.bartenders, args.years, args.seed, args.end_date)
+    db = get_session_maker()()
+    try:
+        if args.bar_id is None:
+            bar = Bar(name="Synthetic Bar", timezone="America/New_York")
+            db.add(bar)
+            db.commit()
+            bar_id = bar.id
+        elif db.get(Bar, args.bar_id) is None:
+            parser.error(f"bar {args.bar_id} does not exist")
+        else:
+            bar_id = args.bar_id
+
+        t0 = time.perf_counter()
+        count = generate(db, bar_id, spec, chunk_size=args.chunk_size)
+        print(f"bar {bar_id}: {count} shifts generated in {time.perf_counter() - t0:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import enum
+from datetime import date
+
+from sqlalchemy import Date, Integer, case, cast, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.services.scoring import METRICS
+
+
+ROLLING_WINDOWS = (7, 30)
+
+
+class TrendBucket(str, enum.Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+def period_start(dialect: str, bucket: TrendBucket, day: ColumnElement) -> ColumnElement:
+    """SQL for the first day of `day`'s bucket; weeks start on Monday."""
+
+    if bucket == TrendBucket.day:
+        return day
+    if dialect == "sqlite":
+        if bucket == TrendBucket.week:
+            # Forward to the week's Sunday (or stay on it), then back to its Monday.
+            return func.date(day, "weekday 0", "-6 days", type_=Date)
+        return func.date(day, "start of month", type_=Date)
+    if dialect == "mysql":
+        offset = func.weekday(day) if bucket == TrendBucket.week else func.dayofmonth(day) - 1
+        return func.subdate(day, offset, type_=Date)
+    raise ValueError(f"Trend buckets are not supported on {dialect!r} databases")
+
+
+def day_of_week(dialect: str, day: ColumnElement) -> ColumnElement:
+    """SQL for the weekday of `day`, 0 = Monday through 6 = Sunday (date.weekday())."""
+
+    if dialect == "sqlite":
+        # strftime('%w') counts from Sunday = 0.
+        return (cast(func.strftime("%w", day), Integer) + 6) % 7
+    if dialect == "mysql":
+        return func.weekday(day)
+    raise ValueError(f"Weekdays are not supported on {dialect!r} databases")
+
+
+def bartender_trend(
+    db: Session,
+    bar_id: int,
+    bartender_name: str,
+    bucket: TrendBucket,
+    start_date: date | None,
+    end_date: date | None,
+) -> list:
+    """One row per bucket: shift count, average score and subscores, and the
+    rolling shift-count means as of the bucket's last shift.
+
+    Everything is aggregated in SQL, so the result is one row per bucket however
+    many shifts it covers. Rolling windows run over the bartender's whole
+    history, so the first bucket after start_date still averages the shifts
+    before it.
+    """
+
+    points = {metric: ScoreResult.breakdown_json[(metric, "points")].as_float() for metric in METRICS}
+    period = period_start(db.get_bind().dialect.name, bucket, Shift.shift_date)
+    in_order = (Shift.shift_date, Shift.id)
+
+    per_shift = (
+        select(
+            Shift.shift_date.label("shift_date"),
+            period.label("period_start"),
+            ScoreResult.score_total.label("score_total"),
+            *(value.label(f"points_{metric}") for metric, value in points.items()),
+            *(
+                func.avg(ScoreResult.score_total)
+                .over(order_by=in_order, rows=(-(window - 1), 0))
+                .label(f"rolling_{window}")
+                for window in ROLLING_WINDOWS
+            ),
+            func.row_number()
+            .over(partition_by=period, order_by=(Shift.shift_date.desc(), Shift.id.desc()))
+            .label("from_last"),
+        )
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .where(Shift.bar_id == bar_id, Shift.bartender_name == bartender_name)
+    )
+    if end_date is not None:
+        # Windows only look back, so later shifts can be dropped up front.
+        per_shift = per_shift.where(Shift.shift_date <= end_date)
+    per_shift = per_shift.subquery()
+
+    q = select(
+        per_shift.c.period_start,
+        func.count().label("shifts_count"),
+        func.avg(per_shift.c.score_total).label("avg_score"),
+        *(func.avg(per_shift.c[f"points_{metric}"]).label(f"avg_points_{metric}") for metric in METRICS),
+        *(
+            func.max(case((per_shift.c.from_last == 1, per_shift.c[f"rolling_{window}"]))).label(f"rolling_{window}")
+            for window in ROLLING_WINDOWS
+        ),
+    )
+    if start_date is not None:
+        q = q.where(per_shift.c.shift_date >= start_date)
+
+    return db.execute(q.group_by(per_shift.c.period_start).order_by(per_shift.c.period_start)).all()
@@ -0,0 +1,77 @@
+"""Per-request overhead of MetricsMiddleware and the query tally.
+
+Drives a minimal ASGI app directly (no HTTP client in the loop) with and
+without the middleware, and a SQLite SELECT 1 with and without an active
+tally, then prints the difference per request / per statement.
+
+    python -m benchmarks.bench_metrics --requests 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _drive(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    t0 = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - t0) / requests
+
+
+def _statements(engine, statements: int) -> float:
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        t0 = time.perf_counter()
+        for _ in range(statements):
+            conn.execute(text("SELECT 1")).scalar()
+        return (time.perf_counter() - t0) / statements
+
+
+def main(argv: list[str] | None = None) -> None:
+    from sqlalchemy import create_engine
+
+    from app.core.metrics import MetricsMiddleware, QueryTally, RequestMetrics, _current_tally, instrument_engine
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--statements", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    bare = min(asyncio.run(_drive(_app, args.requests)) for _ in range(3))
+    wrapped = MetricsMiddleware(_app, RequestMetrics())
+    measured = min(asyncio.run(_drive(wrapped, args.requests)) for _ in range(3))
+    print(f"request:   bare {bare * 1e6:7.2f} us  with metrics {measured * 1e6:7.2f} us  overhead {(measured - bare) * 1e6:6.2f} us")
+
+    plain_engine = create_engine("sqlite://")
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    plain = tallied = float("inf")
+    for _ in range(3):
+        plain = min(plain, _statements(plain_engine, args.statements))
+        token = _current_tally.set(QueryTally())
+        try:
+            tallied = min(tallied, _statements(engine, args.statements))
+        finally:
+            _current_tally.reset(token)
+    print(f"statement: bare {plain * 1e6:7.2f} us  tallied      {tallied * 1e6:7.2f} us  overhead {(tallied - plain) * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
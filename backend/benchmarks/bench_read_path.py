@@ -0,0 +1,147 @@
+"""Compare the async and sync read paths under concurrent load.
+
+Seeds a throwaway SQLite database, then fires concurrent requests at the read
+routes in-process (httpx + ASGITransport) once with ASYNC_DB on and once with it
+off, and prints throughput and latency percentiles for each.
+
+    python -m benchmarks.bench_read_path --shifts 20000 --concurrency 200 --requests 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def _seed(shifts: int) -> tuple[int, int]:
+    from app.db.session import get_engine, get_session_maker
+    from app.models.bar import Bar
+    from app.models.base import Base
+    from app.models.spot import Spot
+    from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+    from app.models.user import User, UserRole
+    from app.services.shift_import import import_shifts
+
+    Base.metadata.create_all(bind=get_engine())
+    rng = random.Random(7)
+    with get_session_maker()() as db:
+        bar = Bar(name="Bench Bar", timezone="UTC")
+        db.add(bar)
+        db.flush()
+        owner = User(bar_id=bar.id, email="bench@example.com", name="Bench", role=UserRole.owner, password_hash="!", is_active=True)
+        spot = Spot(bar_id=bar.id, name="Main Well")
+        db.add_all([owner, spot])
+        db.flush()
+        db.add(
+            SpotScoreConfig(
+                bar_id=bar.id,
+                spot_id=spot.id,
+                cap_mode=SpotCapMode.manual,
+                sales_volume_low=200.0,
+                sales_volume_high=1200.0,
+                pct_of_bar_sales_low=0.05,
+                pct_of_bar_sales_high=0.40,
+                tip_pct_low=0.15,
+                tip_pct_high=0.30,
+                sales_per_hour_low=50.0,
+                sales_per_hour_high=250.0,
+            )
+        )
+        db.commit()
+        bar_id, owner_id, spot_id = bar.id, owner.id, spot.id
+
+        start = date.today() - timedelta(days=730)
+        rows = (
+            (
+                i,
+                {
+                    "spot_id": spot_id,
+                    "bartender_name": f"Bartender {rng.randrange(30)}",
+                    "shift_date": (start + timedelta(days=rng.randrange(730))).isoformat(),
+                    "personal_sales_volume": rng.uniform(100, 2500),
+                    "total_bar_sales": rng.uniform(3000, 15000),
+                    "personal_tips": rng.uniform(0, 500),
+                    "hours_worked": rng.uniform(3, 10),
+                },
+            )
+            for i in range(shifts)
+        )
+        import_shifts(db, bar_id, rows)
+        return bar_id, owner_id
+
+
+async def _bench(app, headers: dict, urls: list[str], concurrency: int, total: int) -> tuple[float, list[float]]:
+    from app.db.session import get_async_engine
+
+    await _load(app, headers, urls, concurrency, min(total, 200))  # warm up pools
+    t0 = time.perf_counter()
+    latencies = await _load(app, headers, urls, concurrency, total)
+    elapsed = time.perf_counter() - t0
+    # Pooled aiosqlite connections belong to this event loop.
+    await get_async_engine().dispose()
+    return elapsed, latencies
+
+
+async def _load(app, headers: dict, urls: list[str], concurrency: int, total: int) -> list[float]:
+    import httpx
+
+    latencies: list[float] = []
+    queue = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for i in queue:
+            t0 = time.perf_counter()
+            resp = await client.get(urls[i % len(urls)], headers=headers)
+            latencies.append(time.perf_counter() - t0)
+            resp.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shifts", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{Path(tmp) / 'bench.db'}"
+        from app.core.config import get_settings
+        from app.core.security import create_access_token
+        from app.main import app
+        from app.models.user import UserRole
+
+        bar_id, owner_id = _seed(args.shifts)
+        headers = {"Authorization": f"Bearer {create_access_token(subject=str(owner_id), role=UserRole.owner.value, bar_id=bar_id)}"}
+        urls = [
+            "/api/leaderboard",
+            f"/api/shifts?bar_id={bar_id}&limit=50",
+            f"/api/spots?bar_id={bar_id}",
+            f"/api/bartenders?bar_id={bar_id}",
+            "/api/auth/me",
+        ]
+
+        print(f"{args.requests} requests, {args.concurrency} concurrent, {args.shifts} shifts")
+        for async_db in (True, False):
+            get_settings().async_db = async_db
+            elapsed, latencies = asyncio.run(_bench(app, headers, urls, args.concurrency, args.requests))
+            q = statistics.quantiles(latencies, n=100)
+            print(
+                f"  {'async' if async_db else 'sync '}: {args.requests / elapsed:8.0f} req/s"
+                f"  p50 {q[49] * 1000:6.1f} ms  p99 {q[98] * 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmark: ShiftOut list rendering, pydantic path vs shift_out_dict.
+
+Builds in-memory Shift/ScoreResult pairs (no database) and times rendering a
+page of them the old way (from_orm_with_score + FastAPI's jsonable_encoder) and
+the fast way (shift_out_dict + the same JSON renderer). Exits non-zero if the
+two ever produce different bytes.
+
+    python -m benchmarks.bench_shift_serialization --rows 200 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.schemas.shifts import ShiftOut, shift_out_dict
+from app.services.scoring import compute_batch
+
+
+def _rows(n: int) -> list[tuple[Shift, ScoreResult | None]]:
+    rng = random.Random(3)
+    sales = [rng.uniform(0, 2500) for _ in range(n)]
+    totals = [rng.uniform(3000, 15000) for _ in range(n)]
+    tips = [rng.uniform(0, 0.35) * s for s in sales]
+    hours = [rng.uniform(3, 10) for _ in range(n)]
+    caps = {
+        "sales_volume_low": 200.0,
+        "sales_volume_high": 1200.0,
+        "pct_of_bar_sales_low": 0.05,
+        "pct_of_bar_sales_high": 0.40,
+        "tip_pct_low": 0.15,
+        "tip_pct_high": 0.30,
+        "sales_per_hour_low": 50.0,
+        "sales_per_hour_high": 250.0,
+    }
+    batch = compute_batch(sales, totals, tips, hours, caps)
+    breakdowns = batch.breakdowns()
+
+    rows = []
+    for i in range(n):
+        shift = Shift(
+            id=i + 1,
+            bar_id=1,
+            spot_id=1 + i % 3,
+            bartender_name=rng.choice(["Jay", "Alex", "Zoë"]),
+            shift_date=date(2024, 1, 1) + timedelta(days=i),
+            personal_sales_volume=sales[i],
+            total_bar_sales=totals[i],
+            personal_tips=tips[i],
+            hours_worked=hours[i],
+            transactions_count=rng.choice([None, rng.randrange(200)]),
+            pct_of_bar_sales=float(batch.values["pct_of_bar_sales"][i]),
+            tip_pct=float(batch.values["tip_pct"][i]),
+            sales_per_hour=float(batch.values["sales_per_hour"][i]),
+        )
+        score = ScoreResult(
+            shift_id=shift.id,
+            score_total=float(batch.score_total[i]),
+            score_version=batch.score_version,
+            breakdown_json=breakdowns[i],
+        )
+        rows.append((shift, score if i % 10 else None))
+    return rows
+
+
+def render_pydantic(rows) -> bytes:
+    return JSONResponse(jsonable_encoder([ShiftOut.from_orm_with_score(s, r) for s, r in rows])).body
+
+
+def render_fast(rows) -> bytes:
+    return JSONResponse([shift_out_dict(s, r) for s, r in rows]).body
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rows = _rows(args.rows)
+    if render_pydantic(rows) != render_fast(rows):
+        sys.exit("fast path output differs from the pydantic path")
+
+    print(f"{args.rows} shifts per page, best of 5 x {args.repeat} renders")
+    timings = {}
+    for name, fn in (("pydantic", render_pydantic), ("fast", render_fast)):
+        best = min(timeit.repeat(lambda: fn(rows), number=args.repeat, repeat=5)) / args.repeat
+        timings[name] = best
+        print(f"  {name:>8}: {best * 1000:7.3f} ms/page")
+    print(f"  speedup: {timings['pydantic'] / timings['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
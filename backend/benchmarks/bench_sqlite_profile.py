@@ -0,0 +1,167 @@
+"""Read latency while shifts are being written, with and without the SQLite profile.
+
+For each profile ("default": SQLite's rollback journal and full sync; "tuned":
+the SQLITE_* pragmas from app/db/sqlite.py) a fresh database file is seeded
+with synthetic shifts, then one writer thread imports small batches of shifts
+(one transaction each, as a CSV upload would) while reader threads page
+through shifts and sum the leaderboard rollup. Prints read percentiles,
+reads/s, shifts written/s and "database is locked" errors per profile.
+
+    python -m benchmarks.bench_sqlite_profile --shifts 50000 --readers 8 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+READS = (
+    "SELECT s.id, s.shift_date, s.bartender_name, r.score_total FROM shifts s "
+    "JOIN score_results r ON r.shift_id = s.id WHERE s.bar_id = :bar_id "
+    "ORDER BY s.shift_date DESC, s.id DESC LIMIT 50",
+    "SELECT bartender_name, SUM(score_sum) / SUM(shifts_count) AS avg_score FROM leaderboard_rollups "
+    "WHERE bar_id = :bar_id GROUP BY bartender_name ORDER BY avg_score DESC",
+)
+
+
+def _engine(path: Path, tuned: bool):
+    from sqlalchemy import create_engine
+
+    from app.core.config import get_settings
+    from app.db.sqlite import configure_sqlite
+
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    configure_sqlite(engine, get_settings().model_copy(update={"sqlite_tuning": tuned}))
+    return engine
+
+
+def _seed(engine, shifts: int) -> tuple[int, list[int], list[str]]:
+    from sqlalchemy.orm import Session
+
+    from app.db.migrations import migrate
+    from app.models.bar import Bar
+    from app.services import synthetic
+
+    migrate(engine)
+    with Session(bind=engine) as db:
+        bar = Bar(name="Bench Bar", timezone="UTC")
+        db.add(bar)
+        db.flush()
+        spot_ids, names = synthetic.ensure_roster(db, bar.id, spots=3, bartenders=12)
+        db.commit()
+        synthetic.generate(db, bar.id, synthetic.SyntheticSpec(shifts=shifts, spots=3, bartenders=12))
+        return bar.id, spot_ids, names
+
+
+def _writer(engine, bar_id: int, spot_ids: list[int], names: list[str], batch: int, stop: threading.Event, stats: dict) -> None:
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+
+    from app.services.shift_import import import_shifts
+
+    day = date.today()
+    i = 0
+    with Session(bind=engine) as db:
+        while not stop.is_set():
+            rows = []
+            for _ in range(batch):
+                rows.append(
+                    (
+                        i,
+                        {
+                            "spot_id": spot_ids[i % len(spot_ids)],
+                            "bartender_name": names[i % len(names)],
+                            "shift_date": (day - timedelta(days=i % 365)).isoformat(),
+                            "personal_sales_volume": 400.0 + i % 900,
+                            "total_bar_sales": 6000.0,
+                            "personal_tips": 80.0 + i % 120,
+                            "hours_worked": 6.0,
+                        },
+                    )
+                )
+                i += 1
+            try:
+                stats["written"] += import_shifts(db, bar_id, iter(rows)).inserted
+            except OperationalError:
+                db.rollback()
+                stats["write_errors"] += 1
+
+
+def _reader(engine, bar_id: int, stop: threading.Event, latencies: list[float], stats: dict) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    statements = [text(sql) for sql in READS]
+    n = 0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(statements[n % len(statements)], {"bar_id": bar_id}).all()
+        except OperationalError:
+            stats["read_errors"] += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+        n += 1
+
+
+def run(tmp: Path, tuned: bool, shifts: int, readers: int, seconds: float, batch: int) -> dict:
+    engine = _engine(tmp / f"{'tuned' if tuned else 'default'}.db", tuned)
+    bar_id, spot_ids, names = _seed(engine, shifts)
+    with engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+
+    stop = threading.Event()
+    stats = {"written": 0, "write_errors": 0, "read_errors": 0}
+    latencies: list[list[float]] = [[] for _ in range(readers)]
+    threads = [threading.Thread(target=_writer, args=(engine, bar_id, spot_ids, names, batch, stop, stats))]
+    threads += [threading.Thread(target=_reader, args=(engine, bar_id, stop, latencies[i], stats)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    samples = [s for per_reader in latencies for s in per_reader]
+    q = statistics.quantiles(samples, n=100) if len(samples) > 1 else [samples[0] if samples else 0.0] * 99
+    return {
+        "journal_mode": journal_mode,
+        "reads_per_s": len(samples) / seconds,
+        "p50_ms": q[49] * 1000,
+        "p95_ms": q[94] * 1000,
+        "p99_ms": q[98] * 1000,
+        "max_ms": max(samples, default=0.0) * 1000,
+        "writes_per_s": stats["written"] / seconds,
+        **stats,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shifts", type=int, default=50_000, help="seeded before the run")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0, help="per profile")
+    parser.add_argument("--batch", type=int, default=20, help="shifts per write transaction")
+    args = parser.parse_args(argv)
+
+    print(f"{args.readers} readers, 1 writer ({args.batch} shifts/txn), {args.seconds:.0f}s, {args.shifts} seeded shifts")
+    with tempfile.TemporaryDirectory() as tmp:
+        for tuned in (False, True):
+            r = run(Path(tmp), tuned, args.shifts, args.readers, args.seconds, args.batch)
+            print(
+                f"  {'tuned' if tuned else 'default':8s} ({r['journal_mode']:6s})"
+                f"  reads {r['reads_per_s']:8.0f}/s  p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms"
+                f"  p99 {r['p99_ms']:7.2f} ms  max {r['max_ms']:8.2f} ms"
+                f"  writes {r['writes_per_s']:7.0f} shifts/s  locked {r['read_errors']} read / {r['write_errors']} write"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Synthetic dataset for the benchmarks: bars x spots x bartenders x years of shifts.
+
+Rows go through the regular import service, so scores, rollups and indexes
+look exactly like production data written by the API.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+
+@dataclass
+class DatasetSpec:
+    bars: int = 2
+    spots: int = 4  # per bar
+    bartenders: int = 20  # per bar
+    years: float = 2.0
+    shifts_per_week: float = 4.0  # per bartender
+    seed: int = 7
+
+    @property
+    def days(self) -> int:
+        return int(self.years * 365)
+
+    @property
+    def shifts_per_bar(self) -> int:
+        return int(self.bartenders * self.days / 7 * self.shifts_per_week)
+
+
+@dataclass
+class SeededBar:
+    bar_id: int
+    owner_id: int
+    employee_id: int
+    employee_name: str
+    spot_ids: list[int] = field(default_factory=list)
+    bartender_names: list[str] = field(default_factory=list)
+
+
+def seed(spec: DatasetSpec) -> list[SeededBar]:
+    """Create the schema and spec's data in the configured database."""
+
+    from app.db.session import get_engine, get_session_maker
+    from app.models.bar import Bar
+    from app.models.base import Base
+    from app.models.spot import Spot
+    from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+    from app.models.user import User, UserRole
+    from app.services.shift_import import import_shifts
+
+    Base.metadata.create_all(bind=get_engine())
+    rng = random.Random(spec.seed)
+    start = date.today() - timedelta(days=spec.days)
+    bars: list[SeededBar] = []
+
+    with get_session_maker()() as db:
+        for b in range(spec.bars):
+            bar = Bar(name=f"Bench Bar {b}", timezone="UTC")
+            db.add(bar)
+            db.flush()
+            names = [f"Bartender {b}-{i}" for i in range(spec.bartenders)]
+            owner = User(bar_id=bar.id, email=f"owner{b}@example.com", name=f"Owner {b}", role=UserRole.owner, password_hash="!", is_active=True)
+            employee = User(bar_id=bar.id, email=f"emp{b}@example.com", name=names[0], role=UserRole.employee, password_hash="!", is_active=True)
+            spots = [Spot(bar_id=bar.id, name=f"Spot {s}") for s in range(spec.spots)]
+            db.add_all([owner, employee, *spots])
+            db.flush()
+            for spot in spots:
+                db.add(
+                    SpotScoreConfig(
+                        bar_id=bar.id,
+                        spot_id=spot.id,
+                        cap_mode=SpotCapMode.manual,
+                        sales_volume_low=200.0,
+                        sales_volume_high=1200.0,
+                        pct_of_bar_sales_low=0.05,
+                        pct_of_bar_sales_high=0.40,
+                        tip_pct_low=0.15,
+                        tip_pct_high=0.30,
+                        sales_per_hour_low=50.0,
+                        sales_per_hour_high=250.0,
+                    )
+                )
+            db.commit()
+            seeded = SeededBar(bar.id, owner.id, employee.id, names[0], [s.id for s in spots], names)
+
+            rows = (
+                (
+                    i,
+                    {
+                        "spot_id": rng.choice(seeded.spot_ids),
+                        "bartender_name": rng.choice(names),
+                        "shift_date": (start + timedelta(days=rng.randrange(spec.days))).isoformat(),
+                        "personal_sales_volume": rng.uniform(100, 2500),
+                        "total_bar_sales": rng.uniform(3000, 15000),
+                        "personal_tips": rng.uniform(0, 500),
+                        "hours_worked": rng.uniform(3, 10),
+                    },
+                )
+                for i in range(spec.shifts_per_bar)
+            )
+            import_shifts(db, bar.id, rows)
+            bars.append(seeded)
+
+    with get_engine().begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+    return bars
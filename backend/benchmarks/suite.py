@@ -0,0 +1,259 @@
+"""Benchmark suite: scoring throughput and hot-endpoint latency.
+
+Seeds a throwaway SQLite database with a synthetic dataset (see dataset.py),
+then measures:
+
+- scoring: compute_shift and compute_batch throughput on the seeded inputs;
+- endpoints: p50/p95 latency of the hot routes, called one at a time
+  in-process through the ASGI app (httpx + ASGITransport).
+
+The response cache is cleared before every request so the numbers reflect the
+real database work; pass --response-cache to measure with it on.
+
+Results are written as JSON (--out). Pass --compare with an earlier results
+file to print the change per metric; with --max-regression, the run exits
+non-zero when any p95 or throughput is worse by more than that percentage.
+
+    python -m benchmarks.suite --bars 2 --bartenders 20 --years 2 --out bench.json
+    python -m benchmarks.suite --out new.json --compare bench.json --max-regression 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.dataset import DatasetSpec, SeededBar, seed
+
+
+def _percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    q = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else [ordered[0]] * 99
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(q[49] * 1000, 3),
+        "p95_ms": round(q[94] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def bench_scoring(rows: int, repeat: int) -> dict:
+    import numpy as np
+
+    from app.db.session import get_session_maker
+    from app.models.shift import Shift
+    from app.models.spot_score_config import SpotScoreConfig
+    from app.schemas.shifts import ShiftCreateIn
+    from app.services.scoring import cap_columns, compute_batch, compute_shift
+
+    with get_session_maker()() as db:
+        configs = {cfg.spot_id: cfg for cfg in db.query(SpotScoreConfig).all()}
+        for cfg in configs.values():
+            db.expunge(cfg)
+        shifts = (
+            db.query(
+                Shift.bar_id,
+                Shift.spot_id,
+                Shift.bartender_name,
+                Shift.shift_date,
+                Shift.personal_sales_volume,
+                Shift.total_bar_sales,
+                Shift.personal_tips,
+                Shift.hours_worked,
+            )
+            .limit(rows)
+            .all()
+        )
+
+    payloads = [ShiftCreateIn(**row._asdict()) for row in shifts]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            compute_shift(payload, configs[payload.spot_id])
+    single = len(payloads) * repeat / (time.perf_counter() - t0)
+
+    columns = {
+        name: np.array([getattr(p, name) for p in payloads], dtype=np.float64)
+        for name in ("personal_sales_volume", "total_bar_sales", "personal_tips", "hours_worked")
+    }
+    caps = cap_columns(configs, [p.spot_id for p in payloads])
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        compute_batch(columns["personal_sales_volume"], columns["total_bar_sales"], columns["personal_tips"], columns["hours_worked"], caps)
+    batch = len(payloads) * repeat / (time.perf_counter() - t0)
+
+    return {
+        "rows": len(payloads),
+        "compute_shift_per_s": round(single),
+        "compute_batch_per_s": round(batch),
+    }
+
+
+def _endpoints(bar: SeededBar, shift_id: int) -> dict[str, tuple[str, str]]:
+    """name -> (who, url); who is "owner" or "employee"."""
+
+    recent = (date.today() - timedelta(days=90)).isoformat()
+    return {
+        "leaderboard": ("owner", "/api/leaderboard"),
+        "leaderboard_90d": ("employee", f"/api/leaderboard?start_date={recent}"),
+        "list_shifts": ("owner", f"/api/shifts?bar_id={bar.bar_id}&limit=50"),
+        "list_shifts_employee": ("employee", f"/api/shifts?bar_id={bar.bar_id}&limit=50"),
+        "shift_detail": ("owner", f"/api/shifts/{shift_id}"),
+        "trends_week": ("employee", "/api/trends?bucket=week"),
+        "report_spot_weekday": ("owner", "/api/reports/shifts?group_by=spot&group_by=weekday"),
+        "auth_me": ("employee", "/api/auth/me"),
+        # Sync route: resolves its user through get_current_user.
+        "list_users": ("owner", "/api/users"),
+    }
+
+
+async def bench_endpoints(app, bar: SeededBar, iterations: int, keep_response_cache: bool) -> dict:
+    import httpx
+
+    from app.api.read_cache import response_cache
+    from app.core.security import create_access_token
+    from app.models.user import UserRole
+
+    headers = {
+        "owner": {"Authorization": f"Bearer {create_access_token(subject=str(bar.owner_id), role=UserRole.owner.value, bar_id=bar.bar_id)}"},
+        "employee": {"Authorization": f"Bearer {create_access_token(subject=str(bar.employee_id), role=UserRole.employee.value, bar_id=bar.bar_id)}"},
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(f"/api/shifts?bar_id={bar.bar_id}&limit=1", headers=headers["owner"])
+        first.raise_for_status()
+        endpoints = _endpoints(bar, first.json()[0]["id"])
+
+        results = {}
+        for name, (who, url) in endpoints.items():
+            samples = []
+            for i in range(iterations + 5):
+                if not keep_response_cache:
+                    response_cache.clear()
+                t0 = time.perf_counter()
+                resp = await client.get(url, headers=headers[who])
+                elapsed = time.perf_counter() - t0
+                resp.raise_for_status()
+                if i >= 5:  # the first few warm pools and per-process caches
+                    samples.append(elapsed)
+            results[name] = {"url": url, **_percentiles(samples)}
+
+    from app.db.session import get_async_engine
+
+    await get_async_engine().dispose()
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _metrics(results: dict) -> dict[str, tuple[float, bool]]:
+    """Flatten to name -> (value, higher_is_better) for comparison."""
+
+    out = {f"scoring.{k}": (float(v), True) for k, v in results["scoring"].items() if k.endswith("_per_s")}
+    for name, stats in results["endpoints"].items():
+        out[f"endpoints.{name}.p50_ms"] = (stats["p50_ms"], False)
+        out[f"endpoints.{name}.p95_ms"] = (stats["p95_ms"], False)
+    return out
+
+
+def compare(current: dict, baseline: dict, max_regression: float | None) -> list[str]:
+    """Print per-metric changes; return the metrics that regressed past the limit."""
+
+    now, before = _metrics(current), _metrics(baseline)
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('git_commit') or 'baseline'} ({baseline['meta']['timestamp']}):")
+    for name, (value, higher_is_better) in now.items():
+        if name not in before or not before[name][0]:
+            continue
+        change = (value - before[name][0]) / before[name][0] * 100
+        worse = -change if higher_is_better else change
+        flag = ""
+        if max_regression is not None and worse > max_regression and not name.endswith("p50_ms"):
+            regressions.append(name)
+            flag = "  <-- regression"
+        print(f"  {name:45s} {before[name][0]:>12.3f} -> {value:>12.3f}  {change:+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=defaults.bars)
+    parser.add_argument("--spots", type=int, default=defaults.spots, help="per bar")
+    parser.add_argument("--bartenders", type=int, default=defaults.bartenders, help="per bar")
+    parser.add_argument("--years", type=float, default=defaults.years)
+    parser.add_argument("--shifts-per-week", type=float, default=defaults.shifts_per_week, help="per bartender")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--iterations", type=int, default=50, help="requests per endpoint")
+    parser.add_argument("--scoring-rows", type=int, default=5000)
+    parser.add_argument("--scoring-repeat", type=int, default=3)
+    parser.add_argument("--response-cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--out", type=Path, default=Path("bench-results.json"))
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, help="fail when a p95/throughput is this many %% worse")
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(args.bars, args.spots, args.bartenders, args.years, args.shifts_per_week, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{Path(tmp) / 'bench.db'}"
+        from app.main import app
+
+        t0 = time.perf_counter()
+        bars = seed(spec)
+        seed_s = time.perf_counter() - t0
+        print(f"seeded {spec.bars * spec.shifts_per_bar} shifts in {seed_s:.1f}s")
+
+        scoring = bench_scoring(args.scoring_rows, args.scoring_repeat)
+        print(f"scoring: compute_shift {scoring['compute_shift_per_s']:,}/s, compute_batch {scoring['compute_batch_per_s']:,}/s")
+
+        endpoints = asyncio.run(bench_endpoints(app, bars[0], args.iterations, args.response_cache))
+        for name, stats in endpoints.items():
+            print(f"  {name:24s} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dataset": asdict(spec) | {"shifts": spec.bars * spec.shifts_per_bar},
+            "seed_seconds": round(seed_s, 2),
+            "iterations": args.iterations,
+            "response_cache": args.response_cache,
+        },
+        "scoring": scoring,
+        "endpoints": endpoints,
+    }
+    args.out.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"wrote {args.out}")
+
+    if args.compare is not None:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.max_regression}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.read_cache import response_cache
+from app.core.metrics import instrument_engine, request_metrics
+from app.core.security import create_access_token
+from app.db.routing import primary_pins
+from app.db.session import get_db, get_db_factory, get_read_db, open_read_session
+from app.main import app
+from app.models.bar import Bar
+from app.models.base import Base
+from app.models.spot import Spot
+from app.models.spot_score_config import SpotCapMode, SpotScoreConfig
+from app.models.user import User, UserRole
+from app.services.auto_caps import auto_caps
+from app.services.cohort_ranks import cohort_ranks
+from app.services.data_versions import data_versions
+from app.services.principals import principal_cache
+from app.services.spot_scorers import spot_scorers
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches():
+    # Each test gets a fresh database, so in-process caches must not carry over.
+    auto_caps.invalidate()
+    cohort_ranks.invalidate()
+    principal_cache.clear()
+    data_versions.forget()
+    response_cache.clear()
+    request_metrics.reset()
+    primary_pins.clear()
+    spot_scorers.invalidate()
+    yield
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    # A file database, so the aiosqlite engine behind the read routes sees the same data.
+    return tmp_path / "test.db"
+
+
+@pytest.fixture()
+def engine(db_path):
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def async_session_maker(engine, db_path):
+    # NullPool: TestClient runs each request on a fresh event loop.
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    instrument_engine(async_engine.sync_engine)
+    return async_sessionmaker(autoflush=False, bind=async_engine)
+
+
+@pytest.fixture()
+def session_maker(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture()
+def db(session_maker):
+    session = session_maker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryLog:
+    """Statements run on the test engines, for query-budget assertions."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+    @contextmanager
+    def capture(self):
+        """Yields the list of statements run inside the block."""
+
+        captured: list[str] = []
+        start = len(self.statements)
+        try:
+            yield captured
+        finally:
+            captured.extend(self.statements[start:])
+
+
+@pytest.fixture()
+def query_log(engine, async_session_maker):
+    log = QueryLog()
+    engines = [engine, async_session_maker.kw["bind"].sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", log)
+    yield log
+    for target in engines:
+        event.remove(target, "before_cursor_execute", log)
+
+
+@pytest.fixture()
+def client(session_maker, async_session_maker):
+    def _get_db():
+        session = session_maker()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def _get_read_db():
+        # Follows ASYNC_DB like get_read_db, so tests can flip it with monkeypatch.
+        async for session in open_read_session(async_session_maker, session_maker):
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_read_db
+    app.dependency_overrides[get_db_factory] = lambda: session_maker
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def owner(db):
+    bar = Bar(name="Test Bar", timezone="America/New_York")
+    db.add(bar)
+    db.flush()
+
+    user = User(
+        bar_id=bar.id,
+        email="owner@example.com",
+        name="Owner",
+        role=UserRole.owner,
+        # Tests authenticate with tokens; no bcrypt round needed.
+        password_hash="!",
+        is_active=True,
+    )
+    db.add(user)
+
+    spot = Spot(bar_id=bar.id, name="Main Well")
+    db.add(spot)
+    db.flush()
+    db.add(
+        SpotScoreConfig(
+            bar_id=bar.id,
+            spot_id=spot.id,
+            cap_mode=SpotCapMode.manual,
+            sales_volume_low=200.0,
+            sales_volume_high=1200.0,
+            pct_of_bar_sales_low=0.05,
+            pct_of_bar_sales_high=0.40,
+            tip_pct_low=0.15,
+            tip_pct_high=0.30,
+            sales_per_hour_low=50.0,
+            sales_per_hour_high=250.0,
+        )
+    )
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture()
+def spot_id(db, owner):
+    return db.query(Spot.id).filter(Spot.bar_id == owner.bar_id).scalar()
+
+
+@pytest.fixture()
+def owner_headers(owner):
+    token = create_access_token(subject=str(owner.id), role=owner.role.value, bar_id=owner.bar_id)
+    return {"Authorization": f"Bearer {token}"}
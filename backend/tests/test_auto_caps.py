@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.models.spot_score_config import SpotScoreConfig
+from app.schemas.shifts import ShiftCreateIn
+from app.services.auto_caps import auto_caps
+from app.services.scoring import compute_shift
+
+
+def _shift(bar_id, spot_id, i, day):
+    return {
+        "bar_id": bar_id,
+        "spot_id": spot_id,
+        "bartender_name": f"B{i % 4}",
+        "shift_date": day.isoformat(),
+        "personal_sales_volume": 300.0 + 40 * i,
+        "total_bar_sales": 5000.0,
+        "personal_tips": (300.0 + 40 * i) * 0.25,
+        "hours_worked": 6.0,
+    }
+
+
+def test_auto_caps_follow_percentiles_and_guardrails(client, owner, owner_headers, spot_id):
+    today = date.today()
+    for i in range(19):
+        client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, i, today - timedelta(days=i)), headers=owner_headers)
+    # Outside the 90-day window; must not count toward the sample.
+    client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, 99, today - timedelta(days=200)), headers=owner_headers)
+
+    resp = client.patch(f"/api/spots/{spot_id}/score-config", json={"cap_mode": "auto"}, headers=owner_headers)
+    cfg = resp.json()
+    assert cfg["cap_mode"] == "auto"
+    # Below the minimum sample size: manual defaults are kept.
+    assert cfg["computed_at"] is None
+    assert cfg["sales_volume_low"] == 200.0
+
+    client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, 19, today), headers=owner_headers)
+    cfg = client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner_headers).json()
+
+    sales = [300.0 + 40 * i for i in range(20)]
+    assert cfg["sample_size"] == 20
+    assert cfg["window_days"] == 90
+    assert cfg["sales_volume_low"] == np.percentile(sales, 10)
+    assert cfg["sales_volume_high"] == np.percentile(sales, 90)
+    # Every shift has the same tip %, so those caps would collapse and are kept.
+    assert cfg["tip_pct_low"] == 0.15
+    assert cfg["tip_pct_high"] == 0.30
+
+    # Deletes and edits update the window without a reload.
+    shifts = client.get(f"/api/shifts?bar_id={owner.bar_id}&limit=200", headers=owner_headers).json()
+    recent = [s for s in shifts if s["shift_date"] >= (today - timedelta(days=90)).isoformat()]
+    top = max(recent, key=lambda s: s["personal_sales_volume"])
+    client.patch(f"/api/shifts/{top['id']}", json={"personal_sales_volume": 100.0}, headers=owner_headers)
+    cfg = client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner_headers).json()
+    assert cfg["sales_volume_low"] == np.percentile([100.0] + sales[:-1], 10)
+
+    client.delete(f"/api/shifts/{top['id']}", headers=owner_headers)
+    resp = client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner_headers)
+    assert resp.status_code == 400
+
+
+def test_windows_reload_after_ttl_to_see_other_writers(client, db, owner, owner_headers, spot_id, monkeypatch):
+    today = date.today()
+    for i in range(20):
+        client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, i, today - timedelta(days=i)), headers=owner_headers)
+    client.patch(f"/api/spots/{spot_id}/score-config", json={"cap_mode": "auto"}, headers=owner_headers)
+
+    # Another worker (or a bulk path) writes a shift this process never records.
+    payload = ShiftCreateIn(**_shift(owner.bar_id, spot_id, 40, today))
+    shift, _ = compute_shift(payload, db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == spot_id).one())
+    db.add(shift)
+    db.commit()
+
+    cfg = client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner_headers).json()
+    assert cfg["sample_size"] == 20
+
+    monkeypatch.setattr(auto_caps, "ttl_seconds", 0.0)
+    cfg = client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner_headers).json()
+    assert cfg["sample_size"] == 21
+
+
+def test_import_refreshes_auto_caps(client, owner, owner_headers, spot_id):
+    client.patch(f"/api/spots/{spot_id}/score-config", json={"cap_mode": "auto"}, headers=owner_headers)
+    before = client.get(f"/api/spots/{spot_id}/score-config", headers=owner_headers).json()
+    assert before["computed_at"] is None
+
+    today = date.today()
+    lines = [json.dumps(_shift(owner.bar_id, spot_id, i, today - timedelta(days=i))) for i in range(25)]
+    resp = client.post(
+        "/api/shifts/import?format=ndjson",
+        files={"file": ("week.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+        headers=owner_headers,
+    )
+    assert resp.json()["inserted"] == 25
+
+    cfg = client.get(f"/api/spots/{spot_id}/score-config", headers=owner_headers).json()
+    assert cfg["computed_at"] is not None
+    assert cfg["sample_size"] == 25
+    assert cfg["sales_volume_low"] == np.percentile([300.0 + 40 * i for i in range(25)], 10)
+    assert cfg["sales_volume_low"] != before["sales_volume_low"]
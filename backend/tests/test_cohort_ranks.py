@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from app.services import cohort_ranks as cohort_ranks_module
+from app.services.cohort_ranks import CohortIndex
+
+
+def _brute_force(shifts: list[dict]) -> dict[int, float]:
+    cohorts = defaultdict(list)
+    for s in shifts:
+        cohorts[(s["spot_id"], date.fromisoformat(s["shift_date"]).weekday())].append(s["score_total"])
+    out = {}
+    for s in shifts:
+        scores = cohorts[(s["spot_id"], date.fromisoformat(s["shift_date"]).weekday())]
+        below = sum(x < s["score_total"] for x in scores)
+        ties = sum(x == s["score_total"] for x in scores)
+        out[s["id"]] = 100.0 * (below + 0.5 * ties) / len(scores)
+    return out
+
+
+def _all_shifts(client, headers, bar_id) -> list[dict]:
+    return client.get("/api/shifts", params={"bar_id": bar_id, "limit": 200}, headers=headers).json()
+
+
+def test_cohort_index_ranks_with_ties_and_removals():
+    index = CohortIndex({1: 50.0, 2: 70.0, 3: 70.0, 4: 90.0})
+    assert index.percentile(70.0) == 50.0
+    assert index.percentile(90.0) == 87.5
+    index.add(5, 10.0)
+    index.add(2, 95.0)  # re-adding a shift moves it
+    index.remove(4)
+    assert len(index) == 4
+    assert index.percentile(95.0) == 87.5
+    assert CohortIndex().percentile(1.0) is None
+
+
+def test_percentiles_track_writes_without_reloading(client, owner, owner_headers, spot_id, monkeypatch):
+    patio = client.post("/api/spots", json={"bar_id": owner.bar_id, "name": "Patio"}, headers=owner_headers).json()["id"]
+    header = "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked"
+    start = date(2024, 1, 1)
+    rows = [
+        f"{(spot_id, patio)[i % 2]},{('Jay', 'Alex')[i % 3 % 2]},{start + timedelta(days=i % 14)},{250 + 53 * i % 900},4000,{20 + 29 * i % 160},6"
+        for i in range(60)
+    ]
+    client.post("/api/shifts/import", files={"file": ("s.csv", "\n".join([header, *rows]).encode(), "text/csv")}, headers=owner_headers)
+
+    shifts = _all_shifts(client, owner_headers, owner.bar_id)
+    expected = _brute_force(shifts)
+    assert {s["id"]: s["score_percentile"] for s in shifts} == pytest.approx(expected)
+
+    loads = []
+    real_cohorts = cohort_ranks_module.SpotCohorts
+    monkeypatch.setattr(cohort_ranks_module, "SpotCohorts", lambda *a: loads.append(a) or real_cohorts(*a))
+
+    moved, deleted = shifts[0]["id"], shifts[1]["id"]
+    client.patch(f"/api/shifts/{moved}", json={"spot_id": patio if shifts[0]["spot_id"] == spot_id else spot_id}, headers=owner_headers)
+    client.delete(f"/api/shifts/{deleted}", headers=owner_headers)
+    created = client.post(
+        "/api/shifts",
+        json={
+            "bar_id": owner.bar_id,
+            "spot_id": spot_id,
+            "bartender_name": "Sam",
+            "shift_date": "2024-01-03",
+            "personal_sales_volume": 1000.0,
+            "total_bar_sales": 4000.0,
+            "personal_tips": 250.0,
+            "hours_worked": 5.0,
+        },
+        headers=owner_headers,
+    ).json()
+
+    shifts = _all_shifts(client, owner_headers, owner.bar_id)
+    expected = _brute_force(shifts)
+    assert {s["id"]: s["score_percentile"] for s in shifts} == pytest.approx(expected)
+    assert created["score_percentile"] == pytest.approx(expected[created["id"]])
+    detail = client.get(f"/api/shifts/{moved}", headers=owner_headers).json()
+    assert detail["score_percentile"] == pytest.approx(expected[moved])
+    assert loads == []
+
+    board_range = {"percentiles": "true", "start_date": "2024-01-01", "end_date": "2024-01-31"}
+    board = client.get("/api/leaderboard", params=board_range, headers=owner_headers).json()["entries"]
+    for entry in board:
+        mine = [expected[s["id"]] for s in shifts if s["bartender_name"] == entry["bartender_name"]]
+        assert entry["avg_percentile"] == pytest.approx(sum(mine) / len(mine))
+    plain = client.get("/api/leaderboard", headers=owner_headers).json()["entries"]
+    assert {e["avg_percentile"] for e in plain} == {None}
+    # Unbounded, the percentile variant would read every shift the bar has.
+    assert client.get("/api/leaderboard", params={"percentiles": "true"}, headers=owner_headers).status_code == 422
+    too_long = {**board_range, "end_date": "2024-06-01"}
+    assert client.get("/api/leaderboard", params=too_long, headers=owner_headers).status_code == 422
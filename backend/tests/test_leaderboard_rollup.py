@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func
+
+from app.models.leaderboard_rollup import LeaderboardRollup
+from app.models.report_rollup import ReportRollup
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.services import leaderboard_rollup
+
+
+def _direct_leaderboard(db, bar_id, start_date=None, end_date=None):
+    q = (
+        db.query(Shift.bartender_name, func.avg(ScoreResult.score_total), func.count(Shift.id), func.max(Shift.shift_date))
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.bar_id == bar_id)
+        .group_by(Shift.bartender_name)
+    )
+    if start_date:
+        q = q.filter(Shift.shift_date >= start_date)
+    if end_date:
+        q = q.filter(Shift.shift_date <= end_date)
+    return {name: (avg, count, last.isoformat()) for name, avg, count, last in q.all()}
+
+
+def _api_leaderboard(client, headers, **params):
+    entries = client.get("/api/leaderboard", params={"limit": 100, **params}, headers=headers).json()["entries"]
+    return {e["bartender_name"]: (e["avg_score"], e["shifts_count"], e["last_shift_date"]) for e in entries}
+
+
+def _assert_same(api, direct):
+    assert api.keys() == direct.keys()
+    for name, (avg, count, last) in direct.items():
+        assert api[name][0] == pytest.approx(avg, abs=1e-9)
+        assert api[name][1:] == (count, last)
+
+
+def test_rollups_track_every_write_path(client, db, owner, owner_headers, spot_id):
+    ids = []
+    for i in range(9):
+        resp = client.post(
+            "/api/shifts",
+            json={
+                "bar_id": owner.bar_id,
+                "spot_id": spot_id,
+                "bartender_name": ["Jay", "Alex", "Sam"][i % 3],
+                "shift_date": f"2024-04-0{1 + i % 4}",
+                "personal_sales_volume": 300.0 + 90 * i,
+                "total_bar_sales": 5000.0,
+                "personal_tips": 60.0 + 10 * i,
+                "hours_worked": 6.0,
+            },
+            headers=owner_headers,
+        )
+        ids.append(resp.json()["id"])
+
+    client.patch(f"/api/shifts/{ids[0]}", json={"bartender_name": "Sam", "shift_date": "2024-04-09"}, headers=owner_headers)
+    client.patch(f"/api/shifts/{ids[1]}", json={"personal_sales_volume": 1500.0}, headers=owner_headers)
+    client.delete(f"/api/shifts/{ids[2]}", headers=owner_headers)
+    patio = client.post("/api/spots", json={"bar_id": owner.bar_id, "name": "Patio"}, headers=owner_headers).json()["id"]
+    client.patch(f"/api/shifts/{ids[3]}", json={"spot_id": patio, "personal_tips": 20.0}, headers=owner_headers)
+
+    csv_body = f"spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked\n{spot_id},Alex,2024-04-02,900,5000,150,6\n"
+    client.post("/api/shifts/import", files={"file": ("x.csv", csv_body.encode(), "text/csv")}, headers=owner_headers)
+
+    client.patch(f"/api/spots/{spot_id}/score-config", json={"tip_pct_low": 0.05}, headers=owner_headers)
+    client.post("/api/rescore-jobs", json={}, headers=owner_headers)
+
+    _assert_same(_api_leaderboard(client, owner_headers), _direct_leaderboard(db, owner.bar_id))
+    _assert_same(
+        _api_leaderboard(client, owner_headers, start_date="2024-04-02", end_date="2024-04-03"),
+        _direct_leaderboard(db, owner.bar_id, "2024-04-02", "2024-04-03"),
+    )
+
+    # No zero-count rows are left behind, and a rebuild agrees with the incremental state.
+    assert db.query(LeaderboardRollup).filter(LeaderboardRollup.shifts_count <= 0).count() == 0
+    assert db.query(ReportRollup).filter(ReportRollup.shifts_count <= 0).count() == 0
+
+    def snapshot():
+        db.expire_all()
+        leaderboard = {
+            (r.bartender_name, r.shift_date): (round(r.score_sum, 9), r.shifts_count) for r in db.query(LeaderboardRollup).all()
+        }
+        report = {
+            (r.spot_id, r.bartender_name, r.shift_date): (
+                r.weekday,
+                r.month,
+                r.shifts_count,
+                round(r.score_sum, 9),
+                round(r.sales_per_hour_sum, 9),
+                round(r.tip_pct_sum, 9),
+            )
+            for r in db.query(ReportRollup).all()
+        }
+        return leaderboard, report
+
+    incremental = snapshot()
+    leaderboard_rollup.rebuild(db, owner.bar_id)
+    db.commit()
+    assert snapshot() == incremental
+    assert {spot for spot, _, _ in incremental[1]} == {spot_id, patio}
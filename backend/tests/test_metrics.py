@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+import time
+
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.metrics import MetricsMiddleware, RequestMetrics, instrument_engine
+from app.db.session import pool_stats
+
+
+def _samples(text: str) -> dict[str, float]:
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+def test_metrics_count_requests_latency_and_queries_per_route(client, owner, owner_headers, spot_id):
+    shift = {
+        "bar_id": owner.bar_id,
+        "spot_id": spot_id,
+        "bartender_name": "Jay",
+        "shift_date": "2024-05-03",
+        "personal_sales_volume": 800,
+        "total_bar_sales": 4000,
+        "personal_tips": 160,
+        "hours_worked": 6,
+    }
+    created = client.post("/api/shifts", json=shift, headers=owner_headers).json()
+    for _ in range(3):
+        assert client.get(f"/api/shifts/{created['id']}", headers=owner_headers).status_code == 200
+    assert client.get("/api/shifts/999999", headers=owner_headers).status_code == 404
+    assert client.get("/no-such-page").status_code == 404
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(resp.text)
+
+    detail = 'method="GET",route="/api/shifts/{shift_id}"'
+    assert samples[f'shiftscore_http_requests_total{{{detail},status="200"}}'] == 3
+    assert samples[f'shiftscore_http_requests_total{{{detail},status="404"}}'] == 1
+    assert samples['shiftscore_http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples[f'shiftscore_http_request_duration_seconds_count{{{detail}}}'] == 4
+    assert samples[f'shiftscore_http_request_duration_seconds_bucket{{{detail},le="+Inf"}}'] == 4
+    assert samples[f'shiftscore_db_queries_per_request_count{{{detail}}}'] == 4
+    # Every detail request reads the database; no statement escapes the tally.
+    assert samples[f'shiftscore_db_queries_per_request_bucket{{{detail},le="0"}}'] == 0
+    assert samples[f'shiftscore_db_queries_per_request_sum{{{detail}}}'] >= 4
+    assert samples[f'shiftscore_db_query_seconds_total{{{detail}}}'] > 0
+    assert samples['shiftscore_db_queries_per_request_count{method="POST",route="/api/shifts"}'] == 1
+
+    # Buckets are cumulative.
+    buckets = [
+        value
+        for name, value in samples.items()
+        if name.startswith(f"shiftscore_http_request_duration_seconds_bucket{{{detail}")
+    ]
+    assert buckets == sorted(buckets)
+
+    # The /metrics request itself is still in flight while rendering.
+    assert samples["shiftscore_http_requests_in_flight"] == 1
+    assert "shiftscore_principal_cache_hits" in samples
+    assert "shiftscore_response_cache_entries" in samples
+    assert re.search(r"^shiftscore_password_pool_workers \d+$", resp.text, re.M)
+
+
+def test_pool_stats_report_checked_out_connections(engine):
+    assert pool_stats(engine)["checked_out"] == 0
+    with engine.connect():
+        stats = pool_stats(engine)
+    assert stats["checked_out"] == 1
+    assert stats["overflow"] == 0
+    assert stats["size"] == engine.pool.size()
+
+
+def test_background_tasks_are_not_counted_toward_the_request():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    instrument_engine(engine)
+    ran = []
+
+    def cleanup():
+        time.sleep(0.3)
+        with engine.connect() as conn:
+            for _ in range(5):
+                conn.execute(text("SELECT 1"))
+        ran.append(True)
+
+    app = FastAPI()
+
+    @app.get("/work")
+    def work(background_tasks: BackgroundTasks):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        background_tasks.add_task(cleanup)
+        return {"ok": True}
+
+    metrics = RequestMetrics()
+    with TestClient(MetricsMiddleware(app, metrics)) as client:
+        assert client.get("/work").status_code == 200
+    assert ran
+
+    samples = _samples(metrics.render())
+    labels = 'method="GET",route="/work"'
+    assert samples[f"shiftscore_http_request_duration_seconds_count{{{labels}}}"] == 1
+    assert samples[f"shiftscore_http_request_duration_seconds_sum{{{labels}}}"] < 0.3
+    assert samples[f"shiftscore_db_queries_per_request_sum{{{labels}}}"] == 1
+    assert samples["shiftscore_http_requests_in_flight"] == 0
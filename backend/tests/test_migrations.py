@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.db.migrations import LATEST_VERSION, _migration_lock, current_version, migrate
+from app.models.base import Base
+from app.models.leaderboard_rollup import LeaderboardRollup
+from app.models.report_rollup import ReportRollup
+
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Import + startup + first /health against an up-to-date database, in a fresh
+# interpreter. Generous for slow CI machines, where importing FastAPI and
+# SQLAlchemy alone takes most of it; startup itself (migration check) gets
+# its own, tighter budget.
+COLD_START_BUDGET_SECONDS = 5.0
+STARTUP_BUDGET_SECONDS = 0.5
+
+COLD_START = """
+import json, sys, time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    assert client.get("/health").status_code == 200
+    ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - t0,
+    "ready_s": ready - t0,
+    "heavy": sorted(m for m in ("jose", "passlib", "bcrypt", "cryptography") if m in sys.modules),
+}))
+"""
+
+
+def _statements(engine) -> list[str]:
+    seen: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: seen.append(statement))
+    return seen
+
+
+def test_migrate_is_one_select_once_current(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'fresh.db'}")
+    assert migrate(engine) == LATEST_VERSION
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+
+    seen = _statements(engine)
+    assert migrate(engine) == LATEST_VERSION
+    assert len(seen) == 1 and "schema_version" in seen[0]
+    engine.dispose()
+
+
+def test_baseline_upgrades_a_pre_migration_database(tmp_path):
+    # A database from before migrations: create_all-era tables, a later index
+    # missing, scores but no rollups.
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_shifts_bar_id_spot_id_shift_date"))
+        conn.execute(text("INSERT INTO bars (id, name, timezone) VALUES (1, 'Old Bar', 'UTC')"))
+        conn.execute(text("INSERT INTO spots (id, bar_id, name) VALUES (1, 1, 'Well')"))
+        conn.execute(
+            text(
+                "INSERT INTO shifts (id, bar_id, spot_id, bartender_name, shift_date, personal_sales_volume, total_bar_sales,"
+                " personal_tips, hours_worked, pct_of_bar_sales, tip_pct, sales_per_hour)"
+                " VALUES (1, 1, 1, 'Jay', :day, 800, 4000, 160, 6, 0.2, 0.2, 133.3)"
+            ),
+            {"day": date(2024, 5, 3)},
+        )
+        conn.execute(text("INSERT INTO score_results (shift_id, score_total, score_version, breakdown_json) VALUES (1, 61.5, 'v1', '{}')"))
+    with engine.connect() as conn:
+        assert current_version(conn) == 0
+
+    assert migrate(engine) == LATEST_VERSION
+    assert "ix_shifts_bar_id_spot_id_shift_date" in {ix["name"] for ix in inspect(engine).get_indexes("shifts")}
+    with engine.connect() as conn:
+        assert conn.execute(text(f"SELECT score_sum, shifts_count FROM {LeaderboardRollup.__tablename__}")).one() == (61.5, 1)
+        assert conn.execute(text(f"SELECT count(*) FROM {ReportRollup.__tablename__}")).scalar() == 1
+    engine.dispose()
+
+
+def test_cold_start_stays_within_budget(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite+pysqlite:///{tmp_path / 'cold.db'}"}
+    # The first boot creates the schema; the measured one finds it current.
+    subprocess.run([sys.executable, "-m", "app.db.migrations"], cwd=BACKEND, env=env, check=True, capture_output=True)
+    out = subprocess.run([sys.executable, "-c", COLD_START], cwd=BACKEND, env=env, check=True, capture_output=True, text=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert result["heavy"] == [], "imported at boot: " + ", ".join(result["heavy"])
+    assert result["ready_s"] < COLD_START_BUDGET_SECONDS, result
+    assert result["ready_s"] - result["import_s"] < STARTUP_BUDGET_SECONDS, result
+
+
+def test_mysql_lock_timeout_refuses_to_migrate():
+    # GET_LOCK answers 0 when another process holds the lock past the timeout.
+    class Result:
+        def scalar(self):
+            return 0
+
+    class Conn:
+        dialect = SimpleNamespace(name="mysql")
+        statements: list[str] = []
+
+        def execute(self, statement, params=None):
+            self.statements.append(str(statement))
+            return Result()
+
+    @contextmanager
+    def connect():
+        yield Conn()
+
+    with pytest.raises(RuntimeError, match="migration lock"):
+        with _migration_lock(SimpleNamespace(connect=connect)):
+            pass
+    assert not any("RELEASE_LOCK" in s for s in Conn.statements)
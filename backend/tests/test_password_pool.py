@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.core import password_pool
+from app.core.config import get_settings
+
+
+@pytest.fixture()
+def tiny_pool(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "password_hash_workers", 1)
+    monkeypatch.setattr(settings, "password_hash_queue", 0)
+    password_pool.get_password_pool.cache_clear()
+    yield password_pool.get_password_pool()
+    password_pool.get_password_pool.cache_clear()
+
+
+def test_provisioned_bartender_can_log_in(client, owner_headers):
+    provisioned = client.post("/api/bartenders/provision", json={"name": "Jay Smith"}, headers=owner_headers).json()
+
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": provisioned["temporary_username"], "password": provisioned["temporary_password"]},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["must_change_credentials"] is True
+
+    resp = client.post("/api/auth/login", data={"username": provisioned["temporary_username"], "password": "wrong-password"})
+    assert resp.status_code == 401
+
+
+def test_saturated_pool_fails_fast_and_cheap_routes_stay_up(client, owner, owner_headers, tiny_pool, monkeypatch):
+    release = threading.Event()
+    real_hash = password_pool.hash_password
+
+    def slow_hash(password: str) -> str:
+        release.wait(timeout=10)
+        return real_hash(password)
+
+    monkeypatch.setattr(password_pool, "hash_password", slow_hash)
+
+    def create(email: str):
+        return client.post(
+            "/api/users/employees",
+            json={"email": email, "name": "Staff", "password": "correct-horse"},
+            headers=owner_headers,
+        )
+
+    first: dict = {}
+    worker = threading.Thread(target=lambda: first.setdefault("resp", create("first@example.com")))
+    worker.start()
+    deadline = time.monotonic() + 5
+    while tiny_pool.stats()["in_flight"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    rejected = create("second@example.com")
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert client.get(f"/api/spots?bar_id={owner.bar_id}", headers=owner_headers).status_code == 200
+
+    release.set()
+    worker.join(timeout=10)
+    assert first["resp"].status_code == 200
+    stats = client.get("/api/health/password-pool").json()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == stats["queued"] == 0
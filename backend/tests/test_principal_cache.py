@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.services.principals import principal_cache
+
+
+def _token_headers(client, username: str, password: str) -> dict:
+    token = client.post("/api/auth/login", data={"username": username, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeat_requests_skip_the_user_lookup(client, engine, owner, owner_headers):
+    user_queries = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    for _ in range(3):
+        assert client.get("/api/users", headers=owner_headers).status_code == 200
+
+    # One lookup to resolve the principal on the first request; the route's own
+    # users query runs every time.
+    assert len(user_queries) == 1 + 3
+    stats = client.get("/api/health/principal-cache").json()
+    assert (stats["misses"], stats["hits"]) == (1, 2)
+
+
+def test_user_changes_invalidate_the_cached_principal(client, owner_headers):
+    provisioned = client.post("/api/bartenders/provision", json={"name": "Sam"}, headers=owner_headers).json()
+    headers = _token_headers(client, provisioned["temporary_username"], provisioned["temporary_password"])
+    assert client.get("/api/auth/me", headers=headers).json()["must_change_credentials"] is True
+
+    resp = client.post("/api/auth/first-login", json={"login": "sam", "password": "new-password"}, headers=headers)
+    assert resp.status_code == 200
+    me = client.get("/api/auth/me", headers=headers).json()
+    assert (me["email"], me["must_change_credentials"]) == ("sam", False)
+
+    client.delete(f"/api/bartenders/{provisioned['bartender']['id']}", headers=owner_headers)
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_unknown_users_are_not_cached(client, owner):
+    token = create_access_token(subject="999", role="owner", bar_id=owner.bar_id)
+    for _ in range(2):
+        assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert principal_cache.stats()["entries"] == 0
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from app.api.read_cache import response_cache
+from app.api.routes import bartenders
+from app.main import app
+from app.models.user import User, UserRole
+
+
+# Statements each route may run per request once per-process caches are warm
+# (cached principal, loaded cohorts) and with the response cache cold. Raising
+# a budget should be a deliberate change reviewed together with the query it adds.
+QUERY_BUDGETS = {
+    "GET /api/shifts": 2,
+    "GET /api/shifts/{shift_id}": 1,
+    # Writes: the statements themselves, the rollup upserts and the data-version bump,
+    # plus re-reading the committed rows for the response.
+    "POST /api/shifts": 8,
+    "PATCH /api/shifts/{shift_id}": 9,
+    "DELETE /api/shifts/{shift_id}": 8,
+    "GET /api/leaderboard": 2,
+    # The rollups, then the range's shifts (ranked from the loaded cohorts);
+    # the range is capped, so the rows read stay bounded too.
+    "GET /api/leaderboard?percentiles=true": 2,
+    "GET /api/trends": 1,
+    "GET /api/reports/shifts": 1,
+    "GET /api/spots": 1,
+    "GET /api/bartenders": 1,
+    # One username probe however many candidates collide.
+    "POST /api/bartenders/provision": 5,
+    # Independent of how many shifts the bartender has.
+    "DELETE /api/bartenders/{bartender_id}": 9,
+    "GET /api/auth/me": 0,
+}
+
+
+def _request(client, query_log, exercised: set[str], method: str, url: str, **kwargs):
+    """Call a route and check it stayed within its budget; returns the response."""
+
+    # Variants first, so they win over their plain route.
+    route = next(key for key in sorted(QUERY_BUDGETS, key=lambda k: "?" not in k) if _matches(key, f"{method} {url}"))
+    exercised.add(route)
+    response_cache.clear()
+    with query_log.capture() as statements:
+        resp = client.request(method, url, **kwargs)
+    assert resp.status_code < 400, resp.text
+    budget = QUERY_BUDGETS[route]
+    assert len(statements) <= budget, f"{route} ran {len(statements)} statements (budget {budget}):\n" + "\n".join(statements)
+    return resp
+
+
+def _matches(template: str, url: str) -> bool:
+    # A template with a query string is a variant: the URL must carry those parameters.
+    template, _, variant = template.partition("?")
+    path, _, query = url.partition("?")
+    if variant and not set(variant.split("&")) <= set(query.split("&")):
+        return False
+    t_parts, r_parts = template.split("/"), path.split("/")
+    return len(t_parts) == len(r_parts) and all(t == r or t.startswith("{") for t, r in zip(t_parts, r_parts))
+
+
+def test_budgets_name_real_routes():
+    routes = {f"{method} {route.path}" for route in app.routes for method in getattr(route, "methods", ())}
+    assert {key.partition("?")[0] for key in QUERY_BUDGETS} <= routes
+
+
+def test_routes_stay_within_their_query_budgets(client, db, query_log, owner, owner_headers, spot_id, monkeypatch):
+    shift = {
+        "bar_id": owner.bar_id,
+        "spot_id": spot_id,
+        "bartender_name": "Jay",
+        "shift_date": "2024-05-03",
+        "personal_sales_volume": 800,
+        "total_bar_sales": 4000,
+        "personal_tips": 160,
+        "hours_worked": 6,
+    }
+    # Warm the principal cache, the spot's scorer and its cohorts.
+    first = client.post("/api/shifts", json=shift, headers=owner_headers).json()
+    client.get(f"/api/shifts/{first['id']}", headers=owner_headers)
+
+    exercised: set[str] = set()
+    call = lambda method, url, **kw: _request(client, query_log, exercised, method, url, headers=owner_headers, **kw)  # noqa: E731
+    created = call("POST", "/api/shifts", json={**shift, "shift_date": "2024-05-04"}).json()
+    call("GET", f"/api/shifts/{created['id']}")
+    call("GET", f"/api/shifts?bar_id={owner.bar_id}")
+    call("PATCH", f"/api/shifts/{created['id']}", json={"personal_tips": 200})
+    call("DELETE", f"/api/shifts/{created['id']}")
+    call("GET", "/api/leaderboard")
+    call("GET", "/api/leaderboard?start_date=2024-05-01&end_date=2024-05-31&percentiles=true")
+    call("GET", "/api/trends?bartender=Jay")
+    call("GET", "/api/reports/shifts?group_by=spot")
+    call("GET", f"/api/spots?bar_id={owner.bar_id}")
+    call("GET", f"/api/bartenders?bar_id={owner.bar_id}")
+    call("GET", "/api/auth/me")
+
+    # The first candidate usernames are taken.
+    suffixes = iter([0, 0, 0, 5] + [7] * 21)
+    monkeypatch.setattr(bartenders.secrets, "randbelow", lambda _: next(suffixes))
+    db.add(User(bar_id=owner.bar_id, email="tmp_jay100", name="Jay", role=UserRole.employee, password_hash="!", is_active=True))
+    db.commit()
+    for day in range(5, 15):
+        client.post("/api/shifts", json={**shift, "shift_date": f"2024-05-{day:02d}"}, headers=owner_headers)
+    provisioned = call("POST", "/api/bartenders/provision", json={"name": "Jay"}).json()
+    assert provisioned["temporary_username"] == "jay105"
+    deleted = call("DELETE", f"/api/bartenders/{provisioned['bartender']['id']}?clear_sales=true").json()
+    assert deleted["deleted_shifts"] == 11
+    assert exercised == set(QUERY_BUDGETS)
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import random
+import re
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.routes.leaderboard import PERCENTILE_MAX_DAYS
+from app.core.security import create_access_token
+from app.db.session import ReadSession, get_db, get_db_factory, get_read_db
+from app.main import app
+from app.models.bar import Bar
+from app.models.bartender import Bartender
+from app.models.base import Base
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot import Spot
+from app.models.spot_score_config import SpotScoreConfig
+from app.models.user import User, UserRole
+from app.services import leaderboard_rollup
+from app.services.scoring import compute_batch
+
+
+BARS = 3
+SPOTS_PER_BAR = 4
+BARTENDERS_PER_BAR = 25
+SHIFTS_PER_BAR = 8000
+
+# "SCAN shifts" is a full table scan; "SCAN shifts USING INDEX ..." and SEARCH are fine,
+# as is scanning an already-filtered subquery ("SCAN anon_1").
+FULL_SCAN = re.compile(r"^SCAN (?!anon_\d+$)(\w+)$")
+
+CAPS = {
+    "sales_volume_low": 200.0,
+    "sales_volume_high": 1200.0,
+    "pct_of_bar_sales_low": 0.05,
+    "pct_of_bar_sales_high": 0.40,
+    "tip_pct_low": 0.15,
+    "tip_pct_high": 0.30,
+    "sales_per_hour_low": 50.0,
+    "sales_per_hour_high": 250.0,
+}
+
+
+def _seed(engine) -> dict:
+    rng = random.Random(42)
+    ctx = {}
+    with engine.begin() as conn:
+        for b in range(BARS):
+            bar_id = conn.execute(insert(Bar).values(name=f"Bar {b}", timezone="UTC")).inserted_primary_key[0]
+            owner_id = conn.execute(
+                insert(User).values(
+                    bar_id=bar_id, email=f"owner{b}@example.com", name=f"Owner {b}", role=UserRole.owner, password_hash="!", is_active=True
+                )
+            ).inserted_primary_key[0]
+            employee_name = f"Bartender {b}-0"
+            employee_id = conn.execute(
+                insert(User).values(
+                    bar_id=bar_id, email=f"emp{b}@example.com", name=employee_name, role=UserRole.employee, password_hash="!", is_active=True
+                )
+            ).inserted_primary_key[0]
+
+            spot_ids = []
+            for s in range(SPOTS_PER_BAR):
+                spot_id = conn.execute(insert(Spot).values(bar_id=bar_id, name=f"Spot {s}")).inserted_primary_key[0]
+                conn.execute(insert(SpotScoreConfig).values(bar_id=bar_id, spot_id=spot_id, **CAPS))
+                spot_ids.append(spot_id)
+
+            names = [f"Bartender {b}-{i}" for i in range(BARTENDERS_PER_BAR)]
+            conn.execute(insert(Bartender), [{"bar_id": bar_id, "name": n, "is_active": True} for n in names])
+
+            start = date.today() - timedelta(days=1000)
+            rows = []
+            for i in range(SHIFTS_PER_BAR):
+                sales = rng.uniform(100, 2500)
+                total = rng.uniform(3000, 15000)
+                tips = rng.uniform(0, 0.35) * sales
+                hours = rng.uniform(3, 10)
+                rows.append(
+                    {
+                        "bar_id": bar_id,
+                        "spot_id": rng.choice(spot_ids),
+                        "bartender_name": rng.choice(names),
+                        "shift_date": start + timedelta(days=rng.randrange(0, 1000)),
+                        "personal_sales_volume": sales,
+                        "total_bar_sales": total,
+                        "personal_tips": tips,
+                        "hours_worked": hours,
+                        "pct_of_bar_sales": sales / total,
+                        "tip_pct": tips / sales,
+                        "sales_per_hour": sales / hours,
+                    }
+                )
+            conn.execute(insert(Shift), rows)
+            shift_ids = [r.id for r in conn.execute(Shift.__table__.select().where(Shift.bar_id == bar_id)).all()]
+            batch = compute_batch(
+                [r["personal_sales_volume"] for r in rows],
+                [r["total_bar_sales"] for r in rows],
+                [r["personal_tips"] for r in rows],
+                [r["hours_worked"] for r in rows],
+                CAPS,
+            )
+            conn.execute(
+                insert(ScoreResult),
+                [
+                    {"shift_id": sid, "score_total": total, "score_version": "v1", "breakdown_json": {}}
+                    for sid, total in zip(shift_ids, batch.score_total.tolist())
+                ],
+            )
+            if b == 0:
+                ctx.update(bar_id=bar_id, owner_id=owner_id, employee_id=employee_id, spot_ids=spot_ids, shift_ids=shift_ids)
+
+    with sessionmaker(bind=engine)() as db:
+        leaderboard_rollup.rebuild(db)
+        db.commit()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return ctx
+
+
+@pytest.fixture(scope="module")
+def plan_env():
+    engine = create_engine("sqlite+pysqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ctx = _seed(engine)
+
+    session_maker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = session_maker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    statements: list[tuple[str, object]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    def _get_read_db():
+        # EXPLAIN needs the statements from the captured sync engine.
+        db = session_maker(expire_on_commit=False)
+        try:
+            yield ReadSession(db)
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_read_db
+    app.dependency_overrides[get_db_factory] = lambda: session_maker
+    try:
+        yield engine, ctx, statements, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+def _shift_page_filters(ctx: dict) -> list[dict]:
+    return [
+        {"bartender": "Bartender 0-5"},
+        {"spot_id": ctx["spot_ids"][1]},
+        {"start_date": date.today() - timedelta(days=300), "end_date": date.today() - timedelta(days=100)},
+    ]
+
+
+def _headers(user_id: int, role: UserRole, bar_id: int) -> dict:
+    token = create_access_token(subject=str(user_id), role=role.value, bar_id=bar_id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _full_scans(engine, statements) -> list[str]:
+    problems = []
+    seen = set()
+    with engine.connect() as conn:
+        for statement, params in statements:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+            for row in plan:
+                detail = row[-1]
+                if FULL_SCAN.match(detail):
+                    problems.append(f"{detail}\n    in: {' '.join(statement.split())}")
+    return problems
+
+
+def _exercise_routes(client: TestClient, ctx: dict) -> None:
+    bar_id = ctx["bar_id"]
+    spot_id = ctx["spot_ids"][0]
+    owner = _headers(ctx["owner_id"], UserRole.owner, bar_id)
+    employee = _headers(ctx["employee_id"], UserRole.employee, bar_id)
+
+    def ok(resp):
+        assert resp.status_code < 400, resp.text
+        return resp.json()
+
+    # leaderboard
+    ok(client.get("/api/leaderboard", headers=owner))
+    params = {"start_date": date.today() - timedelta(days=400), "end_date": date.today() - timedelta(days=200), "limit": 50}
+    ok(client.get("/api/leaderboard", params=params, headers=employee))
+    quarter = {"start_date": date.today() - timedelta(days=300), "end_date": date.today() - timedelta(days=209)}
+    ok(client.get("/api/leaderboard", params={**quarter, "limit": 50, "percentiles": True}, headers=owner))
+
+    # trends
+    ok(client.get("/api/trends", params={"bartender": "Bartender 0-4", "bucket": "month"}, headers=owner))
+    ok(client.get("/api/trends", params={"start_date": date.today() - timedelta(days=200)}, headers=employee))
+
+    # reports
+    ok(client.get("/api/reports/shifts", params={"group_by": ["spot", "weekday"]}, headers=owner))
+    params = {"group_by": ["bartender", "month"], "start_date": date.today() - timedelta(days=365)}
+    ok(client.get("/api/reports/shifts", params=params, headers=owner))
+
+    # shifts
+    ok(client.get(f"/api/shifts?bar_id={bar_id}&limit=200", headers=owner))
+    ok(client.get(f"/api/shifts?bar_id={bar_id}", headers=employee))
+    for filters in _shift_page_filters(ctx):
+        ok(client.get("/api/shifts", params={"bar_id": bar_id, "cursor": f"{date.today() - timedelta(days=150)}_{ctx['shift_ids'][-100]}", **filters}, headers=owner))
+    ok(client.get(f"/api/shifts/{ctx['shift_ids'][10]}", headers=owner))
+    export = client.get("/api/shifts/export", params={"bar_id": bar_id, "start_date": date.today() - timedelta(days=90)}, headers=owner)
+    assert export.status_code == 200, export.text
+    created = ok(
+        client.post(
+            "/api/shifts",
+            json={
+                "bar_id": bar_id,
+                "spot_id": spot_id,
+                "bartender_name": "Bartender 0-1",
+                "shift_date": "2024-02-02",
+                "personal_sales_volume": 700.0,
+                "total_bar_sales": 6000.0,
+                "personal_tips": 120.0,
+                "hours_worked": 6.0,
+            },
+            headers=owner,
+        )
+    )
+    ok(client.patch(f"/api/shifts/{created['id']}", json={"personal_tips": 150.0, "shift_date": "2024-02-03"}, headers=owner))
+    ok(client.delete(f"/api/shifts/{created['id']}", headers=owner))
+    csv_body = (
+        "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked\n"
+        f"{spot_id},Bartender 0-2,2024-02-04,650,6100,90,5\n"
+    )
+    ok(client.post("/api/shifts/import", files={"file": ("x.csv", csv_body.encode(), "text/csv")}, headers=owner))
+    ok(client.post("/api/rescore-jobs", json={"spot_id": spot_id}, headers=owner))
+
+    # spots
+    ok(client.get(f"/api/spots?bar_id={bar_id}", headers=employee))
+    new_spot = ok(client.post("/api/spots", json={"bar_id": bar_id, "name": "Rooftop"}, headers=owner))
+    ok(client.get(f"/api/spots/{spot_id}/score-config", headers=owner))
+    ok(client.patch(f"/api/spots/{spot_id}/score-config", json={"cap_mode": "auto"}, headers=owner))
+    ok(client.post(f"/api/spots/{spot_id}/score-config/recompute", headers=owner))
+    ok(client.delete(f"/api/spots/{new_spot['id']}", headers=owner))
+
+    # bartenders
+    ok(client.get(f"/api/bartenders?bar_id={bar_id}", headers=owner))
+    created_bt = ok(client.post("/api/bartenders", json={"bar_id": bar_id, "name": "Temp"}, headers=owner))
+    ok(client.patch(f"/api/bartenders/{created_bt['id']}", json={"is_active": False}, headers=owner))
+    ok(client.delete(f"/api/bartenders/{created_bt['id']}", headers=owner))
+    bartenders = ok(client.get(f"/api/bartenders?bar_id={bar_id}", headers=owner))
+    victim = next(b for b in bartenders if b["name"] == "Bartender 0-3")
+    ok(client.delete(f"/api/bartenders/{victim['id']}?clear_sales=true", headers=owner))
+
+
+def test_hot_routes_never_full_scan(plan_env):
+    engine, ctx, statements, client = plan_env
+    _exercise_routes(client, ctx)
+
+    assert statements, "no queries were captured"
+    problems = _full_scans(engine, statements)
+    assert not problems, "full table scans:\n" + "\n".join(problems)
+
+
+def test_shift_pages_walk_an_index_without_sorting(plan_env):
+    engine, ctx, statements, client = plan_env
+    owner = _headers(ctx["owner_id"], UserRole.owner, ctx["bar_id"])
+
+    for filters in [{}, *_shift_page_filters(ctx)]:
+        statements.clear()
+        resp = client.get("/api/shifts", params={"bar_id": ctx["bar_id"], "cursor": f"{date.today() - timedelta(days=150)}_{ctx['shift_ids'][-100]}", **filters}, headers=owner)
+        assert resp.status_code == 200, resp.text
+        statement, params = next((st, p) for st, p in statements if "FROM shifts" in st)
+        with engine.connect() as conn:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()]
+        assert not any("TEMP B-TREE" in detail for detail in plan), (filters, plan)
+
+
+def test_leaderboard_percentiles_read_only_the_range(plan_env):
+    # ~8 shifts a day per bar: the widest allowed range is ~740 shifts, found
+    # through the bartender/date index however long the bar's history is.
+    engine, ctx, statements, client = plan_env
+    owner = _headers(ctx["owner_id"], UserRole.owner, ctx["bar_id"])
+    quarter = {"start_date": date.today() - timedelta(days=300), "end_date": date.today() - timedelta(days=209)}
+
+    statements.clear()
+    resp = client.get("/api/leaderboard", params={**quarter, "limit": 100, "percentiles": True}, headers=owner)
+    assert resp.status_code == 200, resp.text
+    statement, params = next((st, p) for st, p in statements if "FROM shifts" in st)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(statement, params).all()
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()]
+    assert len(rows) < 1.5 * PERCENTILE_MAX_DAYS * SHIFTS_PER_BAR / 1000
+    assert any(detail.startswith("SEARCH shifts") and "shift_date" in detail for detail in plan), plan
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from sqlalchemy import event, update
+
+from app.models.bar_data_version import BarDataVersion
+from app.services.data_versions import data_versions
+
+
+def _count_queries(*engines) -> list[str]:
+    statements: list[str] = []
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_unchanged_polls_get_304_without_queries(client, engine, async_session_maker, owner, owner_headers):
+    url = f"/api/spots?bar_id={owner.bar_id}"
+    first = client.get(url, headers=owner_headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    statements = _count_queries(engine, async_session_maker.kw["bind"].sync_engine)
+    again = client.get(url, headers={**owner_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert statements == []
+
+    # Without a validator the cached body is served, byte for byte.
+    cached = client.get(url, headers=owner_headers)
+    assert cached.content == first.content
+    assert statements == []
+
+    client.post("/api/spots", json={"bar_id": owner.bar_id, "name": "Patio"}, headers=owner_headers)
+    changed = client.get(url, headers={**owner_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [s["name"] for s in changed.json()] == ["Main Well", "Patio"]
+
+    stats = client.get("/api/health/response-cache").json()
+    assert (stats["not_modified"], stats["hits"]) == (1, 1)
+
+
+def test_bulk_writes_and_other_processes_change_the_version(client, db, owner, owner_headers, spot_id, monkeypatch):
+    url = f"/api/shifts?bar_id={owner.bar_id}&limit=1"
+    body = "\n".join(
+        [
+            "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked",
+            f"{spot_id},Jay,2024-05-03,800,4000,160,6",
+            f"{spot_id},Alex,2024-05-04,500,4000,90,5",
+        ]
+    )
+    empty = client.get(url, headers=owner_headers)
+    client.post("/api/shifts/import", files={"file": ("s.csv", body.encode(), "text/csv")}, headers=owner_headers)
+
+    page = client.get(url, headers={**owner_headers, "If-None-Match": empty.headers["ETag"]})
+    assert page.status_code == 200
+    assert page.headers["X-Next-Cursor"]
+    assert client.get(url, headers=owner_headers).headers["X-Next-Cursor"] == page.headers["X-Next-Cursor"]
+
+    # A write committed by another process is noticed once the local version expires.
+    db.execute(update(BarDataVersion).where(BarDataVersion.bar_id == owner.bar_id).values(version=BarDataVersion.version + 1))
+    db.commit()
+    monkeypatch.setattr(data_versions, "refresh_seconds", 0.0)
+    refreshed = client.get(url, headers={**owner_headers, "If-None-Match": page.headers["ETag"]})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != page.headers["ETag"]
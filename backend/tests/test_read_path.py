@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import ReadSession
+
+
+def test_read_routes_agree_in_async_and_sync_modes(client, owner, owner_headers, spot_id, monkeypatch):
+    body = "\n".join(
+        [
+            "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked",
+            f"{spot_id},Jay,2024-05-03,800,4000,160,6",
+            f"{spot_id},Alex,2024-05-04,500,4000,90,5",
+        ]
+    )
+    client.post("/api/shifts/import", files={"file": ("s.csv", body.encode(), "text/csv")}, headers=owner_headers)
+    client.post("/api/bartenders", json={"bar_id": owner.bar_id, "name": "Jay"}, headers=owner_headers)
+
+    bar = owner.bar_id
+    urls = ["/api/auth/me", f"/api/shifts?bar_id={bar}", "/api/leaderboard", f"/api/spots?bar_id={bar}", f"/api/bartenders?bar_id={bar}"]
+    shift_id = client.get(f"/api/shifts?bar_id={bar}", headers=owner_headers).json()[0]["id"]
+    urls.append(f"/api/shifts/{shift_id}")
+
+    sessions = []
+    real_run = ReadSession.run
+
+    async def spy(self, fn, *args):
+        sessions.append(type(self.session))
+        return await real_run(self, fn, *args)
+
+    monkeypatch.setattr(ReadSession, "run", spy)
+
+    def fetch_all():
+        out = []
+        for url in urls:
+            resp = client.get(url, headers=owner_headers)
+            assert resp.status_code == 200, (url, resp.text)
+            out.append(resp.json())
+        return out
+
+    async_results = fetch_all()
+    assert set(sessions) == {AsyncSession}
+
+    sessions.clear()
+    monkeypatch.setattr(get_settings(), "async_db", False)
+    assert fetch_all() == async_results
+    assert AsyncSession not in sessions
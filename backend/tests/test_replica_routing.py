@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.read_cache import response_cache
+from app.core.config import get_settings
+from app.core.security import create_access_token
+from app.db.routing import primary_pins
+from app.db.session import get_db, get_read_db, open_read_session
+from app.main import app
+from app.models.spot import Spot
+from app.models.user import User, UserRole
+from app.services.data_versions import data_versions
+
+
+@pytest.fixture()
+def replica_client(tmp_path, db_path, owner, session_maker, async_session_maker):
+    # A copy of the primary taken now stands in for a replica; nothing replicates
+    # to it afterwards, so reads served from it are easy to tell apart.
+    replica_path = tmp_path / "replica.db"
+    shutil.copyfile(db_path, replica_path)
+    replica = create_engine(f"sqlite+pysqlite:///{replica_path}", connect_args={"check_same_thread": False})
+    with replica.begin() as conn:
+        conn.execute(update(Spot).values(name="Replica Well"))
+    async_replica = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+    sync_replicas = (sessionmaker(autocommit=False, autoflush=False, bind=replica),)
+    async_replicas = (async_sessionmaker(autoflush=False, bind=async_replica),)
+    # The owner fixture's commit pinned the bar to the primary.
+    primary_pins.clear()
+
+    def _get_db():
+        session = session_maker()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def _get_read_db():
+        async for session in open_read_session(async_session_maker, session_maker, async_replicas, sync_replicas):
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_read_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        replica.dispose()
+
+
+def _spot_names(client, owner, headers) -> list[str]:
+    resp = client.get(f"/api/spots?bar_id={owner.bar_id}", headers=headers)
+    assert resp.status_code == 200
+    return [s["name"] for s in resp.json()]
+
+
+@pytest.mark.parametrize("async_db", [True, False])
+def test_reads_use_replica_until_the_bar_is_written(monkeypatch, replica_client, owner, owner_headers, async_db):
+    monkeypatch.setattr(get_settings(), "async_db", async_db)
+
+    assert _spot_names(replica_client, owner, owner_headers) == ["Replica Well"]
+
+    resp = replica_client.post("/api/spots", json={"bar_id": owner.bar_id, "name": "Patio"}, headers=owner_headers)
+    assert resp.status_code == 200
+    # The write pinned the bar: this client reads its own write from the primary.
+    assert _spot_names(replica_client, owner, owner_headers) == ["Main Well", "Patio"]
+
+    # Once the pin lapses (and the cached response with it), the replica serves again.
+    primary_pins.clear()
+    response_cache.clear()
+    data_versions.forget()
+    assert _spot_names(replica_client, owner, owner_headers) == ["Replica Well"]
+
+
+def test_user_lookup_stays_on_primary(replica_client, db, owner):
+    # A user the replica has not seen yet still authenticates.
+    user = User(bar_id=owner.bar_id, email="new@example.com", name="New", role=UserRole.owner, password_hash="!", is_active=True)
+    db.add(user)
+    db.commit()
+    primary_pins.clear()
+
+    token = create_access_token(subject=str(user.id), role=user.role.value, bar_id=user.bar_id)
+    assert _spot_names(replica_client, owner, {"Authorization": f"Bearer {token}"}) == ["Replica Well"]
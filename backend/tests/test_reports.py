@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+
+
+def test_spot_by_weekday_cube_matches_the_shift_rows(client, owner, owner_headers, spot_id):
+    patio = client.post("/api/spots", json={"bar_id": owner.bar_id, "name": "Patio"}, headers=owner_headers).json()["id"]
+    header = "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked"
+    start = date(2024, 1, 1)
+    rows = [
+        f"{(spot_id, patio)[i % 2]},{('Jay', 'Alex', 'Sam')[i % 3]},{start + timedelta(days=i)},{300 + 41 * i % 900},4000,{30 + 17 * i % 150},{4 + i % 5}"
+        for i in range(90)
+    ]
+    client.post("/api/shifts/import", files={"file": ("s.csv", "\n".join([header, *rows]).encode(), "text/csv")}, headers=owner_headers)
+    shifts = client.get("/api/shifts", params={"bar_id": owner.bar_id, "limit": 200}, headers=owner_headers).json()
+
+    params = {"group_by": ["spot", "weekday"], "start_date": "2024-02-01"}
+    report = client.get("/api/reports/shifts", params=params, headers=owner_headers).json()
+
+    cells = defaultdict(list)
+    for s in shifts:
+        if s["shift_date"] >= "2024-02-01":
+            cells[(s["spot_id"], date.fromisoformat(s["shift_date"]).weekday())].append(s)
+    assert report["group_by"] == ["spot", "weekday"]
+    assert [(r["spot_id"], r["weekday"]) for r in report["rows"]] == sorted(cells)
+    for r in report["rows"]:
+        cell = cells[(r["spot_id"], r["weekday"])]
+        assert r["shifts_count"] == len(cell)
+        assert r["avg_score"] == pytest.approx(sum(s["score_total"] for s in cell) / len(cell))
+        assert r["avg_tip_pct"] == pytest.approx(sum(s["tip_pct"] for s in cell) / len(cell))
+        assert r["bartender_name"] is None and r["month"] is None
+
+    monthly = client.get("/api/reports/shifts", params={"group_by": ["month", "bartender"]}, headers=owner_headers).json()
+    assert {r["month"] for r in monthly["rows"]} == {"2024-01-01", "2024-02-01", "2024-03-01"}
+    assert sum(r["shifts_count"] for r in monthly["rows"]) == 90
+
+    total = client.get("/api/reports/shifts", headers=owner_headers).json()["rows"]
+    assert [r["shifts_count"] for r in total] == [90]
+    empty = client.get("/api/reports/shifts", params={"start_date": "2030-01-01"}, headers=owner_headers).json()
+    assert empty["rows"] == []
+
+
+def test_reports_are_owner_only(client, db, owner):
+    employee = User(bar_id=owner.bar_id, email="jay@example.com", name="Jay", role=UserRole.employee, password_hash="!", is_active=True)
+    db.add(employee)
+    db.commit()
+    token = create_access_token(subject=str(employee.id), role=employee.role.value, bar_id=owner.bar_id)
+    resp = client.get("/api/reports/shifts", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 403
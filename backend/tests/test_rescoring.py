@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from app.models.leaderboard_rollup import LeaderboardRollup
+from app.models.report_rollup import ReportRollup
+from app.models.rescore_job import RescoreJob, RescoreJobStatus
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotScoreConfig
+from app.schemas.shifts import ShiftCreateIn
+from app.services import leaderboard_rollup, rescoring
+from app.services.scoring import compute_shift
+
+
+def _seed_shifts(client, owner, owner_headers, spot_id, n):
+    for i in range(n):
+        client.post(
+            "/api/shifts",
+            json={
+                "bar_id": owner.bar_id,
+                "spot_id": spot_id,
+                "bartender_name": f"B{i % 3}",
+                "shift_date": date(2024, 3, 1 + i % 28).isoformat(),
+                "personal_sales_volume": 250.0 + 37 * i,
+                "total_bar_sales": 6000.0,
+                "personal_tips": 30.0 + 11 * i,
+                "hours_worked": 5.5,
+            },
+            headers=owner_headers,
+        )
+
+
+def _assert_scores_match_config(db):
+    for shift, score in db.query(Shift, ScoreResult).join(ScoreResult, ScoreResult.shift_id == Shift.id).all():
+        cfg = db.query(SpotScoreConfig).filter(SpotScoreConfig.spot_id == shift.spot_id).one()
+        payload = ShiftCreateIn.model_validate(shift, from_attributes=True)
+        _, expected = compute_shift(payload, cfg)
+        assert score.score_total == expected.score_total
+        assert score.breakdown_json == expected.breakdown
+
+
+def test_rescore_job_endpoint_applies_new_caps(client, db, owner, owner_headers, spot_id):
+    _seed_shifts(client, owner, owner_headers, spot_id, 12)
+    client.patch(
+        f"/api/spots/{spot_id}/score-config",
+        json={"sales_volume_low": 400.0, "sales_volume_high": 700.0},
+        headers=owner_headers,
+    )
+
+    resp = client.post("/api/rescore-jobs", json={"spot_id": spot_id}, headers=owner_headers)
+    assert resp.status_code == 200
+    job = client.get(f"/api/rescore-jobs/{resp.json()['id']}", headers=owner_headers).json()
+    assert job["status"] == "completed"
+    assert job["processed"] == job["total"] == 12
+
+    db.expire_all()
+    _assert_scores_match_config(db)
+
+
+def test_interrupted_job_resumes_from_checkpoint(client, db, owner, owner_headers, spot_id, monkeypatch):
+    _seed_shifts(client, owner, owner_headers, spot_id, 10)
+    db.query(SpotScoreConfig).update({"tip_pct_low": 0.05, "tip_pct_high": 0.5})
+    db.commit()
+
+    job = rescoring.start_job(db, owner.bar_id)
+    real_write = rescoring._write_chunk
+    calls = []
+
+    def flaky_write(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("worker killed")
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(rescoring, "_write_chunk", flaky_write)
+    with pytest.raises(RuntimeError):
+        rescoring.run_job(db, job.id, chunk_size=3)
+
+    db.refresh(job)
+    assert job.status == RescoreJobStatus.failed
+    assert job.processed == 6
+    checkpoint = job.last_shift_id
+
+    monkeypatch.setattr(rescoring, "_write_chunk", real_write)
+    resumed = rescoring.run_job(db, job.id, chunk_size=3, workers=2)
+    assert resumed.status == RescoreJobStatus.completed
+    assert resumed.processed == 10
+    assert resumed.last_shift_id > checkpoint
+
+    _assert_scores_match_config(db)
+    assert db.query(RescoreJob).count() == 1
+
+
+def _rollups(db):
+    db.expire_all()
+    leaderboard = sorted((r.bartender_name, r.shift_date, round(r.score_sum, 9), r.shifts_count) for r in db.query(LeaderboardRollup))
+    report = sorted((r.spot_id, r.bartender_name, r.shift_date, round(r.score_sum, 9), r.shifts_count) for r in db.query(ReportRollup))
+    return leaderboard, report
+
+
+def test_concurrent_resumes_run_the_job_once(client, db, session_maker, owner, owner_headers, spot_id):
+    _seed_shifts(client, owner, owner_headers, spot_id, 12)
+    db.query(SpotScoreConfig).update({"tip_pct_low": 0.05, "tip_pct_high": 0.5})
+    job = rescoring.start_job(db, owner.bar_id)
+    job.status = RescoreJobStatus.failed
+    db.commit()
+
+    # Two resumes land at once; only one may claim the job.
+    barrier = threading.Barrier(2)
+    claimed = []
+
+    def resume():
+        session = session_maker()
+        try:
+            barrier.wait()
+            claimed.append(rescoring.claim_job(session, job.id))
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=resume) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == [False, True]
+
+    # The claimed job is now running; another run_job (or API resume) leaves it alone.
+    assert rescoring.run_job(db, job.id, chunk_size=5).processed == 0
+    resp = client.post(f"/api/rescore-jobs/{job.id}/resume", json={}, headers=owner_headers)
+    assert resp.status_code == 409
+
+    # Until its checkpoint goes stale.
+    db.query(RescoreJob).update({"updated_at": datetime.utcnow() - rescoring.RESCORE_STALE_AFTER * 2})
+    db.commit()
+    resp = client.post(f"/api/rescore-jobs/{job.id}/resume", json={}, headers=owner_headers)
+    assert resp.status_code == 200
+    assert client.post(f"/api/rescore-jobs/{job.id}/resume", json={}, headers=owner_headers).status_code == 400
+
+    _assert_scores_match_config(db)
+    incremental = _rollups(db)
+    leaderboard_rollup.rebuild(db, owner.bar_id)
+    db.commit()
+    assert _rollups(db) == incremental
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.shifts import ShiftCreateIn
+from app.services.scoring import CAP_FIELDS, build_scorer, cap_columns, compute_batch, compute_shift
+
+
+# The non-cap SpotScoreConfig attributes build_scorer reads.
+FORMULA = {
+    "id": 1,
+    "bar_id": 1,
+    "spot_id": 1,
+    "cap_mode": "manual",
+    "computed_at": None,
+    "score_version": "v1",
+    "sales_volume_weight": None,
+    "pct_of_bar_sales_weight": None,
+    "tip_pct_weight": None,
+    "sales_per_hour_weight": None,
+}
+
+
+def _cfg(**overrides):
+    caps = {
+        "sales_volume_low": 200.0,
+        "sales_volume_high": 1200.0,
+        "pct_of_bar_sales_low": 0.05,
+        "pct_of_bar_sales_high": 0.40,
+        "tip_pct_low": 0.15,
+        "tip_pct_high": 0.30,
+        "sales_per_hour_low": 50.0,
+        "sales_per_hour_high": 250.0,
+    }
+    caps.update(overrides)
+    return SimpleNamespace(**{**FORMULA, **caps})
+
+
+def test_compute_batch_matches_compute_shift_exactly():
+    rng = random.Random(7)
+    configs = {
+        1: _cfg(),
+        2: _cfg(tip_pct_low=0.2, tip_pct_high=0.2),  # degenerate caps score 0
+        3: _cfg(sales_volume_low=500.0, sales_volume_high=100.0),
+        4: _cfg(score_version="v2", pct_of_bar_sales_weight=0.0, tip_pct_weight=40.0),
+    }
+    payloads = []
+    for i in range(2000):
+        payloads.append(
+            ShiftCreateIn(
+                bar_id=1,
+                spot_id=rng.choice([1, 2, 3, 4]),
+                bartender_name=f"B{i % 7}",
+                shift_date=date(2024, 1, 1),
+                personal_sales_volume=0.0 if i % 50 == 0 else rng.uniform(0, 3000),
+                total_bar_sales=rng.uniform(100, 20000),
+                personal_tips=rng.uniform(0, 800),
+                hours_worked=rng.uniform(0.5, 12),
+            )
+        )
+
+    batch = compute_batch(
+        [p.personal_sales_volume for p in payloads],
+        [p.total_bar_sales for p in payloads],
+        [p.personal_tips for p in payloads],
+        [p.hours_worked for p in payloads],
+        cap_columns(configs, [p.spot_id for p in payloads]),
+    )
+
+    breakdowns = batch.breakdowns()
+    for i, payload in enumerate(payloads):
+        shift, score = compute_shift(payload, configs[payload.spot_id])
+        assert batch.score_total[i] == score.score_total
+        assert batch.score_versions[i] == score.score_version
+        assert breakdowns[i] == score.breakdown
+        assert batch.values["tip_pct"][i] == shift.tip_pct
+        assert batch.values["pct_of_bar_sales"][i] == shift.pct_of_bar_sales
+        assert batch.values["sales_per_hour"][i] == shift.sales_per_hour
+
+
+def test_compute_batch_accepts_scalar_caps():
+    cfg = _cfg()
+    batch = compute_batch([0.0, 700.0], [1000.0, 1000.0], [50.0, 140.0], [5.0, 5.0], {f: getattr(cfg, f) for f in CAP_FIELDS})
+    assert batch.values["tip_pct"].tolist() == [0.0, 0.2]
+    assert batch.score_total[0] == 0.0
+
+
+def test_v2_scales_weights_to_100_points():
+    assert build_scorer(_cfg()).points == (20.0, 50.0, 10.0, 20.0)
+    # v1 ignores weights; v2 scales them, with unset ones at their v1 points.
+    assert build_scorer(_cfg(tip_pct_weight=5.0)).points == (20.0, 50.0, 10.0, 20.0)
+    assert build_scorer(_cfg(score_version="v2", sales_volume_weight=1.0, pct_of_bar_sales_weight=1.0, tip_pct_weight=1.0, sales_per_hour_weight=1.0)).points == (25.0, 25.0, 25.0, 25.0)
+    assert build_scorer(_cfg(score_version="v2", pct_of_bar_sales_weight=0.0)).points == (40.0, 0.0, 20.0, 40.0)
+
+    with pytest.raises(ValueError):
+        build_scorer(_cfg(score_version="v2", sales_volume_weight=0.0, pct_of_bar_sales_weight=0.0, tip_pct_weight=0.0, sales_per_hour_weight=0.0))
+    with pytest.raises(ValueError):
+        build_scorer(_cfg(score_version="v9"))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import csv
+import io
+
+import pytest
+
+from app.services import shift_export
+
+
+def _import(client, headers, spot_id, count):
+    header = "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked"
+    rows = [f"{spot_id},Bartender {i % 7},2024-{1 + i % 12:02d}-{1 + i % 28:02d},{500 + i},4000,{80 + i % 50},6" for i in range(count)]
+    resp = client.post("/api/shifts/import", files={"file": ("s.csv", "\n".join([header, *rows]).encode(), "text/csv")}, headers=headers)
+    assert resp.json()["inserted"] == count
+
+
+def test_csv_export_streams_every_shift_in_chunks(client, owner, owner_headers, spot_id, monkeypatch):
+    monkeypatch.setattr(shift_export, "EXPORT_CHUNK_SIZE", 10)
+    _import(client, owner_headers, spot_id, 45)
+
+    with client.stream("GET", "/api/shifts/export", params={"bar_id": owner.bar_id}, headers=owner_headers) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        parts = list(resp.iter_raw())
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(parts).decode())))
+    assert len(rows) == 45
+    assert list(rows[0]) == shift_export.EXPORT_HEADER
+    keys = [(r["shift_date"], int(r["id"])) for r in rows]
+    assert keys == sorted(keys)
+    assert all(r["score_total"] and r["transactions_count"] == "" for r in rows)
+
+    june = client.get("/api/shifts/export", params={"bar_id": owner.bar_id, "start_date": "2024-06-01", "end_date": "2024-06-30"}, headers=owner_headers)
+    assert {r["shift_date"][:7] for r in csv.DictReader(io.StringIO(june.text))} == {"2024-06"}
+    assert client.get("/api/shifts/export", params={"bar_id": owner.bar_id + 1}, headers=owner_headers).status_code == 403
+
+
+def test_parquet_export_writes_a_row_group_per_chunk(client, owner, owner_headers, spot_id, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(shift_export, "EXPORT_CHUNK_SIZE", 10)
+    _import(client, owner_headers, spot_id, 25)
+
+    resp = client.get("/api/shifts/export", params={"bar_id": owner.bar_id, "format": "parquet"}, headers=owner_headers)
+    assert resp.status_code == 200
+    parquet = pq.ParquetFile(io.BytesIO(resp.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == shift_export.EXPORT_HEADER
+    assert table.num_rows == 25
+    assert None not in table.column("score_total").to_pylist()
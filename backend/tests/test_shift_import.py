@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import csv
+import json
+
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+
+
+def test_import_csv_reports_bad_rows_and_keeps_good_ones(client, db, owner_headers, spot_id):
+    body = "\n".join(
+        [
+            "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked,transactions_count",
+            f"{spot_id},Jay,2024-05-03,800,4000,160,6,",
+            f"{spot_id},Alex,2024-05-03,0,4000,0,6,12",
+            f"{spot_id},Sam,2024-05-03,500,0,50,6,",
+            f"999,Sam,2024-05-04,500,2000,50,6,",
+        ]
+    )
+    resp = client.post(
+        "/api/shifts/import",
+        files={"file": ("week.csv", body.encode(), "text/csv")},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200
+    out = resp.json()
+    assert out["inserted"] == 2
+    assert out["failed"] == 2
+    assert [e["line"] for e in out["errors"]] == [4, 5]
+    assert "total_bar_sales" in out["errors"][0]["detail"]
+
+    assert db.query(Shift).count() == 2
+    assert db.query(ScoreResult).count() == 2
+    zero_sales = db.query(Shift).filter(Shift.bartender_name == "Alex").one()
+    assert zero_sales.tip_pct == 0.0
+
+
+def test_import_ndjson_matches_single_create(client, db, owner, owner_headers, spot_id):
+    row = {
+        "bar_id": owner.bar_id,
+        "spot_id": spot_id,
+        "bartender_name": "Jay",
+        "shift_date": "2024-05-03",
+        "personal_sales_volume": 800,
+        "total_bar_sales": 4000,
+        "personal_tips": 160,
+        "hours_worked": 6,
+    }
+    single = client.post("/api/shifts", json=row, headers=owner_headers).json()
+
+    lines = [json.dumps(row), "", "not json", json.dumps({**row, "bar_id": owner.bar_id + 1})]
+    resp = client.post(
+        "/api/shifts/import?format=ndjson",
+        files={"file": ("week.txt", "\n".join(lines).encode(), "application/octet-stream")},
+        headers=owner_headers,
+    )
+    out = resp.json()
+    assert out["inserted"] == 1
+    assert [(e["line"], e["detail"]) for e in out["errors"]] == [(3, "Invalid JSON"), (4, "Not allowed")]
+
+    scores = db.query(ScoreResult).order_by(ScoreResult.id.asc()).all()
+    assert scores[0].score_total == scores[1].score_total == single["score_total"]
+    assert scores[0].breakdown_json == scores[1].breakdown_json
+
+
+def test_import_stops_at_a_line_that_is_not_utf8(client, db, owner_headers, spot_id):
+    body = "\n".join(
+        [
+            "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked",
+            f"{spot_id},Jay,2024-05-03,800,4000,160,6",
+            f"{spot_id},José,2024-05-03,700,4000,140,6",
+            f"{spot_id},Sam,2024-05-04,500,2000,50,6",
+        ]
+    )
+    resp = client.post(
+        "/api/shifts/import",
+        files={"file": ("week.csv", body.encode("latin-1"), "text/csv")},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200
+    out = resp.json()
+    assert out["inserted"] == 1
+    assert [e["line"] for e in out["errors"]] == [3]
+    assert "UTF-8" in out["errors"][0]["detail"]
+    assert db.query(Shift).count() == 1
+
+
+def test_import_reports_malformed_csv_with_its_line(client, owner_headers, spot_id):
+    body = "\n".join(
+        [
+            "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked",
+            f"{spot_id},Jay,2024-05-03,800,4000,160,6",
+            # Longer than csv.field_size_limit().
+            f"{spot_id},{'x' * (csv.field_size_limit() + 1)},2024-05-03,700,4000,140,6",
+        ]
+    )
+    resp = client.post(
+        "/api/shifts/import",
+        files={"file": ("week.csv", body.encode(), "text/csv")},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200
+    out = resp.json()
+    assert out["inserted"] == 1
+    assert [e["line"] for e in out["errors"]] == [3]
+    assert out["errors"][0]["detail"].startswith("Malformed CSV")
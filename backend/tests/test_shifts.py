@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+
+
+def _import(client, headers, spot_id, rows):
+    header = "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked"
+    body = "\n".join([header, *(f"{spot_id},{name},{day},800,4000,160,6" for name, day in rows)])
+    resp = client.post("/api/shifts/import", files={"file": ("s.csv", body.encode(), "text/csv")}, headers=headers)
+    assert resp.json()["failed"] == 0
+
+
+def _pages(client, headers, params):
+    cursor = None
+    while True:
+        resp = client.get("/api/shifts", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert resp.status_code == 200, resp.text
+        yield resp.json()
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return
+
+
+def test_employee_pages_are_full_and_cover_every_shift(client, db, owner, owner_headers, spot_id):
+    start = date(2024, 1, 1)
+    # Many shifts share a date, so the cursor must break ties by id.
+    rows = [("Jay" if i % 3 == 0 else "Alex", start + timedelta(days=i // 4)) for i in range(60)]
+    _import(client, owner_headers, spot_id, rows)
+
+    employee = User(bar_id=owner.bar_id, email="jay@example.com", name="Jay", role=UserRole.employee, password_hash="!", is_active=True)
+    db.add(employee)
+    db.commit()
+    token = create_access_token(subject=str(employee.id), role=employee.role.value, bar_id=owner.bar_id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    pages = list(_pages(client, headers, {"bar_id": owner.bar_id, "limit": 7}))
+    assert [len(p) for p in pages] == [7, 7, 6]
+    shifts = [s for page in pages for s in page]
+    assert {s["bartender_name"] for s in shifts} == {"Jay"}
+    assert len({s["id"] for s in shifts}) == 20
+    keys = [(s["shift_date"], s["id"]) for s in shifts]
+    assert keys == sorted(keys, reverse=True)
+
+    # Filters combine with the employee restriction rather than widening it.
+    alex = client.get("/api/shifts", params={"bar_id": owner.bar_id, "bartender": "Alex"}, headers=headers)
+    assert alex.json() == []
+
+
+def test_owner_filters_by_date_and_spot(client, owner, owner_headers, spot_id):
+    _import(client, owner_headers, spot_id, [("Jay", date(2024, 3, d)) for d in range(1, 29)])
+
+    params = {"bar_id": owner.bar_id, "start_date": "2024-03-10", "end_date": "2024-03-19", "spot_id": spot_id, "limit": 4}
+    shifts = [s for page in _pages(client, owner_headers, params) for s in page]
+    assert [s["shift_date"] for s in shifts] == [f"2024-03-{d}" for d in range(19, 9, -1)]
+    assert all(s["score_total"] is not None for s in shifts)
+
+    other_spot = client.get("/api/shifts", params={**params, "spot_id": spot_id + 1}, headers=owner_headers)
+    assert other_spot.json() == []
+    bad = client.get("/api/shifts", params={"bar_id": owner.bar_id, "cursor": "yesterday"}, headers=owner_headers)
+    assert bad.status_code == 400
+
+
+def test_fast_shift_serialization_is_byte_identical():
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from app.models.score_result import ScoreResult
+    from app.models.shift import Shift
+    from app.schemas.shifts import ShiftOut, shift_out_dict
+
+    shift = Shift(
+        id=7,
+        bar_id=1,
+        spot_id=2,
+        bartender_name="Zoë \"Z\" O'Neil",
+        shift_date=date(2024, 2, 29),
+        personal_sales_volume=800,
+        total_bar_sales=4000.0,
+        personal_tips=0.00001,
+        hours_worked=6,
+        transactions_count=None,
+        pct_of_bar_sales=0.2,
+        tip_pct=1.25e-08,
+        sales_per_hour=1e16,
+    )
+    score = ScoreResult(shift_id=7, score_total=87.5, score_version="v1", breakdown_json={"tip_pct": {"value": 1e-05, "points": 0.0}})
+
+    for score_result in (score, None):
+        model = ShiftOut.from_orm_with_score(shift, score_result, 37.5)
+        fast = JSONResponse(shift_out_dict(shift, score_result, 37.5)).body
+        # List path (jsonable_encoder) and detail path (response_model serialization).
+        assert fast == JSONResponse(jsonable_encoder(model)).body
+        assert fast == JSONResponse(TypeAdapter(ShiftOut).dump_python(model, mode="json")).body
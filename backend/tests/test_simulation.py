@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+
+from sqlalchemy import func
+
+from app.models.score_result import ScoreResult
+from app.models.spot import Spot
+from app.models.spot_score_config import SpotScoreConfig
+from app.services.simulation import candidate_scorers, load_history, simulate
+from app.services.synthetic import SyntheticSpec, generate
+
+
+# A busy bar's year: 40 bartenders, about 5 shifts a week each.
+YEAR_OF_SHIFTS = 10_000
+SIMULATION_BUDGET_SECONDS = 1.0
+
+
+def _seed(db, owner, shifts: int) -> list[int]:
+    generate(db, owner.bar_id, SyntheticSpec(shifts=shifts, spots=3, bartenders=40, years=1.0, seed=3, end_date=date(2024, 12, 31)))
+    return [s.id for s in db.query(Spot).filter(Spot.bar_id == owner.bar_id).order_by(Spot.id)]
+
+
+def _score_sum(db) -> float:
+    return db.query(func.sum(ScoreResult.score_total)).scalar()
+
+
+def test_unchanged_config_reproduces_stored_scores(client, db, owner, owner_headers):
+    spot_ids = _seed(db, owner, 2000)
+    resp = client.post("/api/score-simulations", json={"spots": [{"spot_id": s} for s in spot_ids]}, headers=owner_headers)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["shifts"] == body["rescored_shifts"] == 2000
+    assert body["simulated"] == body["current"]
+    assert all(b["avg_change"] == 0 and b["rank_change"] == 0 for b in body["bartenders"])
+    assert [b["simulated_rank"] for b in body["bartenders"]] == list(range(1, 41))
+
+
+def test_candidate_weights_move_the_leaderboard_without_writing(client, db, owner, owner_headers):
+    spot_ids = _seed(db, owner, 2000)
+    before = _score_sum(db)
+    tips_only = {"score_version": "v2", "sales_volume_weight": 0, "pct_of_bar_sales_weight": 0, "tip_pct_weight": 1, "sales_per_hour_weight": 0}
+    resp = client.post(
+        "/api/score-simulations",
+        json={"spots": [{"spot_id": s, **tips_only} for s in spot_ids], "start_date": "2024-07-01"},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert 0 < body["shifts"] < 2000
+    assert sum(body["simulated"]["histogram"]) == body["shifts"]
+    assert any(b["rank_change"] != 0 for b in body["bartenders"])
+    for b in body["bartenders"]:
+        assert abs(b["simulated_avg"] - b["current_avg"] - b["avg_change"]) < 1e-9
+    assert _score_sum(db) == before
+    assert db.query(SpotScoreConfig.score_version).distinct().all() == [("v1",)]
+
+
+def test_invalid_scenarios_are_rejected(client, owner, owner_headers, spot_id):
+    resp = client.post("/api/score-simulations", json={"spots": [{"spot_id": spot_id, "tip_pct_low": 0.5}]}, headers=owner_headers)
+    assert resp.status_code == 422
+    resp = client.post("/api/score-simulations", json={"spots": [{"spot_id": spot_id + 100}]}, headers=owner_headers)
+    assert resp.status_code == 404
+
+
+def test_a_year_of_shifts_simulates_within_budget(db, owner):
+    spot_ids = _seed(db, owner, YEAR_OF_SHIFTS)
+    scenarios = {spot_id: {"score_version": "v2", "tip_pct_weight": 30.0} for spot_id in spot_ids}
+
+    t0 = time.perf_counter()
+    result = simulate(load_history(db, owner.bar_id, None, None), candidate_scorers(db, owner.bar_id, scenarios))
+    elapsed = time.perf_counter() - t0
+    assert result.rescored == YEAR_OF_SHIFTS
+    assert elapsed < SIMULATION_BUDGET_SECONDS, f"simulating {YEAR_OF_SHIFTS} shifts took {elapsed:.2f}s"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from app.services.spot_scorers import spot_scorers
+
+
+def _shift(bar_id: int, spot_id: int, day: str) -> dict:
+    return {
+        "bar_id": bar_id,
+        "spot_id": spot_id,
+        "bartender_name": "Jay",
+        "shift_date": day,
+        "personal_sales_volume": 700,
+        "total_bar_sales": 3500,
+        "personal_tips": 140,
+        "hours_worked": 7,
+    }
+
+
+def test_config_change_rebuilds_the_cached_scorer(client, owner, owner_headers, spot_id):
+    v1 = client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, "2024-06-01"), headers=owner_headers).json()
+    assert v1["score_version"] == "v1"
+    assert spot_scorers.stats()["spots"] == 1
+
+    resp = client.patch(
+        f"/api/spots/{spot_id}/score-config",
+        json={"score_version": "v2", "sales_volume_weight": 1, "pct_of_bar_sales_weight": 1, "tip_pct_weight": 1, "sales_per_hour_weight": 1},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["score_version"] == "v2"
+    assert spot_scorers.stats()["spots"] == 0
+
+    v2 = client.post("/api/shifts", json=_shift(owner.bar_id, spot_id, "2024-06-02"), headers=owner_headers).json()
+    assert v2["score_version"] == "v2"
+    # Same inputs and caps, equal weights: 25 points per normalized metric.
+    normalized = [metric["normalized"] for metric in v1["breakdown"].values()]
+    assert v2["score_total"] == sum(n * 25.0 for n in normalized)
+
+
+def test_invalid_formula_is_rejected(client, owner, owner_headers, spot_id):
+    resp = client.patch(f"/api/spots/{spot_id}/score-config", json={"score_version": "v9"}, headers=owner_headers)
+    assert resp.status_code == 422
+    zero = {f"{m}_weight": 0 for m in ("sales_volume", "pct_of_bar_sales", "tip_pct", "sales_per_hour")}
+    resp = client.patch(f"/api/spots/{spot_id}/score-config", json={"score_version": "v2", **zero}, headers=owner_headers)
+    assert resp.status_code == 422
+
+
+def test_null_clears_a_weight_but_not_a_cap(client, owner, owner_headers, spot_id):
+    url = f"/api/spots/{spot_id}/score-config"
+    cfg = client.patch(url, json={"score_version": "v2", "tip_pct_weight": 40.0}, headers=owner_headers).json()
+    assert cfg["tip_pct_weight"] == 40.0
+
+    cfg = client.patch(url, json={"tip_pct_weight": None}, headers=owner_headers).json()
+    assert cfg["tip_pct_weight"] is None
+    assert cfg["score_version"] == "v2"
+
+    resp = client.patch(url, json={"tip_pct_high": None, "cap_mode": None}, headers=owner_headers)
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "cap_mode, tip_pct_high cannot be null"
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import re
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import get_settings
+from app.db import sqlite
+from app.db.sqlite import SqliteOptimizer, configure_sqlite, optimize
+from app.main import app
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_file_database_gets_profile_pragmas(tmp_path):
+    settings = get_settings()
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'profile.db'}")
+    configure_sqlite(engine, settings)
+
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "busy_timeout") == settings.sqlite_busy_timeout_ms
+    assert _pragma(engine, "cache_size") == -settings.sqlite_cache_kib
+    engine.dispose()
+
+
+def test_profile_skips_memory_databases_and_can_be_disabled(tmp_path):
+    memory = create_engine("sqlite+pysqlite:///:memory:")
+    configure_sqlite(memory, get_settings())
+    assert _pragma(memory, "journal_mode") == "memory"
+
+    untuned = create_engine(f"sqlite+pysqlite:///{tmp_path / 'untuned.db'}")
+    configure_sqlite(untuned, get_settings().model_copy(update={"sqlite_tuning": False}))
+    assert _pragma(untuned, "journal_mode") == "delete"
+    untuned.dispose()
+
+
+def test_optimize_analyzes_then_optimizes(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'optimize.db'}")
+    configure_sqlite(engine, get_settings())
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)"))
+        conn.execute(text("CREATE INDEX ix_t_v ON t (v)"))
+        conn.execute(text("INSERT INTO t (v) VALUES (1), (2), (3)"))
+
+    optimize(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM sqlite_stat1")).scalar() > 0
+    optimize(engine)  # PRAGMA optimize on an analyzed database
+
+    optimizer = SqliteOptimizer(engine, interval_seconds=3600)
+    optimizer.start()
+    optimizer.stop()
+    assert optimizer.last_run is not None
+    engine.dispose()
+
+
+def test_optimizer_failures_are_logged_and_reported(tmp_path, monkeypatch, caplog, client):
+    def busy(engine):
+        raise OperationalError("PRAGMA optimize", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(sqlite, "optimize", busy)
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'busy.db'}")
+    optimizer = SqliteOptimizer(engine, interval_seconds=3600)
+    with caplog.at_level(logging.WARNING, logger="app.db.sqlite"):
+        optimizer.start()
+        optimizer.stop()
+    assert "SQLite optimize failed" in caplog.text
+    assert optimizer.stats()["failures"] == 1
+    assert optimizer.last_run is None
+
+    monkeypatch.setattr(app.state, "sqlite_optimizer", optimizer, raising=False)
+    health = client.get("/api/health/sqlite-optimizer").json()
+    assert health["enabled"] is True and health["failures"] == 1 and health["runs"] == 0
+    assert re.search(r"^shiftscore_sqlite_optimizer_failures 1$", client.get("/metrics").text, re.M)
+    engine.dispose()
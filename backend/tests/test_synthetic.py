@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.models.bar import Bar
+from app.models.score_result import ScoreResult
+from app.models.shift import Shift
+from app.models.spot_score_config import SpotScoreConfig
+from app.schemas.shifts import ShiftCreateIn
+from app.services.scoring import compute_shift
+from app.services.synthetic import SyntheticSpec, generate
+
+
+RAW = ["spot_id", "bartender_name", "shift_date", "personal_sales_volume", "total_bar_sales", "personal_tips", "hours_worked"]
+
+
+def _bar_shifts(db, bar_id):
+    return (
+        db.query(Shift, ScoreResult.score_total)
+        .join(ScoreResult, ScoreResult.shift_id == Shift.id)
+        .filter(Shift.bar_id == bar_id)
+        .order_by(Shift.id)
+        .all()
+    )
+
+
+def test_same_seed_generates_the_same_scored_shifts(db):
+    spec = SyntheticSpec(shifts=3000, spots=3, bartenders=8, years=1.0, seed=11, end_date=date(2024, 12, 31))
+    bars = [Bar(name=f"Synthetic {i}", timezone="UTC") for i in range(2)]
+    db.add_all(bars)
+    db.commit()
+    for bar in bars:
+        assert generate(db, bar.id, spec, chunk_size=700) == 3000
+
+    first, second = (_bar_shifts(db, bar.id) for bar in bars)
+    assert len(first) == len(second) == 3000
+    spot_pos = [{s.spot_id for s, _ in rows} for rows in (first, second)]
+    assert len(spot_pos[0]) == len(spot_pos[1]) == 3
+    shift_of = lambda s: [getattr(s, f) for f in RAW[1:]]  # noqa: E731
+    assert [(shift_of(s), score) for s, score in first] == [(shift_of(s), score) for s, score in second]
+
+    configs = {cfg.spot_id: cfg for cfg in db.query(SpotScoreConfig).all()}
+    for s, score in first[::250]:
+        payload = ShiftCreateIn(bar_id=s.bar_id, **{f: getattr(s, f) for f in RAW})
+        expected = compute_shift(payload, configs[s.spot_id])[1]
+        assert expected.score_total == score
+        stored = db.query(ScoreResult.breakdown_json).filter(ScoreResult.shift_id == s.id).scalar()
+        assert stored == expected.breakdown
+
+    # Weekends sell more and are staffed more than early weekdays.
+    by_weekday = [[s.total_bar_sales for s, _ in first if s.shift_date.weekday() == d] for d in range(7)]
+    assert len(by_weekday[5]) > len(by_weekday[0])
+    assert sum(by_weekday[5]) / len(by_weekday[5]) > sum(by_weekday[0]) / len(by_weekday[0])
+
+
+def test_seed_endpoint_generates_shifts_and_rollups(client, db, owner, owner_headers):
+    resp = client.post("/api/dev/seed", params={"shifts": 400, "bartenders": 5, "years": 0.5}, headers=owner_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"bar_id": owner.bar_id, "generated": 400}
+
+    spots = client.get("/api/spots", params={"bar_id": owner.bar_id}, headers=owner_headers).json()
+    assert [s["name"] for s in spots] == ["Main Well", "Service Bar", "Patio"]
+
+    rows = _bar_shifts(db, owner.bar_id)
+    leaderboard = client.get("/api/leaderboard", headers=owner_headers).json()["entries"]
+    assert len(leaderboard) == 5
+    assert sum(entry["shifts_count"] for entry in leaderboard) == 400
+    report = client.get("/api/reports/shifts", headers=owner_headers).json()["rows"]
+    assert report[0]["shifts_count"] == 400
+    assert report[0]["avg_score"] == pytest.approx(sum(score for _, score in rows) / 400)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.services.scoring import METRICS
+
+
+def _seed(client, headers, spot_id, bar_id) -> list[dict]:
+    header = "spot_id,bartender_name,shift_date,personal_sales_volume,total_bar_sales,personal_tips,hours_worked"
+    start = date(2024, 1, 1)  # a Monday
+    rows = [f"{spot_id},Jay,{start + timedelta(days=3 * i)},{300 + 37 * i % 900},4000,{40 + 13 * i % 200},6" for i in range(50)]
+    rows.append(f"{spot_id},Alex,2024-01-02,900,4000,200,6")
+    client.post("/api/shifts/import", files={"file": ("s.csv", "\n".join([header, *rows]).encode(), "text/csv")}, headers=headers)
+    shifts = client.get("/api/shifts", params={"bar_id": bar_id, "bartender": "Jay", "limit": 200}, headers=headers).json()
+    return sorted(shifts, key=lambda s: (s["shift_date"], s["id"]))
+
+
+def _expected(shifts: list[dict], period_of, start: str | None = None) -> list[dict]:
+    out: dict[str, dict] = {}
+    for i, s in enumerate(shifts):
+        if start is not None and s["shift_date"] < start:
+            continue
+        p = out.setdefault(period_of(date.fromisoformat(s["shift_date"])).isoformat(), {"shifts": []})
+        p["shifts"].append(s)
+        for window in (7, 30):
+            recent = [r["score_total"] for r in shifts[max(0, i - window + 1) : i + 1]]
+            p[f"rolling_{window}"] = sum(recent) / len(recent)
+    return [
+        {
+            "period_start": key,
+            "shifts_count": len(p["shifts"]),
+            "avg_score": sum(s["score_total"] for s in p["shifts"]) / len(p["shifts"]),
+            "avg_points": {m: sum(s["breakdown"][m]["points"] for s in p["shifts"]) / len(p["shifts"]) for m in METRICS},
+            "rolling_7": p["rolling_7"],
+            "rolling_30": p["rolling_30"],
+        }
+        for key, p in out.items()
+    ]
+
+
+def _assert_points_match(actual: list[dict], expected: list[dict]) -> None:
+    assert [p["period_start"] for p in actual] == [p["period_start"] for p in expected]
+    for a, e in zip(actual, expected):
+        assert a["shifts_count"] == e["shifts_count"]
+        for key in ("avg_score", "rolling_7", "rolling_30"):
+            assert a[key] == pytest.approx(e[key])
+        assert a["avg_points"] == pytest.approx(e["avg_points"])
+
+
+def test_week_and_month_buckets_match_the_shift_rows(client, owner, owner_headers, spot_id):
+    shifts = _seed(client, owner_headers, spot_id, owner.bar_id)
+
+    weekly = client.get("/api/trends", params={"bartender": "Jay", "bucket": "week"}, headers=owner_headers).json()
+    _assert_points_match(weekly["points"], _expected(shifts, lambda d: d - timedelta(days=d.weekday())))
+
+    # Rolling means still reach back before start_date.
+    params = {"bartender": "Jay", "bucket": "month", "start_date": "2024-03-01"}
+    monthly = client.get("/api/trends", params=params, headers=owner_headers).json()
+    _assert_points_match(monthly["points"], _expected(shifts, lambda d: d.replace(day=1), start="2024-03-01"))
+
+
+def test_employees_only_see_their_own_trend(client, db, owner, owner_headers, spot_id):
+    _seed(client, owner_headers, spot_id, owner.bar_id)
+    employee = User(bar_id=owner.bar_id, email="jay@example.com", name="Jay", role=UserRole.employee, password_hash="!", is_active=True)
+    db.add(employee)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=str(employee.id), role='employee', bar_id=owner.bar_id)}"}
+
+    own = client.get("/api/trends", params={"bucket": "day"}, headers=headers).json()
+    assert own["bartender_name"] == "Jay"
+    assert len(own["points"]) == 50
+    assert client.get("/api/trends", params={"bartender": "Alex"}, headers=headers).status_code == 403
+    assert client.get("/api/trends", headers=owner_headers).status_code == 400